@@ -0,0 +1,7 @@
+# api/__init__.py
+from .app import ApiApp, create_app
+
+__all__ = [
+    'ApiApp',
+    'create_app'
+]
@@ -0,0 +1,193 @@
+# api/app.py
+import re
+from config.settings import Config
+from backend.async_database import AsyncDatabaseManager
+from backend.sessions import SessionManager
+from backend.models import CompatibilityCalculator
+from backend.security import PasswordHashingBusyError
+from api.responses import ApiError, JsonResponse, Request, encode_cursor, decode_cursor
+
+class ApiApp:
+    """Servicio HTTP JSON (ASGI) sobre `DatabaseManager`, `SessionManager` y `CompatibilityCalculator`.
+    
+    No depende del runtime de Streamlit: cada petición es una corrutina que
+    consulta la base de datos con `AsyncDatabaseManager`, y las sesiones son
+    las mismas que usa la app (token en `Authorization: Bearer ...`, verificado
+    con la caché de `SessionManager`). Se sirve con cualquier servidor ASGI
+    (`uvicorn api.asgi:app`) o con `python manage.py serve-api`.
+    
+    Endpoints:
+        POST /api/login                               {email, password} -> {token, user}
+        POST /api/logout                              cierra la sesión del token
+        GET  /api/session                             usuario de la sesión
+        GET  /api/offers?after=&limit=                ofertas activas por cursor
+        GET  /api/offers/search?q=&tipo=&ubicacion=&empresa_id=&limit=&offset=
+        GET  /api/companies/{id}/offers?after=&limit= ofertas de la empresa (solo la propia empresa)
+        GET  /api/students/{id}/recommendations?limit=  (solo el propio estudiante)
+    """
+    
+    def __init__(self, db_path=None):
+        self.adb = AsyncDatabaseManager(db_path)
+        self.sessions = SessionManager(self.adb.db)
+        self.routes = [
+            ('POST', r'/api/login', self.login),
+            ('POST', r'/api/logout', self.logout),
+            ('GET', r'/api/session', self.session),
+            ('GET', r'/api/offers', self.list_offers),
+            ('GET', r'/api/offers/search', self.search_offers),
+            ('GET', r'/api/companies/(?P<empresa_id>\d+)/offers', self.company_offers),
+            ('GET', r'/api/students/(?P<student_id>\d+)/recommendations', self.recommendations)
+        ]
+        self.routes = [(method, re.compile(pattern), handler) for method, pattern, handler in self.routes]
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+    
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                if await self.adb.init_database():
+                    await send({'type': 'lifespan.startup.complete'})
+                else:
+                    await send({'type': 'lifespan.startup.failed', 'message': "No se pudo migrar la base de datos"})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.adb.aclose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    
+    async def _read_body(self, receive):
+        chunks = []
+        size = 0
+        while True:
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                return None
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > Config.API_MAX_BODY_BYTES:
+                raise ApiError(413, "El cuerpo de la petición es demasiado grande")
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                return b''.join(chunks)
+    
+    async def _http(self, scope, receive, send):
+        request = Request(scope, b'')
+        try:
+            body = await self._read_body(receive)
+            if body is None:
+                return
+            request.body = body
+            response = await self._dispatch(request)
+        except ApiError as e:
+            response = JsonResponse({'error': e.message}, e.status, e.headers)
+        except PasswordHashingBusyError:
+            response = JsonResponse({'error': "Demasiados inicios de sesión, intenta de nuevo en unos segundos"},
+                                    503, {'retry-after': '1'})
+        except Exception as e:
+            print(f"Error atendiendo {request.method} {request.path}: {e}")
+            response = JsonResponse({'error': "Error interno del servidor"}, 500)
+        await response.send(send, request)
+    
+    async def _dispatch(self, request):
+        allowed = []
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(request.path)
+            if match is None:
+                continue
+            if request.method == method or (request.method == 'HEAD' and method == 'GET'):
+                request.params = {key: int(value) for key, value in match.groupdict().items()}
+                return await handler(request)
+            allowed.append(method)
+        if allowed:
+            raise ApiError(405, "Método no permitido", {'allow': ', '.join(allowed)})
+        raise ApiError(404, "Recurso no encontrado")
+    
+    async def _current_user(self, request):
+        token = request.bearer_token()
+        if token is None:
+            raise ApiError(401, "Falta el token de sesión", {'www-authenticate': 'Bearer'})
+        user = await self.adb.run(self.sessions.verify_token, token)
+        if user is None:
+            raise ApiError(401, "Sesión inválida o expirada", {'www-authenticate': 'Bearer'})
+        return user
+    
+    def _limit(self, request):
+        return request.int_param('limit', Config.PAGE_SIZE, minimum=1, maximum=Config.API_MAX_PAGE_SIZE)
+    
+    async def login(self, request):
+        payload = request.json()
+        email, password = payload.get('email'), payload.get('password')
+        if not isinstance(email, str) or not isinstance(password, str) or not email or not password:
+            raise ApiError(400, "Se requieren 'email' y 'password'")
+        
+        result = await self.adb.run(self.sessions.authenticate, email, password)
+        if result is None:
+            raise ApiError(401, "Credenciales incorrectas")
+        token, user = result
+        return JsonResponse({'token': token, 'user': user})
+    
+    async def logout(self, request):
+        user = await self._current_user(request)
+        await self.adb.run(self.sessions.end_session, request.bearer_token())
+        return JsonResponse({'logout': True, 'user_id': user.id})
+    
+    async def session(self, request):
+        return JsonResponse({'user': await self._current_user(request)}, private=True)
+    
+    async def list_offers(self, request):
+        offers, next_cursor = await self.adb.get_offers_page(
+            decode_cursor(request.query.get('after')), self._limit(request)
+        )
+        return JsonResponse({'items': offers, 'next': encode_cursor(next_cursor)})
+    
+    async def search_offers(self, request):
+        query = request.query.get('q', '').strip()
+        if not query:
+            raise ApiError(400, "Falta el parámetro 'q'")
+        filters = {key: request.query[key] for key in ('tipo', 'ubicacion') if request.query.get(key)}
+        empresa_id = request.int_param('empresa_id')
+        if empresa_id is not None:
+            filters['empresa_id'] = empresa_id
+        limit = request.int_param('limit', Config.SEARCH_RESULTS_LIMIT, minimum=1, maximum=Config.API_MAX_PAGE_SIZE)
+        offset = request.int_param('offset', 0)
+        
+        results = await self.adb.search_offers(query, filters, limit=limit, offset=offset)
+        return JsonResponse({'items': results, 'limit': limit, 'offset': offset})
+    
+    async def company_offers(self, request):
+        empresa_id = request.params['empresa_id']
+        user = await self._current_user(request)
+        if user.id != empresa_id or not user.is_company():
+            raise ApiError(403, "Solo la empresa puede ver todas sus ofertas")
+        offers, next_cursor = await self.adb.get_offers_by_company_page(
+            empresa_id, decode_cursor(request.query.get('after')), self._limit(request)
+        )
+        return JsonResponse({'items': offers, 'next': encode_cursor(next_cursor)}, private=True)
+    
+    async def recommendations(self, request):
+        student_id = request.params['student_id']
+        user = await self._current_user(request)
+        if user.id != student_id or not user.is_student():
+            raise ApiError(403, "Solo el estudiante puede ver sus recomendaciones")
+        limit = request.int_param('limit', 5, minimum=1, maximum=Config.API_MAX_PAGE_SIZE)
+        
+        offers = await self.adb.matches.get_top_matches(student_id, limit)
+        student_skills = user.get_skills_list()
+        items = [
+            {
+                **offer.to_dict(),
+                'habilidades_faltantes': CompatibilityCalculator.get_skill_gaps(
+                    student_skills, offer.get_required_skills_list()
+                )
+            }
+            for offer in offers
+        ]
+        return JsonResponse({'items': items}, private=True)
+
+def create_app(db_path=None):
+    """Crea la aplicación ASGI para una base de datos (por defecto Config.DATABASE_PATH)"""
+    return ApiApp(db_path)
@@ -0,0 +1,4 @@
+# api/asgi.py - Punto de entrada para servidores ASGI: `uvicorn api.asgi:app`
+from api.app import create_app
+
+app = create_app()
@@ -0,0 +1,151 @@
+# api/responses.py
+import base64
+import gzip
+import hashlib
+import json
+from urllib.parse import parse_qs
+from config.settings import Config
+from backend.cache import TTLCache
+
+class ApiError(Exception):
+    """Error de la petición; se responde como {"error": mensaje} con su código HTTP"""
+    
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+def to_json(value):
+    """Serializa a JSON compacto; los modelos se convierten con `to_dict()`"""
+    def default(obj):
+        if hasattr(obj, 'to_dict'):
+            return obj.to_dict()
+        return str(obj)
+    return json.dumps(value, default=default, ensure_ascii=False, separators=(',', ':')).encode()
+
+def encode_cursor(cursor):
+    """Cursor de paginación (created_at, id) como texto opaco para la URL"""
+    if cursor is None:
+        return None
+    return base64.urlsafe_b64encode(to_json(list(cursor))).decode().rstrip('=')
+
+def decode_cursor(text):
+    if not text:
+        return None
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(text + '=' * (-len(text) % 4)))
+        return created_at, int(row_id)
+    except (ValueError, TypeError):
+        raise ApiError(400, "Cursor de paginación inválido")
+
+class Request:
+    """Datos de una petición HTTP tomados del `scope` ASGI"""
+    
+    def __init__(self, scope, body, params=None):
+        self.method = scope['method']
+        self.path = scope['path']
+        self.query = {key: values[-1] for key, values in parse_qs(scope.get('query_string', b'').decode()).items()}
+        self.headers = {key.decode('latin-1').lower(): value.decode('latin-1') for key, value in scope['headers']}
+        self.body = body
+        self.params = params or {}
+    
+    def json(self):
+        try:
+            payload = json.loads(self.body or b'{}')
+        except ValueError:
+            raise ApiError(400, "El cuerpo no es JSON válido")
+        if not isinstance(payload, dict):
+            raise ApiError(400, "El cuerpo debe ser un objeto JSON")
+        return payload
+    
+    def bearer_token(self):
+        scheme, _, token = self.headers.get('authorization', '').partition(' ')
+        return token.strip() if scheme.lower() == 'bearer' and token.strip() else None
+    
+    def int_param(self, name, default=None, minimum=0, maximum=None):
+        """Parámetro entero de la query string, acotado a [minimum, maximum]"""
+        value = self.query.get(name)
+        if value in (None, ''):
+            return default
+        try:
+            value = int(value)
+        except ValueError:
+            raise ApiError(400, f"El parámetro '{name}' debe ser un entero")
+        if value < minimum:
+            raise ApiError(400, f"El parámetro '{name}' debe ser al menos {minimum}")
+        return min(value, maximum) if maximum is not None else value
+
+def _strip_weak(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+def _etag_matches(header, etag):
+    """Comparación débil de If-None-Match (RFC 9110)"""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    weak = _strip_weak(etag)
+    return any(_strip_weak(candidate.strip()) == weak for candidate in header.split(','))
+
+def _accepts_gzip(header):
+    for coding in (header or '').split(','):
+        name, _, params = coding.strip().partition(';')
+        if name.strip().lower() in ('gzip', '*'):
+            return params.replace(' ', '') not in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000')
+    return False
+
+class JsonResponse:
+    """Respuesta JSON con ETag, respuestas condicionales (304) y gzip.
+    
+    El ETag es débil y se calcula sobre el JSON sin comprimir, así que es el
+    mismo con o sin gzip. Un GET cuyo If-None-Match coincide recibe 304 sin
+    cuerpo: el cliente no vuelve a descargar un listado que no cambió. Los
+    cuerpos comprimidos se guardan por ETag, de modo que un mismo listado
+    pedido muchas veces se comprime una sola vez.
+    """
+    
+    compressed = TTLCache(Config.API_GZIP_CACHE_SIZE, Config.API_GZIP_CACHE_TTL_SECONDS)
+    
+    def __init__(self, payload, status=200, headers=None, private=False):
+        self.payload = payload
+        self.status = status
+        self.headers = dict(headers or {})
+        self.private = private
+    
+    def render(self, request):
+        """Retorna (status, headers, cuerpo) para la petición"""
+        body = to_json(self.payload)
+        headers = {'content-type': 'application/json; charset=utf-8', **self.headers}
+        cacheable = request.method in ('GET', 'HEAD') and self.status == 200
+        if cacheable:
+            etag = 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+            headers['etag'] = etag
+            headers['cache-control'] = 'private, no-cache' if self.private else 'no-cache'
+            headers['vary'] = 'Accept-Encoding, Authorization'
+            if _etag_matches(request.headers.get('if-none-match'), etag):
+                del headers['content-type']
+                return 304, headers, b''
+        else:
+            headers.setdefault('cache-control', 'no-store')
+        
+        if len(body) >= Config.API_GZIP_MIN_BYTES and _accepts_gzip(request.headers.get('accept-encoding')):
+            gzipped = self.compressed.get(headers['etag']) if cacheable else None
+            if gzipped is None:
+                gzipped = gzip.compress(body, compresslevel=Config.API_GZIP_LEVEL, mtime=0)
+                if cacheable:
+                    self.compressed.set(headers['etag'], gzipped)
+            body = gzipped
+            headers['content-encoding'] = 'gzip'
+            headers.setdefault('vary', 'Accept-Encoding')
+        return self.status, headers, body
+    
+    async def send(self, send, request):
+        status, headers, body = self.render(request)
+        headers['content-length'] = str(len(body))
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(key.encode('latin-1'), value.encode('latin-1')) for key, value in headers.items()]
+        })
+        await send({'type': 'http.response.body', 'body': b'' if request.method == 'HEAD' else body})
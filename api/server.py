@@ -0,0 +1,175 @@
+# api/server.py - Servidor HTTP/1.1 mínimo (biblioteca estándar) para correr la app ASGI sin uvicorn
+import asyncio
+from http import HTTPStatus
+from urllib.parse import unquote
+from config.settings import Config
+
+MAX_HEADER_LINES = 100
+
+class _Lifespan:
+    """Ejecuta el protocolo `lifespan` de ASGI (arranque y apagado de la app)"""
+    
+    def __init__(self, app):
+        self.app = app
+        self._inbox = asyncio.Queue()
+        self._outbox = asyncio.Queue()
+        self._task = None
+    
+    async def _receive(self):
+        return await self._inbox.get()
+    
+    async def _send(self, message):
+        await self._outbox.put(message)
+    
+    async def startup(self):
+        self._task = asyncio.create_task(self.app({'type': 'lifespan', 'asgi': {'version': '3.0'}},
+                                                  self._receive, self._send))
+        await self._inbox.put({'type': 'lifespan.startup'})
+        message = await self._outbox.get()
+        if message['type'] != 'lifespan.startup.complete':
+            raise RuntimeError(message.get('message', "La aplicación no pudo arrancar"))
+    
+    async def shutdown(self):
+        await self._inbox.put({'type': 'lifespan.shutdown'})
+        await self._outbox.get()
+        await self._task
+
+async def _read_request(reader):
+    """Lee la línea de petición y los encabezados; retorna None si el cliente cerró la conexión"""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode('latin-1').rstrip('\r\n').split(' ')
+    except ValueError:
+        raise ValueError("Línea de petición inválida")
+    
+    headers = []
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        if len(headers) >= MAX_HEADER_LINES:
+            raise ValueError("Demasiados encabezados")
+        name, _, value = line.decode('latin-1').partition(':')
+        headers.append((name.strip().lower().encode('latin-1'), value.strip().encode('latin-1')))
+    return method, target, version, headers
+
+async def _write_simple(writer, status, keep_alive=False):
+    body = HTTPStatus(status).phrase.encode()
+    writer.write(
+        f'HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n'
+        f'content-type: text/plain\r\ncontent-length: {len(body)}\r\n'
+        f'connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode() + body
+    )
+    await writer.drain()
+
+async def _handle_connection(app, reader, writer, server_address):
+    client = writer.get_extra_info('peername')
+    try:
+        while True:
+            try:
+                request = await asyncio.wait_for(_read_request(reader), Config.API_KEEP_ALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                break
+            except ValueError:
+                await _write_simple(writer, 400)
+                break
+            if request is None:
+                break
+            
+            method, target, version, headers = request
+            header_map = dict(headers)
+            if b'chunked' in header_map.get(b'transfer-encoding', b'').lower():
+                await _write_simple(writer, 411)
+                break
+            try:
+                length = int(header_map.get(b'content-length', b'0'))
+            except ValueError:
+                await _write_simple(writer, 400)
+                break
+            if length > Config.API_MAX_BODY_BYTES:
+                await _write_simple(writer, 413)
+                break
+            body = await reader.readexactly(length) if length else b''
+            
+            connection = header_map.get(b'connection', b'').lower()
+            keep_alive = connection != b'close' if version == 'HTTP/1.1' else connection == b'keep-alive'
+            path, _, query = target.partition('?')
+            scope = {
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': version[len('HTTP/'):] if version.startswith('HTTP/') else version,
+                'method': method.upper(),
+                'scheme': 'http',
+                'path': unquote(path),
+                'raw_path': path.encode('latin-1'),
+                'query_string': query.encode('latin-1'),
+                'root_path': '',
+                'headers': headers,
+                'client': client,
+                'server': server_address
+            }
+            
+            delivered = False
+            
+            async def receive():
+                nonlocal delivered
+                if delivered:
+                    return {'type': 'http.disconnect'}
+                delivered = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            
+            response = {}
+            
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    response['status'] = message['status']
+                    response['headers'] = list(message.get('headers', []))
+                elif message['type'] == 'http.response.body':
+                    response.setdefault('body', []).append(message.get('body', b''))
+            
+            await app(scope, receive, send)
+            
+            status = response.get('status', 500)
+            payload = b''.join(response.get('body', []))
+            lines = [f'HTTP/1.1 {status} {HTTPStatus(status).phrase}']
+            names = set()
+            for name, value in response.get('headers', []):
+                names.add(name.lower())
+                lines.append(f"{name.decode('latin-1')}: {value.decode('latin-1')}")
+            if b'content-length' not in names:
+                lines.append(f'content-length: {len(payload)}')
+            lines.append(f'connection: {"keep-alive" if keep_alive else "close"}')
+            writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def serve(app, host=None, port=None):
+    """Atiende la app ASGI hasta que la tarea se cancele"""
+    host = host or Config.API_HOST
+    port = Config.API_PORT if port is None else port
+    lifespan = _Lifespan(app)
+    await lifespan.startup()
+    
+    server = await asyncio.start_server(
+        lambda reader, writer: _handle_connection(app, reader, writer, (host, port)), host, port
+    )
+    print(f"API escuchando en http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await lifespan.shutdown()
+
+def run_server(app, host=None, port=None):
+    """Bloquea sirviendo la app hasta Ctrl+C"""
+    try:
+        asyncio.run(serve(app, host, port))
+    except KeyboardInterrupt:
+        print("API detenida")
@@ -1,9 +1,21 @@
 # app.py - Aplicación principal refactorizada
 import streamlit as st
 from backend import DatabaseManager, AuthManager
+from backend.maintenance import SessionSweeper
+from backend.stats import StatsService
 from frontend import LoginPage, RegisterPage, DashboardPage, get_css_styles
 from config import Config
 
+@st.cache_resource(show_spinner=False)
+def bootstrap():
+    """Prepara la base de datos una sola vez por proceso"""
+    if not DatabaseManager().init_database():
+        # La excepción evita que Streamlit guarde el fallo en caché
+        raise RuntimeError("No se pudo migrar la base de datos")
+    StatsService().sync_match_threshold()
+    SessionSweeper.start_for()
+    return True
+
 def main():
     """Función principal de la aplicación"""
     # Configuración de la página
@@ -17,17 +29,15 @@ def main():
     # Aplicar estilos CSS
     st.markdown(get_css_styles(), unsafe_allow_html=True)
     
-    # Inicializar componentes
-    db = DatabaseManager()
-    auth = AuthManager()
-    
-    # Inicializar base de datos
-    if not db.init_database():
+    # Inicializar base de datos (migraciones, una vez por proceso)
+    try:
+        bootstrap()
+    except RuntimeError:
         st.error("❌ Error inicializando la base de datos")
         st.stop()
     
-    # Poblar datos de prueba
-    db.populate_test_data()
+    # Inicializar componentes
+    auth = AuthManager()
     
     # Verificar si hay una sesión activa
     user_data = auth.get_current_user()
@@ -1,16 +1,43 @@
 # backend/__init__.py
 from .database import DatabaseManager
-from .auth import AuthManager
-from .models import User, Session, Offer, Match, UserStats, OfferStats, CompatibilityCalculator
+from .async_database import AsyncDatabaseManager
+from .pool import ConnectionPool, PoolTimeoutError
+from .query_metrics import QueryMetrics
+from .security import PasswordHasher, PasswordHashingBusyError
+from .sessions import SessionManager
+from .matching import MatchEngine
+from .skill_index import SkillIndex
+from .skills import SkillRegistry
+from .models import User, UserCredentials, Session, Offer, RecommendedOffer, OfferSearchResult, Match, UserStats, OfferStats, CompatibilityCalculator
 
 __all__ = [
     'DatabaseManager',
-    'AuthManager', 
+    'AsyncDatabaseManager',
+    'ConnectionPool',
+    'PoolTimeoutError',
+    'QueryMetrics',
+    'PasswordHasher',
+    'PasswordHashingBusyError',
+    'SessionManager',
+    'AuthManager',
+    'MatchEngine',
+    'SkillIndex',
+    'SkillRegistry',
     'User',
+    'UserCredentials',
     'Session',
     'Offer',
+    'RecommendedOffer',
+    'OfferSearchResult',
     'Match',
     'UserStats',
     'OfferStats',
     'CompatibilityCalculator'
 ]
+
+def __getattr__(name):
+    # AuthManager importa Streamlit: se carga solo cuando se pide, así la API no lo arrastra
+    if name == 'AuthManager':
+        from .auth import AuthManager
+        return AuthManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
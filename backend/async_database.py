@@ -0,0 +1,161 @@
+# backend/async_database.py
+import asyncio
+import functools
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from config.settings import Config
+from backend.database import DatabaseManager
+from backend.matching import MatchEngine
+from backend.query_metrics import finish_statements
+from backend.stats import StatsService
+
+# Métodos que no tienen sentido como corrutinas (conexiones y generadores en streaming)
+SYNC_ONLY = frozenset({'get_connection', 'iter_users', 'iter_offers', 'iter_matches'})
+
+class _ThreadBoundDatabase(DatabaseManager):
+    """`DatabaseManager` cuyos hilos del executor conservan su propia conexión del pool.
+    
+    La primera consulta de cada hilo toma una conexión del pool y el hilo la
+    reutiliza hasta `close()`. Un `get_connection` anidado (un método que abre
+    otra conexión mientras usa la suya) toma una prestada del pool como siempre.
+    """
+    
+    def __init__(self, db_path=None):
+        super().__init__(db_path)
+        self._local = threading.local()
+        self._pinned = []
+        self._pinned_lock = threading.Lock()
+    
+    def get_connection(self):
+        if getattr(self._local, 'busy', False):
+            return self.pool.connection()
+        return self._thread_connection()
+    
+    @contextmanager
+    def _thread_connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self.pool.acquire()
+            self._local.conn = conn
+            with self._pinned_lock:
+                self._pinned.append(conn)
+        
+        self._local.busy = True
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            raise
+        finally:
+            self._local.busy = False
+            # Igual que al devolverla al pool: ninguna sentencia ni transacción queda abierta entre llamadas
+            finish_statements(conn)
+            if conn.in_transaction:
+                conn.rollback()
+    
+    def release_connections(self):
+        """Devuelve al pool las conexiones fijadas (con el executor ya detenido)"""
+        with self._pinned_lock:
+            pinned, self._pinned = self._pinned, []
+        for conn in pinned:
+            self.pool.release(conn)
+
+class AsyncProxy:
+    """Expone los métodos públicos de un objeto bloqueante como corrutinas.
+    
+    `await proxy.metodo(...)` ejecuta `objeto.metodo(...)` en el executor, de
+    modo que el event loop sigue atendiendo otras peticiones mientras SQLite
+    trabaja.
+    """
+    
+    def __init__(self, target, executor, sync_only=frozenset()):
+        self._target = target
+        self._executor = executor
+        self._sync_only = sync_only
+    
+    async def run(self, func, *args, **kwargs):
+        """Ejecuta cualquier función bloqueante en el executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+    
+    def __getattr__(self, name):
+        if name.startswith('_') or name in self._sync_only:
+            raise AttributeError(name)
+        method = getattr(self._target, name)
+        if not callable(method):
+            raise AttributeError(name)
+        
+        @functools.wraps(method)
+        async def coroutine(*args, **kwargs):
+            return await self.run(method, *args, **kwargs)
+        
+        # Se guarda en la instancia para no volver a pasar por __getattr__
+        setattr(self, name, coroutine)
+        return coroutine
+
+class AsyncDatabaseManager(AsyncProxy):
+    """Variante asíncrona de `DatabaseManager` para atender peticiones concurrentes.
+    
+    Expone los mismos métodos que `DatabaseManager` como corrutinas
+    (`await adb.get_offers_page()`), y los de `StatsService` y `MatchEngine` en
+    `adb.stats` y `adb.matches`. Las llamadas corren en un executor propio de
+    `Config.ASYNC_DB_WORKERS` hilos, cada uno con su conexión del pool, así que
+    las consultas independientes se ejecutan a la vez:
+        
+        datos = await adb.gather(
+            user=adb.verify_session(token),
+            ofertas=adb.get_offers_page(),
+            conteos=adb.stats.get_dashboard_counts()
+        )
+    
+    Las cachés, los índices y los pools siguen siendo los del proceso, compartidos
+    con el `DatabaseManager` síncrono de la misma base de datos.
+    """
+    
+    def __init__(self, db_path=None, max_workers=None):
+        self.max_workers = max_workers or Config.ASYNC_DB_WORKERS
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='async-db')
+        self.db = _ThreadBoundDatabase(db_path)
+        super().__init__(self.db, executor, SYNC_ONLY)
+        self.stats = AsyncProxy(StatsService(self.db), executor)
+        self.matches = AsyncProxy(MatchEngine(self.db), executor)
+    
+    @property
+    def db_path(self):
+        return self.db.db_path
+    
+    async def gather(self, **calls):
+        """Espera varias corrutinas a la vez y retorna {nombre: resultado}"""
+        results = await asyncio.gather(*calls.values())
+        return dict(zip(calls, results))
+    
+    async def get_student_overview(self, token, limit=5):
+        """Sesión, recomendaciones y conteos del dashboard de un estudiante en una sola espera"""
+        user = await self.verify_session(token)
+        if user is None:
+            return None
+        data = await self.gather(
+            recomendaciones=self.matches.get_top_matches(user.id, limit),
+            conteos=self.stats.get_dashboard_counts()
+        )
+        data['user'] = user
+        return data
+    
+    def close(self):
+        """Detiene el executor y devuelve las conexiones al pool"""
+        self._executor.shutdown(wait=True)
+        self.db.release_connections()
+    
+    async def aclose(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -1,18 +1,20 @@
 # backend/auth.py
 import streamlit as st
-from backend.database import DatabaseManager
+from backend.sessions import SessionManager
+from backend.stats import StatsService
 
-class AuthManager:
-    """Manejador de autenticación y sesiones"""
+class AuthManager(SessionManager):
+    """Autenticación de la app Streamlit.
     
-    def __init__(self):
-        self.db = DatabaseManager()
+    Guarda el token y el usuario en `st.session_state`; el inicio, la
+    verificación y el cierre de sesiones (y su caché) son los de `SessionManager`.
+    """
     
     def login(self, email, password):
         """Autentica un usuario y crea una sesión"""
-        user = self.db.authenticate_user(email, password)
-        if user:
-            token = self.db.create_session(user['id'])
+        result = self.authenticate(email, password)
+        if result:
+            token, user = result
             st.session_state['user_token'] = token
             st.session_state['user_data'] = user
             return True
@@ -22,14 +24,14 @@ class AuthManager:
         """Cierra la sesión del usuario actual"""
         token = st.session_state.get('user_token')
         if token:
-            self.db.logout_user(token)
+            self.end_session(token)
         st.session_state.clear()
     
     def get_current_user(self):
         """Obtiene el usuario actual de la sesión"""
         token = st.session_state.get('user_token')
         if token:
-            user = self.db.verify_session(token)
+            user = self.verify_token(token)
             if user:
                 st.session_state['user_data'] = user
                 return user
@@ -65,26 +67,14 @@ class AuthManager:
         """Registra un nuevo usuario"""
         return self.db.create_user(email, password, nombre, tipo, carrera, semestre, habilidades)
     
+    def update_profile(self, user_id, **fields):
+        """Actualiza el perfil de un usuario e invalida sus sesiones cacheadas"""
+        updated = self.db.update_user_profile(user_id, **fields)
+        if updated:
+            self.invalidate_user_sessions(user_id)
+        return updated
+    
     def get_user_stats(self):
         """Obtiene estadísticas de usuarios"""
-        users = self.db.get_all_users()
-        
-        stats = {
-            'total_users': len(users),
-            'estudiantes': len([u for u in users if u['tipo'] == 'estudiante']),
-            'empresas': len([u for u in users if u['tipo'] == 'empresa']),
-            'users_by_career': {},
-            'users_by_semester': {}
-        }
-        
-        for user in users:
-            if user['tipo'] == 'estudiante':
-                # Estadísticas por carrera
-                carrera = user['carrera'] or 'No especificada'
-                stats['users_by_career'][carrera] = stats['users_by_career'].get(carrera, 0) + 1
-                
-                # Estadísticas por semestre
-                semestre = user['semestre'] or 0
-                stats['users_by_semester'][semestre] = stats['users_by_semester'].get(semestre, 0) + 1
-        
-        return stats
+        # Los conteos se agregan en SQLite; se conserva el formato de diccionario
+        return vars(StatsService(self.db).get_user_stats())
@@ -0,0 +1,167 @@
+# backend/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+class TTLCache:
+    """Caché LRU acotada con expiración por entrada, segura entre hilos.
+    
+    Cuando se alcanza `maxsize` se descarta la entrada usada hace más tiempo.
+    Lleva contadores de aciertos, fallos y desalojos para medir su efectividad.
+    """
+    
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # clave -> (expira_en, valor)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key, default=None):
+        """Retorna el valor vigente de una clave o `default`"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] <= now:
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key, value, ttl=None):
+        """Guarda un valor; `ttl` reemplaza la expiración por defecto"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def pop(self, key):
+        """Elimina una clave y retorna su valor (None si no existía)"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[1] if entry else None
+    
+    def invalidate_where(self, predicate):
+        """Elimina las entradas para las que `predicate(clave, valor)` es verdadero"""
+        with self._lock:
+            keys = [key for key, (_, value) in self._data.items() if predicate(key, value)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+    
+    def clear(self):
+        """Vacía la caché sin reiniciar los contadores"""
+        with self._lock:
+            self._data.clear()
+    
+    def stats(self):
+        """Retorna el tamaño y los contadores de la caché"""
+        with self._lock:
+            size = len(self._data)
+            hits, misses, evictions = self.hits, self.misses, self.evictions
+        lookups = hits + misses
+        return {
+            'size': size,
+            'maxsize': self.maxsize,
+            'hits': hits,
+            'misses': misses,
+            'evictions': evictions,
+            'hit_rate': hits / lookups if lookups else 0.0
+        }
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+class VersionedQueryCache:
+    """Caché de lecturas invalidada por versiones de tabla.
+    
+    Cada tabla lleva un contador que los métodos de escritura incrementan. Una
+    entrada guarda las versiones de las tablas que leyó y solo se sirve mientras
+    sigan vigentes; el TTL acota el tiempo que puede sobrevivir un cambio hecho
+    fuera del proceso (por ejemplo, desde `manage.py`).
+    """
+    
+    _caches = {}
+    _caches_lock = threading.Lock()
+    
+    def __init__(self, maxsize, ttl):
+        self._entries = TTLCache(maxsize, ttl)
+        self._versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+    
+    @classmethod
+    def for_path(cls, db_path):
+        """Retorna la caché del proceso para una ruta de base de datos"""
+        from config.settings import Config
+        with cls._caches_lock:
+            cache = cls._caches.get(db_path)
+            if cache is None:
+                cache = cls(Config.QUERY_CACHE_SIZE, Config.QUERY_CACHE_TTL_SECONDS)
+                cls._caches[db_path] = cache
+            return cache
+    
+    def versions(self, tables):
+        """Retorna las versiones actuales de las tablas indicadas"""
+        with self._lock:
+            return tuple(self._versions.get(table, 0) for table in tables)
+    
+    def bump(self, *tables):
+        """Marca como modificadas las tablas indicadas"""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+    
+    def get_or_load(self, key, tables, loader):
+        """Retorna el resultado cacheado de `key` o lo calcula con `loader()`"""
+        # Las versiones se leen antes de consultar: si hay una escritura a mitad
+        # de la carga, la entrada queda con versiones viejas y se descarta después
+        versions = self.versions(tables)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == versions:
+            with self._lock:
+                self.hits += 1
+            return entry[1]
+        
+        with self._lock:
+            self.misses += 1
+            if entry is not None:
+                self.stale += 1
+        value = loader()
+        self._entries.set(key, (versions, value))
+        return value
+    
+    def clear(self):
+        """Descarta todas las entradas"""
+        self._entries.clear()
+    
+    def stats(self):
+        """Retorna tamaño, aciertos, fallos e invalidaciones de la caché"""
+        entries = self._entries.stats()
+        with self._lock:
+            hits, misses, stale = self.hits, self.misses, self.stale
+            versions = dict(self._versions)
+        lookups = hits + misses
+        return {
+            'size': entries['size'],
+            'maxsize': entries['maxsize'],
+            'hits': hits,
+            'misses': misses,
+            'stale': stale,
+            'evictions': entries['evictions'],
+            'hit_rate': hits / lookups if lookups else 0.0,
+            'versions': versions
+        }
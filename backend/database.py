@@ -1,330 +1,813 @@
 # backend/database.py
+import re
 import sqlite3
-import hashlib
 from datetime import datetime, timedelta
 from config.settings import Config
+from backend.pool import ConnectionPool
+from backend.security import PasswordHasher, PasswordHashingBusyError
+from backend.cache import VersionedQueryCache
+from backend.migrations import migrate, get_schema_version
+from backend.skill_index import SkillIndex
+from backend.skills import normalize_skill
+from backend.matching import MatchEngine
+from backend.skill_catalog import sync_skills, sync_matcher, rebuild_skill_catalog, skill_ids
+from backend.models import User, UserCredentials, Offer, OfferSearchResult
+
+# Columnas de `Offer` en orden de declaración (ofertas `o` unidas a su empresa `u`)
+OFFER_COLUMNS = '''o.id, o.empresa_id, o.titulo, o.descripcion, o.tipo, o.habilidades_requeridas,
+                       o.ubicacion, o.activa, o.created_at, u.nombre AS empresa_nombre'''
 
 class DatabaseManager:
     """Manejador de la base de datos SQLite"""
     
     def __init__(self, db_path=None):
         self.db_path = db_path or Config.DATABASE_PATH
+        self.pool = ConnectionPool.for_path(self.db_path)
+        self.query_cache = VersionedQueryCache.for_path(self.db_path)
     
     def get_connection(self):
-        """Obtiene una conexión a la base de datos"""
-        return sqlite3.connect(self.db_path)
+        """Presta una conexión del pool del proceso (usar con `with`)"""
+        return self.pool.connection()
     
-    def init_database(self):
-        """Inicializa la base de datos con las tablas necesarias"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
+    def bump_versions(self, *tables):
+        """Invalida las lecturas cacheadas que dependen de las tablas indicadas"""
+        self.query_cache.bump(*tables)
+    
+    def cached_query(self, key, tables, loader):
+        """Lectura a través de la caché; los modelos retornados se comparten y son de solo lectura"""
+        return list(self.query_cache.get_or_load(key, tables, loader))
+    
+    def get_query_cache_stats(self):
+        """Retorna aciertos, fallos y tamaño de la caché de consultas"""
+        return self.query_cache.stats()
+    
+    def init_database(self, target=None):
+        """Aplica las migraciones pendientes del esquema"""
         try:
-            # Tabla de usuarios
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS usuarios (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    email TEXT UNIQUE NOT NULL,
-                    password_hash TEXT NOT NULL,
-                    nombre TEXT NOT NULL,
-                    tipo TEXT NOT NULL CHECK (tipo IN ('estudiante', 'empresa')),
-                    carrera TEXT,
-                    semestre INTEGER,
-                    habilidades TEXT,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            ''')
-            
-            # Tabla de sesiones
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS sesiones (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    usuario_id INTEGER,
-                    token TEXT UNIQUE NOT NULL,
-                    expires_at TIMESTAMP,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
-                )
-            ''')
-            
-            # Tabla de ofertas laborales
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS ofertas (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    empresa_id INTEGER,
-                    titulo TEXT NOT NULL,
-                    descripcion TEXT,
-                    tipo TEXT NOT NULL CHECK (tipo IN ('practica', 'empleo', 'servicio_social')),
-                    habilidades_requeridas TEXT,
-                    ubicacion TEXT,
-                    activa BOOLEAN DEFAULT 1,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (empresa_id) REFERENCES usuarios (id)
-                )
-            ''')
-            
-            # Tabla de matches
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS matches (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    estudiante_id INTEGER,
-                    oferta_id INTEGER,
-                    compatibilidad REAL,
-                    estado TEXT DEFAULT 'pendiente',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (estudiante_id) REFERENCES usuarios (id),
-                    FOREIGN KEY (oferta_id) REFERENCES ofertas (id)
-                )
-            ''')
-            
-            conn.commit()
+            with self.get_connection() as conn:
+                applied = migrate(conn, target)
+            if applied:
+                self.query_cache.clear()
+                print(f"Migraciones aplicadas: {', '.join(str(v) for v in applied)}")
+            self.load_skill_matcher()
             return True
-            
+        
         except Exception as e:
             print(f"Error inicializando base de datos: {e}")
             return False
-        finally:
-            conn.close()
+    
+    def get_schema_version(self):
+        """Retorna la versión del esquema aplicada en la base de datos"""
+        with self.get_connection() as conn:
+            return get_schema_version(conn)
     
     def hash_password(self, password):
-        """Hashea una contraseña usando SHA-256"""
-        return hashlib.sha256(password.encode()).hexdigest()
+        """Hashea una contraseña con PBKDF2 en el pool de hashing"""
+        return PasswordHasher.default().hash(password)
     
     def verify_password(self, password, password_hash):
-        """Verifica si una contraseña coincide con su hash"""
-        return self.hash_password(password) == password_hash
+        """Verifica si una contraseña coincide con su hash (PBKDF2 o SHA-256 heredado)"""
+        return PasswordHasher.default().verify(password, password_hash)
     
     def create_user(self, email, password, nombre, tipo, carrera=None, semestre=None, habilidades=None):
         """Crea un nuevo usuario en la base de datos"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        password_hash = self.hash_password(password)
         
-        try:
-            password_hash = self.hash_password(password)
-            cursor.execute('''
-                INSERT INTO usuarios (email, password_hash, nombre, tipo, carrera, semestre, habilidades)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (email, password_hash, nombre, tipo, carrera, semestre, habilidades))
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('''
+                    INSERT INTO usuarios (email, password_hash, nombre, tipo, carrera, semestre, habilidades)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (email, password_hash, nombre, tipo, carrera, semestre, habilidades))
+                user_id = cursor.lastrowid
+                sync_skills(cursor, 'usuarios', [(user_id, habilidades)])
+                
+                conn.commit()
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                return False
+        
+        self.bump_versions('usuarios')
+        if tipo == 'estudiante':
+            self._on_student_skills_changed(user_id, habilidades)
+        return True
+    
+    def update_user_profile(self, user_id, **fields):
+        """Actualiza los datos de perfil de un usuario"""
+        editable = ('nombre', 'carrera', 'semestre', 'habilidades')
+        changes = {key: value for key, value in fields.items() if key in editable}
+        if not changes:
+            return False
+        
+        assignments = ', '.join(f'{key} = ?' for key in changes)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f'UPDATE usuarios SET {assignments} WHERE id = ?',
+                (*changes.values(), user_id)
+            )
+            updated = cursor.rowcount > 0
             
+            cursor.execute('SELECT tipo, habilidades FROM usuarios WHERE id = ?', (user_id,))
+            user = cursor.fetchone()
+            if updated and 'habilidades' in changes:
+                sync_skills(cursor, 'usuarios', [(user_id, user[1])])
             conn.commit()
-            return True
-        except sqlite3.IntegrityError:
-            return False
-        finally:
-            conn.close()
+        
+        if updated:
+            self.bump_versions('usuarios')
+            if 'habilidades' in changes and user[0] == 'estudiante':
+                self._on_student_skills_changed(user_id, user[1])
+        return updated
     
     def get_user_by_email(self, email):
         """Obtiene un usuario por su email"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, email, password_hash, nombre, tipo, carrera, semestre, habilidades
-            FROM usuarios WHERE email = ?
-        ''', (email,))
-        
-        user = cursor.fetchone()
-        conn.close()
-        
-        if user:
-            return {
-                'id': user[0],
-                'email': user[1],
-                'password_hash': user[2],
-                'nombre': user[3],
-                'tipo': user[4],
-                'carrera': user[5],
-                'semestre': user[6],
-                'habilidades': user[7]
-            }
-        return None
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = UserCredentials.row_factory()
+            cursor.execute('''
+                SELECT id, email, nombre, tipo, carrera, semestre, habilidades, created_at, password_hash
+                FROM usuarios WHERE email = ?
+            ''', (email,))
+            
+            return cursor.fetchone()
     
     def authenticate_user(self, email, password):
         """Autentica un usuario y retorna sus datos"""
         user = self.get_user_by_email(email)
-        if user and self.verify_password(password, user['password_hash']):
+        if user and self.verify_password(password, user.password_hash):
+            if PasswordHasher.default().needs_rehash(user.password_hash):
+                self._rehash_password(user.id, user.password_hash, password)
             # Remover el hash de la contraseña del retorno
-            user.pop('password_hash')
-            return user
+            return user.without_password()
         return None
     
+    def _rehash_password(self, user_id, old_hash, password):
+        """Reemplaza un hash heredado o con menos iteraciones; si el pool está saturado se reintenta en el próximo login"""
+        try:
+            new_hash = self.hash_password(password)
+        except PasswordHashingBusyError:
+            return False
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            # Solo si nadie cambió el hash entretanto
+            cursor.execute(
+                'UPDATE usuarios SET password_hash = ? WHERE id = ? AND password_hash = ?',
+                (new_hash, user_id, old_hash)
+            )
+            conn.commit()
+            return cursor.rowcount > 0
+    
     def create_session(self, user_id):
         """Crea una nueva sesión para el usuario"""
         import secrets
         token = secrets.token_urlsafe(32)
         expires_at = datetime.now() + timedelta(hours=Config.SESSION_DURATION_HOURS)
         
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO sesiones (usuario_id, token, expires_at)
-            VALUES (?, ?, ?)
-        ''', (user_id, token, expires_at))
-        
-        conn.commit()
-        conn.close()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO sesiones (usuario_id, token, expires_at)
+                VALUES (?, ?, ?)
+            ''', (user_id, token, expires_at))
+            
+            conn.commit()
         
+        self.bump_versions('sesiones')
         return token
     
     def verify_session(self, token):
         """Verifica si una sesión es válida"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT s.usuario_id, u.email, u.nombre, u.tipo, u.carrera, u.semestre, u.habilidades
-            FROM sesiones s
-            JOIN usuarios u ON s.usuario_id = u.id
-            WHERE s.token = ? AND s.expires_at > ?
-        ''', (token, datetime.now()))
-        
-        user = cursor.fetchone()
-        conn.close()
-        
-        if user:
-            return {
-                'id': user[0],
-                'email': user[1],
-                'nombre': user[2],
-                'tipo': user[3],
-                'carrera': user[4],
-                'semestre': user[5],
-                'habilidades': user[6]
-            }
-        return None
+        session = self.get_session_user(token)
+        return session[0] if session else None
+    
+    def get_session_user(self, token):
+        """Retorna (usuario, expires_at) de una sesión vigente o None"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT s.usuario_id AS id, u.email, u.nombre, u.tipo, u.carrera, u.semestre, u.habilidades,
+                       u.created_at, s.expires_at
+                FROM sesiones s
+                JOIN usuarios u ON s.usuario_id = u.id
+                WHERE s.token = ? AND s.expires_at > ?
+            ''', (token, datetime.now()))
+            row = cursor.fetchone()
+        
+        if row is None:
+            return None
+        expires_at = row[-1]
+        if isinstance(expires_at, str):
+            expires_at = datetime.fromisoformat(expires_at)
+        return User(*row[:-1]), expires_at
     
     def logout_user(self, token):
         """Cierra la sesión del usuario"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM sesiones WHERE token = ?', (token,))
+            conn.commit()
+        self.bump_versions('sesiones')
+    
+    def delete_expired_sessions(self, batch_size=None, max_batches=None, pause=None):
+        """Borra sesiones expiradas en lotes cortos y reporta lo recuperado"""
+        import time
+        batch_size = batch_size or Config.SESSION_SWEEP_BATCH_SIZE
+        pause = Config.SESSION_SWEEP_PAUSE_SECONDS if pause is None else pause
+        now = datetime.now()
+        
+        with self.get_connection() as conn:
+            freelist_before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+        
+        deleted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            # Cada lote es su propia transacción: el candado de escritura dura milisegundos
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                    DELETE FROM sesiones WHERE id IN (
+                        SELECT id FROM sesiones WHERE expires_at <= ?
+                        ORDER BY expires_at LIMIT ?
+                    )
+                ''', (now, batch_size))
+                conn.commit()
+                removed = cursor.rowcount
+            
+            batches += 1
+            deleted += removed
+            if removed:
+                self.bump_versions('sesiones')
+            if removed < batch_size:
+                break
+            if pause:
+                time.sleep(pause)
         
-        cursor.execute('DELETE FROM sesiones WHERE token = ?', (token,))
-        conn.commit()
-        conn.close()
+        with self.get_connection() as conn:
+            freelist_after = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+        
+        pages_reclaimed = max(freelist_after - freelist_before, 0)
+        return {
+            'deleted': deleted,
+            'batches': batches,
+            'pages_reclaimed': pages_reclaimed,
+            'bytes_reclaimed': pages_reclaimed * page_size,
+            'freelist_pages': freelist_after
+        }
+    
+    def vacuum(self):
+        """Compacta el archivo de la base de datos y retorna las páginas liberadas"""
+        with self.get_connection() as conn:
+            pages_before = conn.execute('PRAGMA page_count').fetchone()[0]
+            conn.execute('VACUUM')
+            pages_after = conn.execute('PRAGMA page_count').fetchone()[0]
+        return max(pages_before - pages_after, 0)
     
     def get_all_users(self):
-        """Obtiene todos los usuarios"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, email, nombre, tipo, carrera, semestre, habilidades, created_at
-            FROM usuarios
-        ''')
-        
-        users = cursor.fetchall()
-        conn.close()
-        
-        return [{
-            'id': user[0],
-            'email': user[1],
-            'nombre': user[2],
-            'tipo': user[3],
-            'carrera': user[4],
-            'semestre': user[5],
-            'habilidades': user[6],
-            'created_at': user[7]
-        } for user in users]
+        """Obtiene todos los usuarios (cacheado hasta que cambie `usuarios`)"""
+        return self.cached_query(('get_all_users',), ('usuarios',), self._fetch_all_users)
+    
+    def _fetch_all_users(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = User.row_factory()
+            cursor.execute('''
+                SELECT id, email, nombre, tipo, carrera, semestre, habilidades, created_at
+                FROM usuarios
+            ''')
+            
+            return cursor.fetchall()
     
     def get_offers_by_company(self, empresa_id):
-        """Obtiene las ofertas de una empresa"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion, activa, created_at
-            FROM ofertas WHERE empresa_id = ?
-        ''', (empresa_id,))
-        
-        offers = cursor.fetchall()
-        conn.close()
-        
-        return [{
-            'id': offer[0],
-            'titulo': offer[1],
-            'descripcion': offer[2],
-            'tipo': offer[3],
-            'habilidades_requeridas': offer[4],
-            'ubicacion': offer[5],
-            'activa': offer[6],
-            'created_at': offer[7]
-        } for offer in offers]
+        """Obtiene las ofertas de una empresa (cacheado hasta que cambie `ofertas`)"""
+        return self.cached_query(
+            ('get_offers_by_company', empresa_id), ('ofertas',),
+            lambda: self._fetch_offers_by_company(empresa_id)
+        )
+    
+    def _fetch_offers_by_company(self, empresa_id):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Offer.row_factory()
+            cursor.execute('''
+                SELECT id, empresa_id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion, activa, created_at
+                FROM ofertas WHERE empresa_id = ?
+            ''', (empresa_id,))
+            
+            return cursor.fetchall()
     
     def get_all_offers(self):
-        """Obtiene todas las ofertas activas"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        """Obtiene todas las ofertas activas (cacheado hasta que cambien `ofertas` o `usuarios`)"""
+        return self.cached_query(('get_all_offers',), ('ofertas', 'usuarios'), self._fetch_all_offers)
+    
+    def _fetch_all_offers(self):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Offer.row_factory()
+            cursor.execute(f'''
+                SELECT {OFFER_COLUMNS}
+                FROM ofertas o
+                JOIN usuarios u ON o.empresa_id = u.id
+                WHERE o.activa = 1
+            ''')
+            
+            return cursor.fetchall()
+    
+    def get_users_page(self, after=None, limit=None, tipo=None):
+        """Página de usuarios ordenada por (created_at, id); ver `_fetch_page`"""
+        conditions, params = (['tipo = ?'], [tipo]) if tipo else ([], [])
+        return self._cached_page(
+            ('get_users_page', tipo), ('usuarios',), User,
+            'SELECT id, email, nombre, tipo, carrera, semestre, habilidades, created_at FROM usuarios',
+            '', conditions, params, after, limit
+        )
+    
+    def get_offers_page(self, after=None, limit=None, solo_activas=True):
+        """Página de ofertas (con el nombre de la empresa) ordenada por (created_at, id)"""
+        conditions, params = (['o.activa = 1'], []) if solo_activas else ([], [])
+        return self._cached_page(
+            ('get_offers_page', solo_activas), ('ofertas', 'usuarios'), Offer,
+            f'SELECT {OFFER_COLUMNS} FROM ofertas o JOIN usuarios u ON o.empresa_id = u.id',
+            'o.', conditions, params, after, limit
+        )
+    
+    def get_offers_by_company_page(self, empresa_id, after=None, limit=None):
+        """Página de las ofertas de una empresa (activas y cerradas) ordenada por (created_at, id)"""
+        return self._cached_page(
+            ('get_offers_by_company_page', empresa_id), ('ofertas',), Offer,
+            '''SELECT id, empresa_id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion, activa, created_at
+               FROM ofertas''',
+            '', ['empresa_id = ?'], [empresa_id], after, limit
+        )
+    
+    def _cached_page(self, key, tables, model_cls, select, prefix, conditions, params, after, limit):
+        limit = limit or Config.PAGE_SIZE
+        after = tuple(after) if after else None
+        page = self.query_cache.get_or_load(
+            key + (after, limit), tables,
+            lambda: self._fetch_page(model_cls, select, prefix, conditions, params, after, limit)
+        )
+        rows, next_cursor = page
+        return list(rows), next_cursor
+    
+    def _fetch_page(self, model_cls, select, prefix, conditions, params, after, limit):
+        """Lee una página por cursor (keyset) en lugar de OFFSET.
+        
+        `after` es el par `(created_at, id)` de la última fila de la página anterior
+        (None para la primera). Retorna `(filas, siguiente_cursor)`, con
+        `siguiente_cursor` en None cuando no hay más filas. Con los índices
+        `(..., created_at, id)` cada página es un rango del índice: el costo no
+        crece con el número de página y las filas insertadas mientras se pagina
+        no duplican ni saltan resultados.
+        """
+        def query(extra):
+            where = ' AND '.join(conditions + extra)
+            return f'''
+                {select}
+                {f'WHERE {where}' if where else ''}
+                ORDER BY {prefix}created_at, {prefix}id
+                LIMIT ?
+            '''
+        
+        # Se pide una fila extra para saber si hay página siguiente
+        if after is None:
+            sql = query([])
+            sql_params = list(params) + [limit + 1]
+        else:
+            # `(created_at, id) > (?, ?)` solo busca en el índice por created_at y recorre
+            # todas las filas del mismo segundo (una importación masiva genera miles).
+            # Separado en dos rangos, cada uno es una búsqueda exacta en el índice.
+            sql = f'''
+                SELECT * FROM ({query([f'{prefix}created_at = ?', f'{prefix}id > ?'])})
+                UNION ALL
+                SELECT * FROM ({query([f'{prefix}created_at > ?'])})
+                ORDER BY created_at, id
+                LIMIT ?
+            '''
+            sql_params = (list(params) + [after[0], after[1], limit + 1] +
+                          list(params) + [after[0], limit + 1] + [limit + 1])
+        
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = model_cls.row_factory()
+            cursor.execute(sql, sql_params)
+            rows = cursor.fetchall()
+        
+        if len(rows) > limit:
+            rows = rows[:limit]
+            return rows, (rows[-1].created_at, rows[-1].id)
+        return rows, None
+    
+    def load_skill_matcher(self):
+        """Pone al día el `SkillMatcher` del proceso con los sinónimos y el vocabulario del catálogo"""
+        with self.get_connection() as conn:
+            return sync_matcher(conn.cursor(), self.db_path)
+    
+    def get_skill_aliases(self):
+        """Retorna {alias: nombre canónico}"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT a.alias, s.nombre FROM skill_aliases a JOIN skills s ON s.id = a.skill_id
+                ORDER BY s.nombre, a.alias
+            ''')
+            return dict(cursor.fetchall())
+    
+    def add_skill_alias(self, alias, skill):
+        """Registra un sinónimo y recalcula los matches con la nueva regla"""
+        alias, skill = normalize_skill(alias), normalize_skill(skill)
+        if not alias or not skill or alias == skill:
+            return False
         
-        cursor.execute('''
-            SELECT o.id, o.titulo, o.descripcion, o.tipo, o.habilidades_requeridas, 
-                   o.ubicacion, u.nombre as empresa_nombre
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            skill_id = skill_ids(cursor, [skill])[skill]
+            cursor.execute(
+                'INSERT OR REPLACE INTO skill_aliases (alias, skill_id) VALUES (?, ?)',
+                (alias, skill_id)
+            )
+            conn.commit()
+        
+        self.load_skill_matcher()
+        # Los puntajes de los índices y de `matches` dependen de los sinónimos
+        SkillIndex.reset(self.db_path)
+        MatchEngine(self).rebuild_all()
+        return True
+    
+    def _skill_names(self, cursor, skill):
+        """Nombres del catálogo que coinciden con una habilidad (ella, sus sinónimos y similares)"""
+        return sorted(sync_matcher(cursor, self.db_path).related(normalize_skill(skill)))
+    
+    def get_users_with_skill(self, skill, tipo='estudiante'):
+        """Usuarios con una habilidad o equivalente (join indexado sobre `user_skills`)"""
+        tipo_condition = 'AND u.tipo = ?' if tipo else ''
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            names = self._skill_names(cursor, skill)
+            placeholders = ', '.join('?' for _ in names)
+            cursor.row_factory = User.row_factory()
+            cursor.execute(f'''
+                SELECT u.id, u.email, u.nombre, u.tipo, u.carrera, u.semestre, u.habilidades, u.created_at
+                FROM usuarios u
+                WHERE u.id IN (
+                    SELECT us.usuario_id
+                    FROM skills s
+                    JOIN user_skills us ON us.skill_id = s.id
+                    WHERE s.nombre IN ({placeholders})
+                ) {tipo_condition}
+                ORDER BY u.id
+            ''', (*names, tipo) if tipo else names)
+            return cursor.fetchall()
+    
+    def get_offers_with_skill(self, skill, solo_activas=True):
+        """Ofertas que requieren una habilidad o equivalente (join indexado sobre `offer_skills`)"""
+        activa_condition = 'AND o.activa = 1' if solo_activas else ''
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            names = self._skill_names(cursor, skill)
+            placeholders = ', '.join('?' for _ in names)
+            cursor.row_factory = Offer.row_factory()
+            cursor.execute(f'''
+                SELECT {OFFER_COLUMNS}
+                FROM ofertas o
+                JOIN usuarios u ON o.empresa_id = u.id
+                WHERE o.id IN (
+                    SELECT os.oferta_id
+                    FROM skills s
+                    JOIN offer_skills os ON os.skill_id = s.id
+                    WHERE s.nombre IN ({placeholders})
+                ) {activa_condition}
+                ORDER BY o.id
+            ''', names)
+            return cursor.fetchall()
+    
+    def get_shared_skills(self, usuario_id, oferta_id):
+        """Habilidades canónicas que un usuario comparte con una oferta"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT s.nombre
+                FROM user_skills us
+                JOIN offer_skills os ON os.skill_id = us.skill_id AND os.oferta_id = ?
+                JOIN skills s ON s.id = us.skill_id
+                WHERE us.usuario_id = ?
+                ORDER BY s.nombre
+            ''', (oferta_id, usuario_id))
+            return [row[0] for row in cursor.fetchall()]
+    
+    def get_offers_by_skill_overlap(self, usuario_id, limit=None, solo_activas=True):
+        """Ofertas con más habilidades en común con un usuario: [(Offer, compartidas)]"""
+        activa_condition = 'AND o.activa = 1' if solo_activas else ''
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT {OFFER_COLUMNS}, overlap.compartidas
+                FROM (
+                    SELECT os.oferta_id, COUNT(*) AS compartidas
+                    FROM user_skills us
+                    JOIN offer_skills os ON os.skill_id = us.skill_id
+                    WHERE us.usuario_id = ?
+                    GROUP BY os.oferta_id
+                ) overlap
+                JOIN ofertas o ON o.id = overlap.oferta_id
+                JOIN usuarios u ON o.empresa_id = u.id
+                WHERE 1 = 1 {activa_condition}
+                ORDER BY overlap.compartidas DESC, o.id
+                LIMIT ?
+            ''', (usuario_id, limit or Config.PAGE_SIZE))
+            return [(Offer(*row[:-1]), row[-1]) for row in cursor.fetchall()]
+    
+    def _iter_query(self, select, conditions, params, keys, batch_size=None):
+        """Recorre el resultado de una consulta por bloques paginados por clave (keyset).
+        
+        Cada bloque es una consulta `ORDER BY claves LIMIT batch_size` que sigue
+        después de la última fila del bloque anterior, y la conexión del pool se
+        presta solo mientras se lee ese bloque: un consumidor que se detiene a
+        mitad (un `break`, un error al escribir el archivo) no retiene ninguna
+        conexión. `keys` son pares (expresión, columna del resultado) que
+        identifican una fila de forma única; los bloques no comparten una misma
+        transacción, así que una fila escrita durante el recorrido puede o no
+        aparecer.
+        """
+        batch_size = batch_size or Config.EXPORT_BATCH_SIZE
+        names = [name for _, name in keys]
+        
+        def query(extra):
+            where = ' AND '.join(conditions + extra)
+            return f'''
+                {select}
+                {f'WHERE {where}' if where else ''}
+                ORDER BY {', '.join(expression for expression, _ in keys)}
+                LIMIT ?
+            '''
+        
+        after = None
+        while True:
+            if after is None:
+                sql = query([])
+                sql_params = list(params) + [batch_size]
+            elif len(keys) == 1:
+                sql = query([f'{keys[0][0]} > ?'])
+                sql_params = list(params) + [after[0], batch_size]
+            else:
+                # Igual que en `_fetch_page`: dos rangos exactos en el índice en lugar de `(a, b) > (?, ?)`
+                (first, _), (second, _) = keys
+                sql = f'''
+                    SELECT * FROM ({query([f'{first} = ?', f'{second} > ?'])})
+                    UNION ALL
+                    SELECT * FROM ({query([f'{first} > ?'])})
+                    ORDER BY {', '.join(names)}
+                    LIMIT ?
+                '''
+                sql_params = (list(params) + [after[0], after[1], batch_size] +
+                              list(params) + [after[0], batch_size] + [batch_size])
+            
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(sql, sql_params)
+                columns = [column[0] for column in cursor.description]
+                rows = cursor.fetchall()
+            
+            for row in rows:
+                yield dict(zip(columns, row))
+            if len(rows) < batch_size:
+                return
+            last = dict(zip(columns, rows[-1]))
+            after = [last[name] for name in names]
+    
+    def iter_users(self, tipo=None, batch_size=None):
+        """Genera los usuarios (sin hash de contraseña) en orden de id"""
+        return self._iter_query('''
+            SELECT id, email, nombre, tipo, carrera, semestre, habilidades, created_at
+            FROM usuarios
+        ''', ['tipo = ?'] if tipo else [], [tipo] if tipo else [], [('id', 'id')], batch_size)
+    
+    def iter_offers(self, solo_activas=False, batch_size=None):
+        """Genera las ofertas con el nombre de su empresa en orden de id"""
+        return self._iter_query('''
+            SELECT o.id, o.empresa_id, u.nombre AS empresa_nombre, o.titulo, o.descripcion, o.tipo,
+                   o.habilidades_requeridas, o.ubicacion, o.activa, o.created_at
             FROM ofertas o
-            JOIN usuarios u ON o.empresa_id = u.id
-            WHERE o.activa = 1
-        ''')
-        
-        offers = cursor.fetchall()
-        conn.close()
-        
-        return [{
-            'id': offer[0],
-            'titulo': offer[1],
-            'descripcion': offer[2],
-            'tipo': offer[3],
-            'habilidades_requeridas': offer[4],
-            'ubicacion': offer[5],
-            'empresa_nombre': offer[6]
-        } for offer in offers]
+            LEFT JOIN usuarios u ON o.empresa_id = u.id
+        ''', ['o.activa = 1'] if solo_activas else [], [], [('o.id', 'id')], batch_size)
+    
+    def iter_matches(self, min_compatibilidad=None, batch_size=None):
+        """Genera los matches con los datos del estudiante y la oferta, por estudiante"""
+        filtered = min_compatibilidad is not None
+        return self._iter_query('''
+            SELECT m.id, m.estudiante_id, e.nombre AS estudiante_nombre, e.email AS estudiante_email,
+                   m.oferta_id, o.titulo AS oferta_titulo, u.nombre AS empresa_nombre,
+                   m.compatibilidad, m.estado, m.created_at
+            FROM matches m
+            JOIN usuarios e ON e.id = m.estudiante_id
+            JOIN ofertas o ON o.id = m.oferta_id
+            LEFT JOIN usuarios u ON u.id = o.empresa_id
+        ''', ['m.compatibilidad >= ?'] if filtered else [], [min_compatibilidad] if filtered else [],
+            [('m.estudiante_id', 'estudiante_id'), ('m.oferta_id', 'oferta_id')], batch_size)
+    
+    def get_offers_by_ids(self, offer_ids):
+        """Obtiene ofertas por id respetando el orden recibido"""
+        if not offer_ids:
+            return []
+        
+        placeholders = ', '.join('?' for _ in offer_ids)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = Offer.row_factory()
+            cursor.execute(f'''
+                SELECT {OFFER_COLUMNS}
+                FROM ofertas o
+                JOIN usuarios u ON o.empresa_id = u.id
+                WHERE o.id IN ({placeholders})
+            ''', list(offer_ids))
+            
+            offers = cursor.fetchall()
+        
+        by_id = {offer.id: offer for offer in offers}
+        return [by_id[offer_id] for offer_id in offer_ids if offer_id in by_id]
+    
+    @staticmethod
+    def build_search_query(text):
+        """Convierte el texto del usuario en una consulta FTS5 segura (prefijos unidos con AND)"""
+        # Cada palabra va entre comillas: los operadores de FTS5 escritos por el usuario no se interpretan
+        words = re.findall(r'\w+', text or '')[:Config.SEARCH_MAX_TERMS]
+        return ' '.join(f'"{word}"*' for word in words)
+    
+    def search_offers(self, query, filters=None, limit=None, offset=0):
+        """Busca ofertas por título, descripción y habilidades; resultados ordenados por BM25.
+        
+        `filters` acepta `tipo`, `ubicacion`, `empresa_id` y `activa` (por defecto solo
+        ofertas activas; `activa=None` incluye todas). Cada resultado trae además
+        `snippet` (fragmento de la descripción) y `titulo_resaltado`, con las
+        coincidencias marcadas en negritas de Markdown.
+        """
+        match = self.build_search_query(query)
+        if not match:
+            return []
+        
+        filters = dict(filters or {})
+        filters.setdefault('activa', 1)
+        limit = limit or Config.SEARCH_RESULTS_LIMIT
+        conditions = ['ofertas_fts MATCH ?']
+        params = [match]
+        for column in ('tipo', 'ubicacion', 'empresa_id', 'activa'):
+            if filters.get(column) is not None:
+                conditions.append(f'o.{column} = ?')
+                params.append(filters[column])
+        params += [limit, offset]
+        
+        key = ('search_offers', match, tuple(sorted(filters.items())), limit, offset)
+        return self.cached_query(key, ('ofertas', 'usuarios'), lambda: self._fetch_search(conditions, params))
+    
+    def _fetch_search(self, conditions, params):
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = OfferSearchResult.row_factory()
+            cursor.execute(f'''
+                SELECT {OFFER_COLUMNS}, ofertas_fts.rank AS rank,
+                       snippet(ofertas_fts, 1, '**', '**', '…', 16) AS snippet,
+                       highlight(ofertas_fts, 0, '**', '**') AS titulo_resaltado
+                FROM ofertas_fts
+                JOIN ofertas o ON o.id = ofertas_fts.rowid
+                JOIN usuarios u ON o.empresa_id = u.id
+                WHERE {' AND '.join(conditions)}
+                ORDER BY ofertas_fts.rank
+                LIMIT ? OFFSET ?
+            ''', params)
+            
+            return cursor.fetchall()
+    
+    def create_offer(self, empresa_id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion):
+        """Crea una oferta laboral y retorna su id (None si los datos son inválidos)"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('''
+                    INSERT INTO ofertas (empresa_id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (empresa_id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion))
+                offer_id = cursor.lastrowid
+                sync_skills(cursor, 'ofertas', [(offer_id, habilidades_requeridas)])
+                
+                conn.commit()
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                return None
+        
+        self.bump_versions('ofertas')
+        self._on_offer_changed(offer_id)
+        return offer_id
+    
+    def update_offer(self, offer_id, **fields):
+        """Actualiza los campos editables de una oferta"""
+        editable = ('titulo', 'descripcion', 'tipo', 'habilidades_requeridas', 'ubicacion', 'activa')
+        changes = {key: value for key, value in fields.items() if key in editable}
+        if not changes:
+            return False
+        
+        assignments = ', '.join(f'{key} = ?' for key in changes)
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    f'UPDATE ofertas SET {assignments} WHERE id = ?',
+                    (*changes.values(), offer_id)
+                )
+                updated = cursor.rowcount > 0
+                if updated and 'habilidades_requeridas' in changes:
+                    sync_skills(cursor, 'ofertas', [(offer_id, changes['habilidades_requeridas'])])
+                conn.commit()
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                return False
+        
+        if updated:
+            self.bump_versions('ofertas')
+            self._on_offer_changed(offer_id)
+        return updated
+    
+    def set_offer_active(self, offer_id, activa):
+        """Activa o desactiva una oferta"""
+        return self.update_offer(offer_id, activa=1 if activa else 0)
+    
+    def _on_offer_changed(self, offer_id):
+        """Propaga el cambio de una oferta al índice de habilidades y a sus matches"""
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                'SELECT habilidades_requeridas, activa FROM ofertas WHERE id = ?',
+                (offer_id,)
+            )
+            offer = cursor.fetchone()
+        
+        if offer:
+            SkillIndex.notify_changed(self, SkillIndex.OFFERS, offer_id, offer[0], bool(offer[1]))
+        else:
+            SkillIndex.notify_changed(self, SkillIndex.OFFERS, offer_id, None, False)
+        MatchEngine(self).recompute_for_offer(offer_id)
+    
+    def _on_student_skills_changed(self, user_id, habilidades):
+        """Propaga el cambio de habilidades de un estudiante al índice y a sus matches"""
+        SkillIndex.notify_changed(self, SkillIndex.STUDENTS, user_id, habilidades)
+        MatchEngine(self).recompute_for_student(user_id)
     
     def populate_test_data(self):
         """Pobla la base de datos con datos de prueba"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        
         try:
-            # Verificar si ya existen datos
-            cursor.execute('SELECT COUNT(*) FROM usuarios')
-            count = cursor.fetchone()[0]
-            
-            if count == 0:
-                # Crear usuarios de prueba
-                for user_type, users in Config.TEST_USERS.items():
-                    for user in users:
-                        password_hash = self.hash_password(user['password'])
+            with self.get_connection() as conn:
+                cursor = conn.cursor()
+                
+                # Verificar si ya existen datos
+                cursor.execute('SELECT COUNT(*) FROM usuarios')
+                count = cursor.fetchone()[0]
+                
+                if count == 0:
+                    # Crear usuarios de prueba
+                    for user_type, users in Config.TEST_USERS.items():
+                        for user in users:
+                            password_hash = self.hash_password(user['password'])
+                            cursor.execute('''
+                                INSERT INTO usuarios (email, password_hash, nombre, tipo, carrera, semestre, habilidades)
+                                VALUES (?, ?, ?, ?, ?, ?, ?)
+                            ''', (
+                                user['email'],
+                                password_hash,
+                                user['nombre'],
+                                user_type[:-1],  # Remove 's' from 'estudiantes'/'empresas'
+                                user.get('carrera'),
+                                user.get('semestre'),
+                                user.get('habilidades')
+                            ))
+                    
+                    # Crear ofertas de prueba
+                    for offer in Config.TEST_OFFERS:
                         cursor.execute('''
-                            INSERT INTO usuarios (email, password_hash, nombre, tipo, carrera, semestre, habilidades)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
+                            INSERT INTO ofertas (empresa_id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion)
+                            VALUES (?, ?, ?, ?, ?, ?)
                         ''', (
-                            user['email'], 
-                            password_hash, 
-                            user['nombre'], 
-                            user_type[:-1],  # Remove 's' from 'estudiantes'/'empresas'
-                            user.get('carrera'),
-                            user.get('semestre'),
-                            user.get('habilidades')
+                            offer['empresa_id'],
+                            offer['titulo'],
+                            offer['descripcion'],
+                            offer['tipo'],
+                            offer['habilidades_requeridas'],
+                            offer['ubicacion']
                         ))
-                
-                # Crear ofertas de prueba
-                for offer in Config.TEST_OFFERS:
-                    cursor.execute('''
-                        INSERT INTO ofertas (empresa_id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion)
-                        VALUES (?, ?, ?, ?, ?, ?)
-                    ''', (
-                        offer['empresa_id'],
-                        offer['titulo'],
-                        offer['descripcion'],
-                        offer['tipo'],
-                        offer['habilidades_requeridas'],
-                        offer['ubicacion']
-                    ))
-                
-                conn.commit()
-                return True
-            return False
+                    
+                    rebuild_skill_catalog(cursor)
+                    conn.commit()
+                    seeded = True
+                else:
+                    seeded = False
             
+            if seeded:
+                self.bump_versions('usuarios', 'ofertas')
+                SkillIndex.reset(self.db_path)
+                MatchEngine(self).rebuild_all()
+            return seeded
+        
         except Exception as e:
             print(f"Error poblando datos de prueba: {e}")
             return False
-        finally:
-            conn.close()
@@ -0,0 +1,109 @@
+# backend/exporter.py
+import csv
+import json
+import os
+from itertools import islice
+from config.settings import Config
+
+# Entidad -> (método generador de DatabaseManager, [(columna, tipo)])
+EXPORTS = {
+    'users': ('iter_users', [
+        ('id', 'int'), ('email', 'str'), ('nombre', 'str'), ('tipo', 'str'), ('carrera', 'str'),
+        ('semestre', 'int'), ('habilidades', 'str'), ('created_at', 'str')
+    ]),
+    'offers': ('iter_offers', [
+        ('id', 'int'), ('empresa_id', 'int'), ('empresa_nombre', 'str'), ('titulo', 'str'),
+        ('descripcion', 'str'), ('tipo', 'str'), ('habilidades_requeridas', 'str'), ('ubicacion', 'str'),
+        ('activa', 'int'), ('created_at', 'str')
+    ]),
+    'matches': ('iter_matches', [
+        ('id', 'int'), ('estudiante_id', 'int'), ('estudiante_nombre', 'str'), ('estudiante_email', 'str'),
+        ('oferta_id', 'int'), ('oferta_titulo', 'str'), ('empresa_nombre', 'str'),
+        ('compatibilidad', 'float'), ('estado', 'str'), ('created_at', 'str')
+    ])
+}
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+def detect_export_format(path: str) -> str:
+    """Deduce el formato de salida a partir de la extensión"""
+    extension = os.path.splitext(path)[1].lower()
+    formats = {'.csv': 'csv', '.jsonl': 'jsonl', '.ndjson': 'jsonl', '.parquet': 'parquet'}
+    if extension not in formats:
+        raise ValueError(f"Formato no reconocido para {path}; usa .csv, .jsonl o .parquet")
+    return formats[extension]
+
+def _write_csv(rows, path, columns):
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        writer = csv.DictWriter(handle, fieldnames=columns)
+        writer.writeheader()
+        count = 0
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+def _write_jsonl(rows, path, columns):
+    with open(path, 'w', encoding='utf-8') as handle:
+        count = 0
+        for row in rows:
+            handle.write(json.dumps({column: row[column] for column in columns}, ensure_ascii=False, default=str) + '\n')
+            count += 1
+    return count
+
+def _write_parquet(rows, path, columns, types, batch_size):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("La exportación a Parquet requiere pyarrow (pip install pyarrow)") from None
+    
+    arrow_types = {'int': pa.int64(), 'float': pa.float64(), 'str': pa.string()}
+    # Esquema fijo: un bloque con una columna toda nula no debe cambiar el tipo del archivo
+    schema = pa.schema([(column, arrow_types[types[column]]) for column in columns])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        rows = iter(rows)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            # created_at puede venir como datetime según el adaptador de sqlite3
+            data = {column: [None if row[column] is None else
+                             (str(row[column]) if types[column] == 'str' else row[column]) for row in batch]
+                    for column in columns}
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            count += len(batch)
+    return count
+
+def export_rows(rows, path, columns, types=None, fmt=None, batch_size=None):
+    """Escribe filas (dicts) en CSV, JSONL o Parquet consumiéndolas en streaming; retorna cuántas"""
+    fmt = fmt or detect_export_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt}")
+    
+    # Se escribe a un archivo temporal: una exportación fallida no deja un archivo a medias
+    partial_path = f'{path}.partial'
+    try:
+        if fmt == 'csv':
+            count = _write_csv(rows, partial_path, columns)
+        elif fmt == 'jsonl':
+            count = _write_jsonl(rows, partial_path, columns)
+        else:
+            types = types or {column: 'str' for column in columns}
+            count = _write_parquet(rows, partial_path, columns, types, batch_size or Config.EXPORT_BATCH_SIZE)
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+    os.replace(partial_path, path)
+    return count
+
+def export_entity(db, entity, path, fmt=None, batch_size=None, **filters):
+    """Exporta 'users', 'offers' o 'matches' de la base al archivo indicado"""
+    if entity not in EXPORTS:
+        raise ValueError(f"Entidad desconocida: {entity}")
+    method, spec = EXPORTS[entity]
+    columns = [column for column, _ in spec]
+    rows = getattr(db, method)(batch_size=batch_size, **filters)
+    return export_rows(rows, path, columns, dict(spec), fmt, batch_size)
@@ -0,0 +1,364 @@
+# backend/importer.py
+import csv
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List
+from config.settings import Config
+from backend.matching import MatchEngine
+from backend.security import PasswordHasher
+from backend.skill_catalog import sync_skills
+from backend.skill_index import SkillIndex
+
+USER_TYPES = ('estudiante', 'empresa')
+OFFER_TYPES = ('practica', 'empleo', 'servicio_social')
+
+class RowError(ValueError):
+    """Fila inválida; el mensaje explica el motivo del rechazo"""
+
+@dataclass
+class RejectedRow:
+    """Fila rechazada durante una importación (sin la contraseña ni su hash)"""
+    line: int
+    reason: str
+    record: dict
+    
+    def __post_init__(self):
+        # El reporte de rechazos se guarda en disco: nunca debe incluir contraseñas
+        self.record = {key: value for key, value in self.record.items()
+                       if key not in ('password', 'password_hash')}
+
+@dataclass
+class ImportReport:
+    """Resultado de una importación masiva"""
+    inserted: int = 0
+    rejected: List[RejectedRow] = field(default_factory=list)
+    inserted_ids: List[int] = field(default_factory=list)
+    seconds: float = 0.0
+    match_seconds: float = 0.0
+    
+    @property
+    def total(self) -> int:
+        return self.inserted + len(self.rejected)
+
+def detect_format(path: str) -> str:
+    """Deduce el formato ('csv' o 'jsonl') a partir de la extensión"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"Formato no reconocido para {path}; usa .csv o .jsonl")
+
+def iter_records(handle, fmt: str):
+    """Recorre (número de línea, registro) de un archivo CSV o JSONL sin cargarlo completo"""
+    if fmt == 'csv':
+        reader = csv.DictReader(handle)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == 'jsonl':
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, RowError(f"JSON inválido: {e.msg}")
+                continue
+            if not isinstance(record, dict):
+                yield line_number, RowError("Se esperaba un objeto JSON por línea")
+                continue
+            yield line_number, record
+    else:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
+def _text(record, key, required=False):
+    value = record.get(key)
+    if isinstance(value, str):
+        value = value.strip()
+    if value in (None, ''):
+        if required:
+            raise RowError(f"Falta el campo '{key}'")
+        return None
+    return str(value)
+
+def _skills_text(record, key):
+    """Acepta habilidades como texto separado por comas o como lista JSON"""
+    value = record.get(key)
+    if isinstance(value, list):
+        value = ', '.join(str(item) for item in value)
+    return _text({key: value}, key)
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class BulkImporter:
+    """Importa usuarios y ofertas en lote desde archivos CSV o JSONL.
+    
+    Lee el archivo por bloques de `Config.IMPORT_BATCH_SIZE` filas: valida cada
+    fila, descarta los duplicados (dentro del archivo y contra la base), hashea
+    las contraseñas del bloque en un pool de hilos y lo inserta con
+    `executemany` en una sola transacción. Las filas rechazadas se reportan con
+    su número de línea y el motivo; una fila inválida no detiene la carga.
+    
+    Hashear cuesta `hash_iterations` rondas de PBKDF2 por fila (por defecto
+    `Config.IMPORT_PASSWORD_HASH_ITERATIONS`). Las filas pueden traer en su
+    lugar un `password_hash` ya calculado, que se guarda tal cual. Un hash con
+    menos iteraciones que `Config.PASSWORD_HASH_ITERATIONS` carga más rápido
+    pero es más barato de atacar hasta que el usuario inicia sesión y
+    `authenticate_user` lo rehashea con el costo completo.
+    """
+    
+    def __init__(self, db, batch_size=None, hash_workers=None, hash_iterations=None):
+        self.db = db
+        self.batch_size = batch_size or Config.IMPORT_BATCH_SIZE
+        self.hash_workers = hash_workers or Config.IMPORT_HASH_WORKERS
+        self.hash_iterations = hash_iterations or Config.IMPORT_PASSWORD_HASH_ITERATIONS
+    
+    def import_users(self, path, fmt=None, tipo=None, rematch=True):
+        """Importa usuarios; `tipo` aplica a las filas que no traen la columna `tipo`"""
+        return self._import(path, fmt, SkillIndex.STUDENTS, self._validate_user, self._insert_users,
+                            rematch, defaults={'tipo': tipo} if tipo else None)
+    
+    def import_offers(self, path, fmt=None, rematch=True):
+        """Importa ofertas; cada fila identifica a su empresa con `empresa_id` o `empresa_email`"""
+        return self._import(path, fmt, SkillIndex.OFFERS, self._validate_offer, self._insert_offers, rematch)
+    
+    def _import(self, path, fmt, kind, validate, insert, rematch, defaults=None):
+        fmt = fmt or detect_format(path)
+        report = ImportReport()
+        start = time.perf_counter()
+        
+        with open(path, newline='', encoding='utf-8-sig') as handle, \
+                ThreadPoolExecutor(max_workers=self.hash_workers, thread_name_prefix='import-hash') as executor:
+            batch = []
+            for line, record in iter_records(handle, fmt):
+                if isinstance(record, RowError):
+                    report.rejected.append(RejectedRow(line, str(record), {}))
+                    continue
+                for key, value in (defaults or {}).items():
+                    if not record.get(key):
+                        record[key] = value
+                try:
+                    batch.append((line, record, validate(record)))
+                except RowError as e:
+                    report.rejected.append(RejectedRow(line, str(e), record))
+                    continue
+                if len(batch) >= self.batch_size:
+                    insert(batch, report, executor)
+                    batch = []
+            if batch:
+                insert(batch, report, executor)
+        
+        report.rejected.sort(key=lambda row: row.line)
+        report.seconds = time.perf_counter() - start
+        if report.inserted:
+            self._after_import(kind, report, rematch)
+        return report
+    
+    def _validate_user(self, record):
+        email = _text(record, 'email', required=True)
+        if '@' not in email:
+            raise RowError(f"Email inválido: {email}")
+        password = _text(record, 'password')
+        password_hash = _text(record, 'password_hash')
+        if password_hash is not None:
+            if not PasswordHasher.default().is_encoded(password_hash):
+                raise RowError("password_hash con formato no reconocido")
+        elif password is None:
+            raise RowError("Falta el campo 'password' o 'password_hash'")
+        nombre = _text(record, 'nombre', required=True)
+        tipo = (_text(record, 'tipo', required=True) or '').lower()
+        if tipo not in USER_TYPES:
+            raise RowError(f"Tipo de usuario inválido: {tipo}")
+        
+        semestre = _text(record, 'semestre')
+        if semestre is not None:
+            try:
+                semestre = int(float(semestre))
+            except (ValueError, OverflowError):
+                raise RowError(f"Semestre inválido: {semestre}") from None
+            if not 1 <= semestre <= 12:
+                raise RowError(f"Semestre fuera de rango (1-12): {semestre}")
+        
+        if tipo == 'estudiante':
+            return (email, password, password_hash, nombre, tipo, _text(record, 'carrera'), semestre,
+                    _skills_text(record, 'habilidades'))
+        return (email, password, password_hash, nombre, tipo, None, None, None)
+    
+    def _validate_offer(self, record):
+        titulo = _text(record, 'titulo', required=True)
+        tipo = (_text(record, 'tipo', required=True) or '').lower()
+        if tipo not in OFFER_TYPES:
+            raise RowError(f"Tipo de oferta inválido: {tipo}")
+        
+        empresa_id = _text(record, 'empresa_id')
+        empresa_email = _text(record, 'empresa_email')
+        if empresa_id is not None:
+            try:
+                empresa = int(float(empresa_id))
+            except (ValueError, OverflowError):
+                raise RowError(f"empresa_id inválido: {empresa_id}") from None
+        elif empresa_email is not None:
+            empresa = empresa_email
+        else:
+            raise RowError("Falta 'empresa_id' o 'empresa_email'")
+        
+        activa = _text(record, 'activa')
+        activa = 1 if activa is None else int(activa.lower() in ('1', 'true', 'si', 'sí', 'yes'))
+        return (empresa, titulo, _text(record, 'descripcion'), tipo,
+                _skills_text(record, 'habilidades_requeridas'), _text(record, 'ubicacion'), activa)
+    
+    def _insert_users(self, batch, report, executor):
+        # Duplicados dentro del archivo y contra la base (una consulta por bloque)
+        emails = [values[0] for _, _, values in batch]
+        existing = set()
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(emails, 900):
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor.execute(f'SELECT email FROM usuarios WHERE email IN ({placeholders})', chunk)
+                existing.update(row[0] for row in cursor.fetchall())
+        
+        accepted = []
+        for line, record, values in batch:
+            if values[0] in existing:
+                report.rejected.append(RejectedRow(line, f"El email ya está registrado: {values[0]}", record))
+                continue
+            existing.add(values[0])
+            accepted.append((line, record, values))
+        if not accepted:
+            return
+        
+        # El lote hashea en su propio pool, sin ocupar la cola que atiende los inicios de sesión;
+        # los hashes que ya vienen en el archivo se guardan tal cual
+        hasher = PasswordHasher.default()
+        hashes = iter(executor.map(
+            lambda password: hasher.encode(password, iterations=self.hash_iterations),
+            [values[1] for _, _, values in accepted if values[2] is None]
+        ))
+        rows = [(values[0], values[2] or next(hashes), *values[3:]) for _, _, values in accepted]
+        
+        sql = '''
+            INSERT INTO usuarios (email, password_hash, nombre, tipo, carrera, semestre, habilidades)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        '''
+        ids = self._insert_rows(sql, rows, 'usuarios', 6)
+        if ids is None:
+            # Otro proceso insertó alguno de los emails a mitad de la carga: fila por fila
+            ids = self._insert_one_by_one(sql, rows, accepted, report, 'usuarios', 6)
+        report.inserted_ids.extend(user_id for user_id in ids if user_id is not None)
+        report.inserted = len(report.inserted_ids)
+    
+    def _insert_offers(self, batch, report, executor):
+        company_ids = {values[0] for _, _, values in batch if isinstance(values[0], int)}
+        company_emails = {values[0] for _, _, values in batch if isinstance(values[0], str)}
+        by_email = {}
+        valid_ids = set()
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            for chunk in _chunks(list(company_ids), 900):
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor.execute(
+                    f"SELECT id FROM usuarios WHERE tipo = 'empresa' AND id IN ({placeholders})", chunk
+                )
+                valid_ids.update(row[0] for row in cursor.fetchall())
+            for chunk in _chunks(list(company_emails), 900):
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor.execute(
+                    f"SELECT email, id FROM usuarios WHERE tipo = 'empresa' AND email IN ({placeholders})", chunk
+                )
+                by_email.update(cursor.fetchall())
+        
+        accepted = []
+        for line, record, values in batch:
+            empresa = values[0]
+            empresa_id = by_email.get(empresa) if isinstance(empresa, str) else (empresa if empresa in valid_ids else None)
+            if empresa_id is None:
+                report.rejected.append(RejectedRow(line, f"Empresa no encontrada: {empresa}", record))
+                continue
+            accepted.append((line, record, (empresa_id, *values[1:])))
+        if not accepted:
+            return
+        
+        sql = '''
+            INSERT INTO ofertas (empresa_id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion, activa)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        '''
+        rows = [values for _, _, values in accepted]
+        ids = self._insert_rows(sql, rows, 'ofertas', 4)
+        if ids is None:
+            ids = self._insert_one_by_one(sql, rows, accepted, report, 'ofertas', 4)
+        report.inserted_ids.extend(offer_id for offer_id in ids if offer_id is not None)
+        report.inserted = len(report.inserted_ids)
+    
+    def _insert_rows(self, sql, rows, table, skills_at):
+        """Inserta un bloque en una transacción; retorna los ids nuevos o None si hubo conflicto.
+        
+        `skills_at` es la posición del texto de habilidades en cada fila: el catálogo
+        de habilidades se sincroniza en la misma transacción.
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            try:
+                cursor.execute('BEGIN IMMEDIATE')
+                cursor.executemany(sql, rows)
+                last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+                # Con el candado de escritura tomado y AUTOINCREMENT, los ids del bloque son consecutivos
+                ids = list(range(last_id - len(rows) + 1, last_id + 1))
+                sync_skills(cursor, table, zip(ids, (row[skills_at] for row in rows)))
+                conn.commit()
+            except sqlite3.IntegrityError:
+                conn.rollback()
+                return None
+        return ids
+    
+    def _insert_one_by_one(self, sql, rows, accepted, report, table, skills_at):
+        ids = []
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            for row, (line, record, _) in zip(rows, accepted):
+                try:
+                    cursor.execute(sql, row)
+                    ids.append(cursor.lastrowid)
+                except sqlite3.IntegrityError as e:
+                    report.rejected.append(RejectedRow(line, f"Rechazada por la base de datos: {e}", record))
+                    ids.append(None)
+            sync_skills(cursor, table, [(entity_id, row[skills_at]) for entity_id, row in zip(ids, rows)
+                                        if entity_id is not None])
+            conn.commit()
+        return ids
+    
+    def _after_import(self, kind, report, rematch):
+        """Invalida cachés e índices y recalcula los matches de las filas nuevas en una pasada"""
+        self.db.bump_versions('usuarios' if kind == SkillIndex.STUDENTS else 'ofertas')
+        # Los índices se reconstruyen desde la base en su siguiente uso
+        SkillIndex.reset(self.db.db_path)
+        if not rematch:
+            return
+        
+        start = time.perf_counter()
+        MatchEngine(self.db).recompute_many(kind, report.inserted_ids)
+        report.match_seconds = time.perf_counter() - start
+
+def write_rejects(path, rejected):
+    """Guarda las filas rechazadas (con su línea y motivo) como CSV o JSONL"""
+    fmt = detect_format(path)
+    with open(path, 'w', newline='', encoding='utf-8') as handle:
+        if fmt == 'jsonl':
+            for row in rejected:
+                handle.write(json.dumps({'line': row.line, 'reason': row.reason, **row.record},
+                                        ensure_ascii=False) + '\n')
+            return
+        
+        columns = ['line', 'reason']
+        for row in rejected:
+            columns += [key for key in row.record if key not in columns]
+        writer = csv.DictWriter(handle, fieldnames=columns, extrasaction='ignore')
+        writer.writeheader()
+        for row in rejected:
+            writer.writerow({**row.record, 'line': row.line, 'reason': row.reason})
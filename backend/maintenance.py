@@ -0,0 +1,46 @@
+# backend/maintenance.py
+import threading
+from config.settings import Config
+from backend.database import DatabaseManager
+
+class SessionSweeper(threading.Thread):
+    """Hilo en segundo plano que borra periódicamente las sesiones expiradas"""
+    
+    _running = {}
+    _running_lock = threading.Lock()
+    
+    def __init__(self, db_path=None, interval=None):
+        super().__init__(name='session-sweeper', daemon=True)
+        self.db = DatabaseManager(db_path)
+        self.interval = interval or Config.SESSION_SWEEP_INTERVAL_SECONDS
+        self.last_report = None
+        self._stop_event = threading.Event()
+    
+    @classmethod
+    def start_for(cls, db_path=None, interval=None):
+        """Arranca (una sola vez por proceso y base de datos) el barrido periódico"""
+        key = db_path or Config.DATABASE_PATH
+        with cls._running_lock:
+            sweeper = cls._running.get(key)
+            if sweeper is None or not sweeper.is_alive():
+                sweeper = cls(key, interval)
+                sweeper.start()
+                cls._running[key] = sweeper
+            return sweeper
+    
+    def sweep(self):
+        """Ejecuta un barrido y guarda su reporte"""
+        self.last_report = self.db.delete_expired_sessions()
+        return self.last_report
+    
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"Error limpiando sesiones expiradas: {e}")
+            self._stop_event.wait(self.interval)
+    
+    def stop(self):
+        """Detiene el hilo al terminar la espera en curso"""
+        self._stop_event.set()
@@ -0,0 +1,228 @@
+# backend/matching.py
+from config.settings import Config
+from backend.models import CompatibilityCalculator, RecommendedOffer
+from backend.skill_catalog import sync_matcher
+from backend.skill_index import SkillIndex
+from backend.skills import parse_skills
+
+UPSERT_MATCH_SQL = '''
+    INSERT INTO matches (estudiante_id, oferta_id, compatibilidad)
+    VALUES (?, ?, ?)
+    ON CONFLICT (estudiante_id, oferta_id) DO UPDATE
+    SET compatibilidad = excluded.compatibilidad
+    WHERE compatibilidad IS NOT excluded.compatibilidad
+'''
+
+def _qualifies(score):
+    return score > Config.MATCH_MIN_COMPATIBILITY
+
+def _sync_rows(cursor, fixed_column, fixed_id, scores, known=None):
+    """Sincroniza los matches de un estudiante u oferta tocando solo las filas que cambian.
+    
+    `scores` mapea el id del otro lado del match a su compatibilidad. Los matches
+    pendientes que dejan de calificar se borran; los aceptados o rechazados son
+    historial y se conservan con compatibilidad 0. Con `known` (el índice que
+    produjo `scores`), los matches cuyo otro lado el índice no conoce no se tocan:
+    sin puntaje no se sabe si dejaron de calificar.
+    """
+    other_column = 'oferta_id' if fixed_column == 'estudiante_id' else 'estudiante_id'
+    
+    def pair(other_id):
+        return (fixed_id, other_id) if fixed_column == 'estudiante_id' else (other_id, fixed_id)
+    
+    cursor.execute(
+        f'SELECT {other_column}, compatibilidad, estado FROM matches WHERE {fixed_column} = ?',
+        (fixed_id,)
+    )
+    existing = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+    
+    upserts = [
+        (*pair(other_id), score)
+        for other_id, score in scores.items()
+        if _qualifies(score) and (other_id not in existing or existing[other_id][0] != score)
+    ]
+    deletes = []
+    zeroes = []
+    for other_id, (compatibilidad, estado) in existing.items():
+        if _qualifies(scores.get(other_id, 0.0)) or (known is not None and other_id not in known):
+            continue
+        if estado == 'pendiente':
+            deletes.append(pair(other_id))
+        elif compatibilidad != 0:
+            zeroes.append(pair(other_id))
+    
+    if upserts:
+        cursor.executemany(UPSERT_MATCH_SQL, upserts)
+    if deletes:
+        cursor.executemany('DELETE FROM matches WHERE estudiante_id = ? AND oferta_id = ?', deletes)
+    if zeroes:
+        cursor.executemany(
+            'UPDATE matches SET compatibilidad = 0 WHERE estudiante_id = ? AND oferta_id = ?',
+            zeroes
+        )
+    return len(upserts) + len(deletes) + len(zeroes)
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def backfill_matches(cursor, offer_index=None, student_ids=None):
+    """Recalcula los matches de los estudiantes (todos o los de `student_ids`) con un cursor abierto"""
+    if offer_index is None:
+        offer_index = SkillIndex.load(cursor, SkillIndex.OFFERS)
+    
+    if student_ids is None:
+        cursor.execute("SELECT id, habilidades FROM usuarios WHERE tipo = 'estudiante'")
+        students = cursor.fetchall()
+    else:
+        students = []
+        for chunk in _chunks(list(student_ids), 900):
+            placeholders = ', '.join('?' for _ in chunk)
+            cursor.execute(
+                f"SELECT id, habilidades FROM usuarios WHERE tipo = 'estudiante' AND id IN ({placeholders})",
+                chunk
+            )
+            students.extend(cursor.fetchall())
+    
+    written = 0
+    for student_id, habilidades in students:
+        written += _sync_rows(cursor, 'estudiante_id', student_id, offer_index.scores(habilidades))
+    return written
+
+def backfill_offer_matches(cursor, offer_ids, student_index=None):
+    """Recalcula los matches de las ofertas de `offer_ids` con un cursor abierto"""
+    if student_index is None:
+        student_index = SkillIndex.load(cursor, SkillIndex.STUDENTS)
+    
+    offers = []
+    for chunk in _chunks(list(offer_ids), 900):
+        placeholders = ', '.join('?' for _ in chunk)
+        cursor.execute(
+            f'SELECT id, habilidades_requeridas, activa FROM ofertas WHERE id IN ({placeholders})', chunk
+        )
+        offers.extend(cursor.fetchall())
+    
+    written = 0
+    for offer_id, habilidades, activa in offers:
+        scores = {}
+        if activa:
+            required = parse_skills(habilidades)
+            for student_id in student_index.candidates(required):
+                scores[student_id] = CompatibilityCalculator.calculate_compatibility(
+                    student_index.skills_of(student_id), required
+                )
+        written += _sync_rows(cursor, 'oferta_id', offer_id, scores)
+    return written
+
+class MatchEngine:
+    """Mantiene la tabla `matches` con la compatibilidad estudiante-oferta.
+    
+    Los puntajes se recalculan solo para las filas afectadas: al cambiar las
+    habilidades de un estudiante se reescriben sus matches y al crear, editar o
+    desactivar una oferta se reescriben los de esa oferta. El dashboard lee el
+    resultado con una consulta indexada en lugar de puntuar todas las ofertas.
+    """
+    
+    def __init__(self, db):
+        self.db = db
+    
+    def recompute_for_student(self, student_id):
+        """Recalcula los matches de un estudiante"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT habilidades FROM usuarios WHERE id = ? AND tipo = 'estudiante'",
+                (student_id,)
+            )
+            student = cursor.fetchone()
+            if student is None:
+                return 0
+        
+        offers = SkillIndex.for_database(self.db)
+        scores = offers.scores(student[0])
+        
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            written = _sync_rows(cursor, 'estudiante_id', student_id, scores, known=offers)
+            conn.commit()
+        if written:
+            self.db.bump_versions('matches')
+        return written
+    
+    def recompute_for_offer(self, offer_id):
+        """Recalcula los matches de una oferta (los elimina si la oferta está inactiva)"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT habilidades_requeridas, activa FROM ofertas WHERE id = ?', (offer_id,))
+            offer = cursor.fetchone()
+        
+        scores = {}
+        students = None
+        if offer and offer[1]:
+            required = parse_skills(offer[0])
+            students = SkillIndex.for_database(self.db, SkillIndex.STUDENTS)
+            for student_id in students.candidates(required):
+                scores[student_id] = CompatibilityCalculator.calculate_compatibility(
+                    students.skills_of(student_id), required
+                )
+        
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            # Una oferta inactiva o borrada pierde todos sus matches pendientes
+            written = _sync_rows(cursor, 'oferta_id', offer_id, scores, known=students)
+            conn.commit()
+        if written:
+            self.db.bump_versions('matches')
+        return written
+    
+    def recompute_many(self, kind, entity_ids):
+        """Recalcula en una sola transacción los matches de muchos estudiantes u ofertas.
+        
+        Construye el índice del otro lado una vez, leyendo la base, en lugar de
+        recalcular fila por fila (cargas masivas).
+        """
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            sync_matcher(cursor, self.db.db_path)
+            if kind == SkillIndex.STUDENTS:
+                written = backfill_matches(cursor, student_ids=entity_ids)
+            else:
+                written = backfill_offer_matches(cursor, entity_ids)
+            conn.commit()
+        if written:
+            self.db.bump_versions('matches')
+        return written
+    
+    def rebuild_all(self):
+        """Recalcula la tabla completa (despliegues y cargas masivas)"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            sync_matcher(cursor, self.db.db_path)
+            written = backfill_matches(cursor)
+            conn.commit()
+        self.db.bump_versions('matches')
+        return written
+    
+    def get_top_matches(self, student_id, limit=5):
+        """Retorna las ofertas activas mejor puntuadas para un estudiante"""
+        return self.db.cached_query(
+            ('get_top_matches', student_id, limit), ('matches', 'ofertas', 'usuarios'),
+            lambda: self._fetch_top_matches(student_id, limit)
+        )
+    
+    def _fetch_top_matches(self, student_id, limit):
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = RecommendedOffer.row_factory()
+            cursor.execute('''
+                SELECT o.id, o.empresa_id, o.titulo, o.descripcion, o.tipo, o.habilidades_requeridas,
+                       o.ubicacion, o.activa, o.created_at, u.nombre AS empresa_nombre, m.compatibilidad
+                FROM matches m
+                JOIN ofertas o ON o.id = m.oferta_id
+                JOIN usuarios u ON o.empresa_id = u.id
+                WHERE m.estudiante_id = ? AND o.activa = 1 AND m.compatibilidad > 0
+                ORDER BY m.compatibilidad DESC, m.oferta_id
+                LIMIT ?
+            ''', (student_id, limit))
+            
+            return cursor.fetchall()
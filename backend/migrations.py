@@ -0,0 +1,557 @@
+# backend/migrations.py
+"""Migraciones versionadas del esquema.
+
+La versión aplicada se guarda en `PRAGMA user_version`. Cada migración es una
+función que recibe un cursor y se registra con el decorador `migration`; se
+ejecutan en orden, cada una dentro de su propia transacción.
+"""
+
+MIGRATIONS = []
+
+def migration(version, description):
+    """Registra una función como el paso `version` del esquema"""
+    def decorator(func):
+        if any(m[0] == version for m in MIGRATIONS):
+            raise ValueError(f"Migración {version} registrada dos veces")
+        MIGRATIONS.append((version, description, func))
+        MIGRATIONS.sort(key=lambda m: m[0])
+        return func
+    return decorator
+
+def get_schema_version(conn):
+    """Retorna la versión actual del esquema"""
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def latest_version():
+    """Retorna la versión más reciente registrada"""
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+def pending_migrations(conn):
+    """Lista las migraciones que faltan por aplicar"""
+    current = get_schema_version(conn)
+    return [m for m in MIGRATIONS if m[0] > current]
+
+def migrate(conn, target=None):
+    """Aplica las migraciones pendientes hasta `target` y retorna las versiones aplicadas"""
+    target = latest_version() if target is None else target
+    applied = []
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # Control manual de transacciones (DDL incluido)
+    
+    try:
+        for version, description, func in MIGRATIONS:
+            if version > target:
+                break
+            
+            # BEGIN IMMEDIATE serializa procesos que arrancan a la vez;
+            # la versión se vuelve a leer ya con el candado de escritura
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if get_schema_version(conn) >= version:
+                    conn.execute('COMMIT')
+                    continue
+                func(conn.cursor())
+                conn.execute(f'PRAGMA user_version = {int(version)}')
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            applied.append(version)
+    finally:
+        conn.isolation_level = isolation_level
+    
+    return applied
+
+@migration(1, "Esquema inicial: usuarios, sesiones, ofertas y matches")
+def _esquema_inicial(cursor):
+    # Tabla de usuarios
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS usuarios (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            nombre TEXT NOT NULL,
+            tipo TEXT NOT NULL CHECK (tipo IN ('estudiante', 'empresa')),
+            carrera TEXT,
+            semestre INTEGER,
+            habilidades TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    ''')
+    
+    # Tabla de sesiones
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sesiones (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            usuario_id INTEGER,
+            token TEXT UNIQUE NOT NULL,
+            expires_at TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (usuario_id) REFERENCES usuarios (id)
+        )
+    ''')
+    
+    # Tabla de ofertas laborales
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS ofertas (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            empresa_id INTEGER,
+            titulo TEXT NOT NULL,
+            descripcion TEXT,
+            tipo TEXT NOT NULL CHECK (tipo IN ('practica', 'empleo', 'servicio_social')),
+            habilidades_requeridas TEXT,
+            ubicacion TEXT,
+            activa BOOLEAN DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (empresa_id) REFERENCES usuarios (id)
+        )
+    ''')
+    
+    # Tabla de matches
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS matches (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            estudiante_id INTEGER,
+            oferta_id INTEGER,
+            compatibilidad REAL,
+            estado TEXT DEFAULT 'pendiente',
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (estudiante_id) REFERENCES usuarios (id),
+            FOREIGN KEY (oferta_id) REFERENCES ofertas (id)
+        )
+    ''')
+
+@migration(2, "Índices de matches y cálculo inicial de compatibilidades")
+def _matches_indexados(cursor):
+    from backend.matching import backfill_matches
+    
+    # Un match por par estudiante-oferta (se conserva el más reciente)
+    cursor.execute('''
+        DELETE FROM matches WHERE id NOT IN (
+            SELECT MAX(id) FROM matches GROUP BY estudiante_id, oferta_id
+        )
+    ''')
+    cursor.execute('''
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_matches_estudiante_oferta
+        ON matches (estudiante_id, oferta_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_matches_estudiante_compatibilidad
+        ON matches (estudiante_id, compatibilidad DESC, oferta_id)
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_matches_oferta
+        ON matches (oferta_id)
+    ''')
+    
+    backfill_matches(cursor)
+
+@migration(3, "Índice de sesiones por fecha de expiración")
+def _sesiones_por_expiracion(cursor):
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_sesiones_expires_at
+        ON sesiones (expires_at)
+    ''')
+
+@migration(4, "Índices para las agregaciones de estadísticas")
+def _indices_estadisticas(cursor):
+    # Índices de cobertura: los GROUP BY se resuelven sin leer las tablas
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_usuarios_tipo_carrera ON usuarios (tipo, carrera)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_usuarios_tipo_semestre ON usuarios (tipo, semestre)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ofertas_activa_tipo ON ofertas (activa, tipo)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ofertas_activa_ubicacion ON ofertas (activa, ubicacion)')
+
+@migration(5, "Tabla de contadores mantenida por triggers")
+def _contadores(cursor):
+    from backend.stats import rebuild_counters
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS counters (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    
+    # Usuarios por tipo
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_counters_usuarios_insert
+        AFTER INSERT ON usuarios
+        BEGIN
+            UPDATE counters SET value = value + 1
+            WHERE name = CASE NEW.tipo WHEN 'estudiante' THEN 'estudiantes' ELSE 'empresas' END;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_counters_usuarios_delete
+        AFTER DELETE ON usuarios
+        BEGIN
+            UPDATE counters SET value = value - 1
+            WHERE name = CASE OLD.tipo WHEN 'estudiante' THEN 'estudiantes' ELSE 'empresas' END;
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_counters_usuarios_update
+        AFTER UPDATE OF tipo ON usuarios
+        WHEN OLD.tipo IS NOT NEW.tipo
+        BEGIN
+            UPDATE counters SET value = value - 1
+            WHERE name = CASE OLD.tipo WHEN 'estudiante' THEN 'estudiantes' ELSE 'empresas' END;
+            UPDATE counters SET value = value + 1
+            WHERE name = CASE NEW.tipo WHEN 'estudiante' THEN 'estudiantes' ELSE 'empresas' END;
+        END
+    ''')
+    
+    # Ofertas activas
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_counters_ofertas_insert
+        AFTER INSERT ON ofertas
+        WHEN NEW.activa = 1
+        BEGIN
+            UPDATE counters SET value = value + 1 WHERE name = 'ofertas_activas';
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_counters_ofertas_delete
+        AFTER DELETE ON ofertas
+        WHEN OLD.activa = 1
+        BEGIN
+            UPDATE counters SET value = value - 1 WHERE name = 'ofertas_activas';
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_counters_ofertas_update
+        AFTER UPDATE OF activa ON ofertas
+        WHEN COALESCE(OLD.activa = 1, 0) != COALESCE(NEW.activa = 1, 0)
+        BEGIN
+            UPDATE counters SET value = value + (CASE WHEN NEW.activa = 1 THEN 1 ELSE -1 END)
+            WHERE name = 'ofertas_activas';
+        END
+    ''')
+    
+    # Matches aceptados
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_counters_matches_insert
+        AFTER INSERT ON matches
+        WHEN NEW.estado = 'aceptado'
+        BEGIN
+            UPDATE counters SET value = value + 1 WHERE name = 'matches_aceptados';
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_counters_matches_delete
+        AFTER DELETE ON matches
+        WHEN OLD.estado = 'aceptado'
+        BEGIN
+            UPDATE counters SET value = value - 1 WHERE name = 'matches_aceptados';
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_counters_matches_update
+        AFTER UPDATE OF estado ON matches
+        WHEN COALESCE(OLD.estado = 'aceptado', 0) != COALESCE(NEW.estado = 'aceptado', 0)
+        BEGIN
+            UPDATE counters SET value = value + (CASE WHEN NEW.estado = 'aceptado' THEN 1 ELSE -1 END)
+            WHERE name = 'matches_aceptados';
+        END
+    ''')
+    
+    rebuild_counters(cursor)
+
+@migration(6, "Match rate incremental: umbral, resúmenes por estudiante/oferta y triggers")
+def _match_rate(cursor):
+    from config.settings import Config
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS metric_settings (
+            name TEXT PRIMARY KEY,
+            value REAL NOT NULL
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute(
+        "INSERT OR IGNORE INTO metric_settings (name, value) VALUES ('match_threshold', ?)",
+        (Config.MATCH_RATE_THRESHOLD,)
+    )
+    
+    # Matches que superan el umbral, por estudiante y por oferta
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS match_summary_estudiantes (
+            estudiante_id INTEGER PRIMARY KEY,
+            qualifying INTEGER NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS match_summary_ofertas (
+            oferta_id INTEGER PRIMARY KEY,
+            qualifying INTEGER NOT NULL
+        )
+    ''')
+    
+    threshold = "(SELECT value FROM metric_settings WHERE name = 'match_threshold')"
+    
+    # Cuerpos reutilizados: un match empieza o deja de calificar
+    gain = '''
+        INSERT INTO match_summary_estudiantes (estudiante_id, qualifying) VALUES (NEW.estudiante_id, 1)
+        ON CONFLICT (estudiante_id) DO UPDATE SET qualifying = qualifying + 1;
+        UPDATE counters SET value = value + 1
+        WHERE name = 'estudiantes_con_match'
+          AND (SELECT qualifying FROM match_summary_estudiantes WHERE estudiante_id = NEW.estudiante_id) = 1;
+        INSERT INTO match_summary_ofertas (oferta_id, qualifying) VALUES (NEW.oferta_id, 1)
+        ON CONFLICT (oferta_id) DO UPDATE SET qualifying = qualifying + 1;
+        UPDATE counters SET value = value + 1
+        WHERE name = 'ofertas_con_candidato'
+          AND (SELECT qualifying FROM match_summary_ofertas WHERE oferta_id = NEW.oferta_id) = 1
+          AND (SELECT activa FROM ofertas WHERE id = NEW.oferta_id) = 1;
+    '''
+    loss = '''
+        UPDATE match_summary_estudiantes SET qualifying = qualifying - 1 WHERE estudiante_id = OLD.estudiante_id;
+        UPDATE counters SET value = value - 1
+        WHERE name = 'estudiantes_con_match'
+          AND (SELECT qualifying FROM match_summary_estudiantes WHERE estudiante_id = OLD.estudiante_id) = 0;
+        DELETE FROM match_summary_estudiantes WHERE estudiante_id = OLD.estudiante_id AND qualifying <= 0;
+        UPDATE match_summary_ofertas SET qualifying = qualifying - 1 WHERE oferta_id = OLD.oferta_id;
+        UPDATE counters SET value = value - 1
+        WHERE name = 'ofertas_con_candidato'
+          AND (SELECT qualifying FROM match_summary_ofertas WHERE oferta_id = OLD.oferta_id) = 0
+          AND (SELECT activa FROM ofertas WHERE id = OLD.oferta_id) = 1;
+        DELETE FROM match_summary_ofertas WHERE oferta_id = OLD.oferta_id AND qualifying <= 0;
+    '''
+    
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_match_rate_insert
+        AFTER INSERT ON matches
+        WHEN NEW.compatibilidad >= {threshold}
+        BEGIN {gain} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_match_rate_delete
+        AFTER DELETE ON matches
+        WHEN OLD.compatibilidad >= {threshold}
+        BEGIN {loss} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_match_rate_update_gain
+        AFTER UPDATE OF compatibilidad ON matches
+        WHEN NOT COALESCE(OLD.compatibilidad >= {threshold}, 0) AND NEW.compatibilidad >= {threshold}
+        BEGIN {gain} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_match_rate_update_loss
+        AFTER UPDATE OF compatibilidad ON matches
+        WHEN OLD.compatibilidad >= {threshold} AND NOT COALESCE(NEW.compatibilidad >= {threshold}, 0)
+        BEGIN {loss} END
+    ''')
+    
+    # Una oferta que se activa o desactiva entra o sale del conteo si tiene candidatos
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_match_rate_ofertas_update
+        AFTER UPDATE OF activa ON ofertas
+        WHEN COALESCE(OLD.activa = 1, 0) != COALESCE(NEW.activa = 1, 0)
+        BEGIN
+            UPDATE counters SET value = value + (CASE WHEN NEW.activa = 1 THEN 1 ELSE -1 END)
+            WHERE name = 'ofertas_con_candidato'
+              AND EXISTS (SELECT 1 FROM match_summary_ofertas WHERE oferta_id = NEW.id AND qualifying > 0);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_match_rate_ofertas_delete
+        AFTER DELETE ON ofertas
+        WHEN OLD.activa = 1
+        BEGIN
+            UPDATE counters SET value = value - 1
+            WHERE name = 'ofertas_con_candidato'
+              AND EXISTS (SELECT 1 FROM match_summary_ofertas WHERE oferta_id = OLD.id AND qualifying > 0);
+        END
+    ''')
+    
+    cursor.execute(f'''
+        INSERT INTO match_summary_estudiantes (estudiante_id, qualifying)
+        SELECT estudiante_id, COUNT(*) FROM matches
+        WHERE compatibilidad >= {threshold}
+        GROUP BY estudiante_id
+    ''')
+    cursor.execute(f'''
+        INSERT INTO match_summary_ofertas (oferta_id, qualifying)
+        SELECT oferta_id, COUNT(*) FROM matches
+        WHERE compatibilidad >= {threshold}
+        GROUP BY oferta_id
+    ''')
+    cursor.execute('''
+        INSERT OR REPLACE INTO counters (name, value) VALUES
+            ('estudiantes_con_match', (SELECT COUNT(*) FROM match_summary_estudiantes)),
+            ('ofertas_con_candidato', (
+                SELECT COUNT(*) FROM match_summary_ofertas s
+                JOIN ofertas o ON o.id = s.oferta_id
+                WHERE o.activa = 1
+            ))
+    ''')
+
+@migration(7, "Búsqueda de texto completo de ofertas (FTS5)")
+def _busqueda_ofertas(cursor):
+    # Tabla de contenido externo: el texto vive en `ofertas`, el índice en `ofertas_fts`
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS ofertas_fts USING fts5(
+            titulo, descripcion, habilidades_requeridas,
+            content='ofertas', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    ''')
+    # Ranking BM25 por defecto: el título pesa más que las habilidades y éstas más que la descripción
+    cursor.execute("INSERT INTO ofertas_fts (ofertas_fts, rank) VALUES ('rank', 'bm25(10.0, 1.0, 5.0)')")
+    
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_ofertas_fts_insert
+        AFTER INSERT ON ofertas
+        BEGIN
+            INSERT INTO ofertas_fts (rowid, titulo, descripcion, habilidades_requeridas)
+            VALUES (NEW.id, NEW.titulo, NEW.descripcion, NEW.habilidades_requeridas);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_ofertas_fts_delete
+        AFTER DELETE ON ofertas
+        BEGIN
+            INSERT INTO ofertas_fts (ofertas_fts, rowid, titulo, descripcion, habilidades_requeridas)
+            VALUES ('delete', OLD.id, OLD.titulo, OLD.descripcion, OLD.habilidades_requeridas);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_ofertas_fts_update
+        AFTER UPDATE OF titulo, descripcion, habilidades_requeridas ON ofertas
+        BEGIN
+            INSERT INTO ofertas_fts (ofertas_fts, rowid, titulo, descripcion, habilidades_requeridas)
+            VALUES ('delete', OLD.id, OLD.titulo, OLD.descripcion, OLD.habilidades_requeridas);
+            INSERT INTO ofertas_fts (rowid, titulo, descripcion, habilidades_requeridas)
+            VALUES (NEW.id, NEW.titulo, NEW.descripcion, NEW.habilidades_requeridas);
+        END
+    ''')
+    
+    cursor.execute("INSERT INTO ofertas_fts (ofertas_fts) VALUES ('rebuild')")
+
+@migration(8, "Índices para la paginación por cursor (created_at, id)")
+def _paginacion_por_cursor(cursor):
+    # Cada página es un rango del índice: el costo no depende de cuántas páginas la preceden
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_usuarios_created ON usuarios (created_at, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_usuarios_tipo_created ON usuarios (tipo, created_at, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ofertas_activa_created ON ofertas (activa, created_at, id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_ofertas_empresa_created ON ofertas (empresa_id, created_at, id)')
+
+@migration(9, "Catálogo de habilidades: skills, user_skills y offer_skills")
+def _catalogo_habilidades(cursor):
+    from backend.skill_catalog import rebuild_skill_catalog
+    
+    # Nombre canónico: la habilidad normalizada por `parse_skills` (minúsculas, sin espacios extra)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS skills (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            nombre TEXT UNIQUE NOT NULL
+        )
+    ''')
+    # Tablas de unión sin rowid: la llave primaria cubre "habilidades de X" y
+    # el índice inverso cubre "quién tiene la habilidad X"
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS user_skills (
+            usuario_id INTEGER NOT NULL,
+            skill_id INTEGER NOT NULL,
+            PRIMARY KEY (usuario_id, skill_id),
+            FOREIGN KEY (usuario_id) REFERENCES usuarios (id),
+            FOREIGN KEY (skill_id) REFERENCES skills (id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS offer_skills (
+            oferta_id INTEGER NOT NULL,
+            skill_id INTEGER NOT NULL,
+            PRIMARY KEY (oferta_id, skill_id),
+            FOREIGN KEY (oferta_id) REFERENCES ofertas (id),
+            FOREIGN KEY (skill_id) REFERENCES skills (id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_user_skills_skill ON user_skills (skill_id, usuario_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_offer_skills_skill ON offer_skills (skill_id, oferta_id)')
+    
+    rebuild_skill_catalog(cursor)
+
+@migration(10, "Sinónimos de habilidades (skill_aliases) y recálculo de matches")
+def _sinonimos_habilidades(cursor):
+    from config.settings import Config
+    from backend.matching import backfill_matches
+    from backend.skill_catalog import skill_ids
+    
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS skill_aliases (
+            alias TEXT PRIMARY KEY,
+            skill_id INTEGER NOT NULL,
+            FOREIGN KEY (skill_id) REFERENCES skills (id)
+        ) WITHOUT ROWID
+    ''')
+    ids = skill_ids(cursor, Config.SKILL_ALIASES.values())
+    cursor.executemany(
+        'INSERT OR IGNORE INTO skill_aliases (alias, skill_id) VALUES (?, ?)',
+        [(alias, ids[name]) for alias, name in Config.SKILL_ALIASES.items()]
+    )
+    
+    # La regla de coincidencia cambió (sinónimos y similitud en lugar de subcadenas)
+    backfill_matches(cursor)
+
+@migration(11, "Versiones de datos para los índices de habilidades en memoria")
+def _versiones_de_datos(cursor):
+    # Un contador por índice (`SkillIndex.OFFERS` / `SkillIndex.STUDENTS`) que sube con cada
+    # fila escrita, también desde otros procesos; un índice construido con otra versión está viejo
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_versions (
+            name TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO data_versions (name) VALUES ('ofertas'), ('estudiantes')")
+    
+    # Ofertas: cualquier escritura (las ediciones de cualquier columna suben la versión en uno)
+    for event in ('INSERT', 'DELETE', 'UPDATE'):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_data_versions_ofertas_{event.lower()}
+            AFTER {event} ON ofertas
+            BEGIN
+                UPDATE data_versions SET value = value + 1 WHERE name = 'ofertas';
+            END
+        ''')
+    
+    # Estudiantes: altas, bajas y cambios de habilidades o de tipo
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_data_versions_usuarios_insert
+        AFTER INSERT ON usuarios
+        WHEN NEW.tipo = 'estudiante'
+        BEGIN
+            UPDATE data_versions SET value = value + 1 WHERE name = 'estudiantes';
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_data_versions_usuarios_delete
+        AFTER DELETE ON usuarios
+        WHEN OLD.tipo = 'estudiante'
+        BEGIN
+            UPDATE data_versions SET value = value + 1 WHERE name = 'estudiantes';
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS trg_data_versions_usuarios_update
+        AFTER UPDATE OF habilidades, tipo ON usuarios
+        WHEN 'estudiante' IN (OLD.tipo, NEW.tipo)
+        BEGIN
+            UPDATE data_versions SET value = value + 1 WHERE name = 'estudiantes';
+        END
+    ''')
+
+@migration(12, "Versión de los sinónimos de habilidades para el matcher en memoria")
+def _version_sinonimos(cursor):
+    # Cada proceso compara esta versión (y el mayor id de `skills`) con la que cargó en su
+    # `SkillMatcher`; un `manage.py alias` en otro proceso la sube
+    cursor.execute("INSERT OR IGNORE INTO data_versions (name) VALUES ('skill_aliases')")
+    for event in ('INSERT', 'DELETE', 'UPDATE'):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_data_versions_skill_aliases_{event.lower()}
+            AFTER {event} ON skill_aliases
+            BEGIN
+                UPDATE data_versions SET value = value + 1 WHERE name = 'skill_aliases';
+            END
+        ''')
@@ -1,10 +1,98 @@
 # backend/models.py
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, field, fields
 from typing import Optional, List
 from datetime import datetime
+from backend.skills import parse_skills
+from backend.skill_matcher import SkillMatcher
 
-@dataclass
-class User:
+# Con __slots__ cada instancia ocupa menos de la mitad que un dict equivalente (Python 3.10+)
+model = dataclass(slots=True) if sys.version_info >= (3, 10) else dataclass
+
+def _split_skills(text: Optional[str]) -> tuple:
+    if not text:
+        return ()
+    return tuple(skill.strip() for skill in text.split(','))
+
+class Record:
+    """Base de los modelos: acceso estilo dict para el código que usaba filas como diccionarios.
+    
+    Soporta `fila['campo']`, `get`, `keys`, `items`, `in` y `dict(fila)` sobre los
+    campos públicos. Las instancias que retorna `DatabaseManager` se comparten a
+    través de la caché de consultas, así que se tratan como de solo lectura.
+    """
+    __slots__ = ()
+    
+    @classmethod
+    def field_names(cls) -> tuple:
+        """Campos públicos del modelo, en orden de declaración"""
+        names = _FIELD_NAMES.get(cls)
+        if names is None:
+            names = tuple(f.name for f in fields(cls) if not f.name.startswith('_'))
+            _FIELD_NAMES[cls] = names
+        return names
+    
+    def keys(self) -> tuple:
+        return self.field_names()
+    
+    def __iter__(self):
+        return iter(self.field_names())
+    
+    def __contains__(self, key) -> bool:
+        return key in self.field_names()
+    
+    def __getitem__(self, key):
+        if key not in self.field_names():
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def get(self, key, default=None):
+        if key not in self.field_names():
+            return default
+        return getattr(self, key)
+    
+    def values(self) -> list:
+        return [getattr(self, name) for name in self.field_names()]
+    
+    def items(self) -> list:
+        return [(name, getattr(self, name)) for name in self.field_names()]
+    
+    def to_dict(self) -> dict:
+        return dict(self.items())
+    
+    @classmethod
+    def row_factory(cls):
+        """Retorna una función para `cursor.row_factory` que construye instancias del modelo.
+        
+        Las columnas se asocian por nombre (usar alias en el SELECT). Si coinciden
+        en orden con los campos del modelo se pasan posicionalmente, sin armar un
+        dict por fila.
+        """
+        state = [None, None]  # (cursor.description, columnas si no van en orden; None si van en orden)
+        
+        def factory(cursor, row):
+            if cursor.description is not state[0]:
+                state[0] = cursor.description
+                state[1] = cls._mapping(tuple(column[0] for column in cursor.description))
+            if state[1] is None:
+                return cls(*row)
+            return cls(**dict(zip(state[1], row)))
+        return factory
+    
+    @classmethod
+    def _mapping(cls, columns: tuple):
+        init_names = tuple(f.name for f in fields(cls) if f.init)
+        unknown = [column for column in columns if column not in init_names]
+        if unknown:
+            raise ValueError(f"Columnas sin campo en {cls.__name__}: {', '.join(unknown)}")
+        if columns == init_names[:len(columns)]:
+            return None
+        return columns
+
+_FIELD_NAMES = {}
+
+@model
+class User(Record):
     """Modelo de Usuario"""
     id: int
     email: str
@@ -14,6 +102,7 @@ class User:
     semestre: Optional[int] = None
     habilidades: Optional[str] = None
     created_at: Optional[datetime] = None
+    _skills_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
     
     def is_student(self) -> bool:
         return self.tipo == 'estudiante'
@@ -21,14 +110,29 @@ class User:
     def is_company(self) -> bool:
         return self.tipo == 'empresa'
     
+    def _skills(self) -> tuple:
+        """(texto, lista) cacheado; se recalcula solo si cambia `habilidades`"""
+        cache = self._skills_cache
+        if cache is None or cache[0] is not self.habilidades:
+            cache = (self.habilidades, _split_skills(self.habilidades))
+            self._skills_cache = cache
+        return cache
+    
     def get_skills_list(self) -> List[str]:
         """Convierte las habilidades en una lista"""
-        if not self.habilidades:
-            return []
-        return [skill.strip() for skill in self.habilidades.split(',')]
+        return list(self._skills()[1])
+
+@model
+class UserCredentials(User):
+    """Usuario con su hash de contraseña (solo para autenticar)"""
+    password_hash: Optional[str] = None
+    
+    def without_password(self) -> User:
+        """Copia del usuario sin el hash de contraseña"""
+        return User(*[getattr(self, name) for name in User.field_names()])
 
-@dataclass
-class Session:
+@model
+class Session(Record):
     """Modelo de Sesión"""
     id: int
     usuario_id: int
@@ -36,8 +140,8 @@ class Session:
     expires_at: datetime
     created_at: datetime
 
-@dataclass
-class Offer:
+@model
+class Offer(Record):
     """Modelo de Oferta Laboral"""
     id: int
     empresa_id: int
@@ -49,12 +153,19 @@ class Offer:
     activa: bool = True
     created_at: Optional[datetime] = None
     empresa_nombre: Optional[str] = None
+    _skills_cache: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    
+    def _skills(self) -> tuple:
+        """(texto, lista) cacheado; se recalcula solo si cambian las habilidades"""
+        cache = self._skills_cache
+        if cache is None or cache[0] is not self.habilidades_requeridas:
+            cache = (self.habilidades_requeridas, _split_skills(self.habilidades_requeridas))
+            self._skills_cache = cache
+        return cache
     
     def get_required_skills_list(self) -> List[str]:
         """Convierte las habilidades requeridas en una lista"""
-        if not self.habilidades_requeridas:
-            return []
-        return [skill.strip() for skill in self.habilidades_requeridas.split(',')]
+        return list(self._skills()[1])
     
     def get_type_display(self) -> str:
         """Retorna el tipo de oferta en formato legible"""
@@ -65,8 +176,20 @@ class Offer:
         }
         return type_map.get(self.tipo, self.tipo)
 
-@dataclass
-class Match:
+@model
+class RecommendedOffer(Offer):
+    """Oferta con la compatibilidad del estudiante al que se recomienda"""
+    compatibilidad: Optional[float] = None
+
+@model
+class OfferSearchResult(Offer):
+    """Oferta encontrada por la búsqueda de texto"""
+    rank: Optional[float] = None
+    snippet: Optional[str] = None
+    titulo_resaltado: Optional[str] = None
+
+@model
+class Match(Record):
     """Modelo de Match entre estudiante y oferta"""
     id: int
     estudiante_id: int
@@ -115,24 +238,19 @@ class CompatibilityCalculator:
     
     @staticmethod
     def calculate_compatibility(student_skills: List[str], required_skills: List[str]) -> float:
-        """Calcula la compatibilidad entre habilidades del estudiante y requeridas"""
+        """Calcula la compatibilidad entre habilidades del estudiante y requeridas.
+        
+        Una habilidad requerida cuenta como cubierta si el estudiante tiene la misma,
+        un sinónimo o una con nombre similar (ver `SkillMatcher`).
+        """
         if not required_skills:
             return 0.0
         
-        # Normalizar habilidades (minúsculas, sin espacios extra)
-        student_skills_normalized = [skill.lower().strip() for skill in student_skills]
-        required_skills_normalized = [skill.lower().strip() for skill in required_skills]
-        
-        # Contar habilidades que coinciden
-        matches = 0
-        for required_skill in required_skills_normalized:
-            for student_skill in student_skills_normalized:
-                if required_skill in student_skill or student_skill in required_skill:
-                    matches += 1
-                    break
+        # Contar habilidades que coinciden (el matcher normaliza mayúsculas, espacios y acentos)
+        matches = SkillMatcher.default().count_matches(student_skills, required_skills)
         
         # Calcular porcentaje de compatibilidad
-        compatibility = (matches / len(required_skills_normalized)) * 100
+        compatibility = (matches / len(required_skills)) * 100
         return min(compatibility, 100.0)  # Máximo 100%
     
     @staticmethod
@@ -141,14 +259,107 @@ class CompatibilityCalculator:
         student_skills_normalized = [skill.lower().strip() for skill in student_skills]
         required_skills_normalized = [skill.lower().strip() for skill in required_skills]
         
-        gaps = []
-        for required_skill in required_skills_normalized:
-            found = False
-            for student_skill in student_skills_normalized:
-                if required_skill in student_skill or student_skill in required_skill:
-                    found = True
-                    break
-            if not found:
-                gaps.append(required_skill)
-        
-        return gaps
+        return SkillMatcher.default().missing(student_skills_normalized, required_skills_normalized)
+    
+    @staticmethod
+    def build_skill_matrix(skill_lists, vocabulary: dict, binary: bool = False):
+        """Codifica listas de habilidades como matriz dispersa de incidencia (filas x vocabulario).
+        
+        Las habilidades fuera del vocabulario se ignoran. Con `binary=False` cada
+        celda cuenta cuántas veces aparece la habilidad en la fila.
+        """
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        
+        indptr = [0]
+        indices = []
+        for skills in skill_lists:
+            for token in parse_skills(skills):
+                column = vocabulary.get(token)
+                if column is not None:
+                    indices.append(column)
+            indptr.append(len(indices))
+        
+        data = np.ones(len(indices), dtype=np.int32)
+        matrix = csr_matrix(
+            (data, np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(vocabulary))
+        )
+        matrix.sum_duplicates()
+        if binary:
+            matrix.data[:] = 1
+        return matrix
+    
+    @staticmethod
+    def iter_compatibility_chunks(student_skill_lists, offer_skill_lists, chunk_rows: Optional[int] = None):
+        """Calcula compatibilidad y brechas de todos los estudiantes contra todas las ofertas por bloques.
+        
+        Genera tuplas `(inicio, puntajes, brechas)` donde `puntajes` (float64) y
+        `brechas` (int32) son matrices densas de `bloque x ofertas` para los
+        estudiantes `inicio:inicio + bloque`. El tamaño del bloque se elige para
+        no superar `Config.COMPATIBILITY_BATCH_MEMORY_MB` salvo que se indique.
+        
+        Las habilidades coinciden solo por token exacto (normalizado). Para esos
+        casos el resultado es idéntico a `calculate_compatibility` y al número de
+        elementos de `get_skill_gaps`. Difiere cuando la función escalar acepta
+        un sinónimo o un nombre similar ("ml" contra "machine learning"): aquí no
+        cuentan. Además, los elementos vacíos de una lista separada por comas se
+        descartan.
+        """
+        import numpy as np
+        from config.settings import Config
+        
+        offer_skill_lists = list(offer_skill_lists)
+        vocabulary = {}
+        for skills in offer_skill_lists:
+            for token in parse_skills(skills):
+                vocabulary.setdefault(token, len(vocabulary))
+        
+        required = CompatibilityCalculator.build_skill_matrix(offer_skill_lists, vocabulary)
+        required_t = required.T.tocsr()
+        required_counts = np.asarray(required.sum(axis=1)).ravel().astype(np.int32)
+        has_required = required_counts > 0
+        safe_counts = np.where(has_required, required_counts, 1)
+        
+        if chunk_rows is None:
+            bytes_per_row = max(1, len(offer_skill_lists)) * (8 + 4 + 4)
+            chunk_rows = max(1, Config.COMPATIBILITY_BATCH_MEMORY_MB * 1024 * 1024 // bytes_per_row)
+        
+        student_iter = iter(student_skill_lists)
+        start = 0
+        while True:
+            chunk = [skills for _, skills in zip(range(chunk_rows), student_iter)]
+            if not chunk:
+                break
+            
+            students = CompatibilityCalculator.build_skill_matrix(chunk, vocabulary, binary=True)
+            matches = (students @ required_t).toarray().astype(np.int32, copy=False)
+            
+            scores = np.where(has_required, (matches / safe_counts) * 100, 0.0)
+            np.minimum(scores, 100.0, out=scores)
+            gaps = np.where(has_required, required_counts - matches, 0).astype(np.int32, copy=False)
+            
+            yield start, scores, gaps
+            start += len(chunk)
+    
+    @staticmethod
+    def calculate_compatibility_matrix(student_skill_lists, offer_skill_lists, chunk_rows: Optional[int] = None):
+        """Retorna las matrices completas (puntajes, brechas) de estudiantes x ofertas.
+        
+        Arma el resultado con `iter_compatibility_chunks`; para poblaciones grandes
+        conviene consumir los bloques directamente y no materializar la matriz.
+        """
+        import numpy as np
+        
+        offer_skill_lists = list(offer_skill_lists)
+        score_blocks = []
+        gap_blocks = []
+        for _, scores, gaps in CompatibilityCalculator.iter_compatibility_chunks(
+                student_skill_lists, offer_skill_lists, chunk_rows):
+            score_blocks.append(scores)
+            gap_blocks.append(gaps)
+        
+        if not score_blocks:
+            return (np.zeros((0, len(offer_skill_lists))),
+                    np.zeros((0, len(offer_skill_lists)), dtype=np.int32))
+        return np.vstack(score_blocks), np.vstack(gap_blocks)
@@ -0,0 +1,147 @@
+# backend/pool.py
+import sqlite3
+import queue
+import threading
+from contextlib import contextmanager
+from config.settings import Config
+from backend.query_metrics import InstrumentedConnection, finish_statements
+
+class PoolTimeoutError(Exception):
+    """No hubo conexiones libres en el pool dentro del tiempo de espera"""
+
+class ConnectionPool:
+    """Pool de conexiones SQLite compartido por todo el proceso.
+    
+    Streamlit atiende cada sesión desde su propio hilo, por lo que las conexiones
+    se crean con check_same_thread=False y el pool garantiza que cada una se
+    presta a un único hilo a la vez. Las conexiones son de larga vida y se
+    configuran una sola vez (WAL, synchronous=NORMAL, busy timeout y caché de
+    sentencias), de modo que cada consulta ya no paga el costo de conectar.
+    """
+    
+    _pools = {}
+    _pools_lock = threading.Lock()
+    
+    def __init__(self, db_path, max_size=None, timeout=None):
+        self.db_path = db_path
+        self.max_size = max_size or Config.DB_POOL_SIZE
+        self.timeout = Config.DB_POOL_TIMEOUT_SECONDS if timeout is None else timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def for_path(cls, db_path):
+        """Retorna el pool del proceso para una ruta de base de datos"""
+        with cls._pools_lock:
+            pool = cls._pools.get(db_path)
+            if pool is None:
+                pool = cls(db_path)
+                cls._pools[db_path] = pool
+            return pool
+    
+    @classmethod
+    def close_all_pools(cls):
+        """Cierra todas las conexiones de todos los pools del proceso"""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            pool.close()
+    
+    def _connect(self):
+        """Abre una conexión nueva ya configurada"""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=Config.DB_BUSY_TIMEOUT_MS / 1000,
+            check_same_thread=False,
+            cached_statements=Config.DB_STATEMENT_CACHE_SIZE,
+            factory=InstrumentedConnection if Config.QUERY_METRICS_ENABLED else sqlite3.Connection
+        )
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA busy_timeout={int(Config.DB_BUSY_TIMEOUT_MS)}')
+        return conn
+    
+    def acquire(self):
+        """Toma una conexión libre o crea una nueva si no se alcanzó el límite"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            can_create = self._created < self.max_size
+            if can_create:
+                self._created += 1
+        
+        if can_create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(
+                f"No hay conexiones disponibles después de {self.timeout}s ({self.max_size} en uso)"
+            )
+    
+    def release(self, conn):
+        """Devuelve una conexión al pool descartando transacciones abiertas"""
+        finish_statements(conn)
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            # La conexión quedó inutilizable; se descarta y se libera su lugar
+            self._discard(conn)
+            return
+        self._idle.put(conn)
+    
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+        with self._lock:
+            self._created -= 1
+    
+    @contextmanager
+    def connection(self):
+        """Presta una conexión durante un bloque with"""
+        conn = self.acquire()
+        try:
+            yield conn
+        except Exception:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+            raise
+        finally:
+            self.release(conn)
+    
+    def close(self):
+        """Cierra las conexiones libres del pool"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+    
+    def stats(self):
+        """Retorna el estado actual del pool"""
+        with self._lock:
+            created = self._created
+        idle = self._idle.qsize()
+        return {
+            'max_size': self.max_size,
+            'created': created,
+            'idle': idle,
+            'in_use': created - idle
+        }
@@ -0,0 +1,282 @@
+# backend/query_metrics.py
+import atexit
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from collections import deque
+from functools import lru_cache
+from config.settings import Config
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_THIS_FILE = os.path.abspath(__file__)
+
+# Límites superiores (ms) de los buckets del histograma; el último bucket es "más de 2500 ms"
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+_sites = {}  # (código, línea) -> "archivo.py:línea (función)"
+
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql):
+    """SQL de una sola línea con las listas `IN (?, ?, ...)` colapsadas.
+    
+    Las consultas que arman `IN` con tantos marcadores como valores comparten
+    así una sola entrada, sin importar el largo de la lista.
+    """
+    return _IN_LIST.sub('IN (?, ...)', ' '.join(sql.split()))
+
+def _call_site():
+    """Primer marco fuera de este módulo: dónde se ejecutó la consulta"""
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename == _THIS_FILE:
+        frame = frame.f_back
+    if frame is None:
+        return '?'
+    key = (frame.f_code, frame.f_lineno)
+    site = _sites.get(key)
+    if site is None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(_ROOT):
+            filename = os.path.relpath(filename, _ROOT)
+        site = f'{filename}:{frame.f_lineno} ({frame.f_code.co_name})'
+        _sites[key] = site
+    return site
+
+class QueryMetrics:
+    """Almacén en proceso de los tiempos de consulta, agrupados por sitio de llamada y SQL.
+    
+    Por cada par (sitio, SQL) guarda llamadas, tiempo total y máximo, filas y un
+    histograma por buckets de `BUCKETS_MS`. Las consultas que tardan al menos
+    `Config.SLOW_QUERY_MS` van además al log de consultas lentas con su
+    `EXPLAIN QUERY PLAN` (calculado una vez por SQL) y se imprimen. `dump()`
+    escribe todo en JSON; `python manage.py query-stats ARCHIVO` lo resume.
+    """
+    
+    _default = None
+    _default_lock = threading.Lock()
+    
+    def __init__(self, slow_ms=None, slow_log_size=None):
+        self.slow_ms = Config.SLOW_QUERY_MS if slow_ms is None else slow_ms
+        self._entries = {}   # (sitio, sql) -> [llamadas, total_s, max_s, filas, buckets]
+        self._slow = deque(maxlen=slow_log_size or Config.SLOW_QUERY_LOG_SIZE)
+        self._plans = {}     # sql -> líneas del plan
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def default(cls):
+        """Retorna el almacén compartido por el proceso"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+                    if Config.QUERY_METRICS_DUMP_PATH:
+                        atexit.register(cls._default.dump, Config.QUERY_METRICS_DUMP_PATH)
+        return cls._default
+    
+    def record(self, sql, site, seconds, rows, conn=None, params=None):
+        """Registra una ejecución; si es lenta, la agrega al log con su plan"""
+        bucket = bisect_left(BUCKETS_MS, seconds * 1000)
+        key = (site, normalize_sql(sql))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = self._entries[key] = [0, 0.0, 0.0, 0, [0] * (len(BUCKETS_MS) + 1)]
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+            entry[3] += rows
+            entry[4][bucket] += 1
+        
+        if seconds * 1000 >= self.slow_ms:
+            self._log_slow(sql, site, seconds, rows, conn, params)
+    
+    def _log_slow(self, sql, site, seconds, rows, conn, params):
+        text = normalize_sql(sql)
+        plan = self._plans.get(text)
+        if plan is None and conn is not None:
+            plan = self._plans[text] = explain(conn, sql, params)
+        self._slow.append({
+            'at': time.time(),
+            'site': site,
+            'ms': round(seconds * 1000, 3),
+            'rows': rows,
+            'sql': text,
+            'plan': plan or []
+        })
+        print(f"Consulta lenta ({seconds * 1000:.1f} ms, {rows} filas) en {site}: {text[:200]}")
+        for line in plan or []:
+            print(f"    {line}")
+    
+    def snapshot(self):
+        """Copia serializable de las estadísticas y del log de consultas lentas"""
+        with self._lock:
+            entries = [
+                {
+                    'site': site,
+                    'sql': sql,
+                    'calls': calls,
+                    'total_ms': round(total * 1000, 3),
+                    'mean_ms': round(total * 1000 / calls, 4),
+                    'max_ms': round(maximum * 1000, 3),
+                    'rows': rows,
+                    'histogram': dict(zip([f'<={bound}ms' for bound in BUCKETS_MS] + [f'>{BUCKETS_MS[-1]}ms'], buckets))
+                }
+                for (site, sql), (calls, total, maximum, rows, buckets) in self._entries.items()
+            ]
+            slow = list(self._slow)
+        entries.sort(key=lambda entry: entry['total_ms'], reverse=True)
+        return {'slow_query_ms': self.slow_ms, 'queries': entries, 'slow_queries': slow}
+    
+    def dump(self, path):
+        """Escribe el snapshot en un archivo JSON"""
+        with open(path, 'w', encoding='utf-8') as handle:
+            json.dump(self.snapshot(), handle, ensure_ascii=False, indent=2)
+        return path
+    
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self._slow.clear()
+            self._plans.clear()
+
+def explain(conn, sql, params=None):
+    """Líneas de `EXPLAIN QUERY PLAN` de una consulta (sin pasar por la instrumentación)"""
+    if params is None:
+        # executemany no conserva sus parámetros: se explica con NULL en cada marcador
+        params = (None,) * sql.count('?')
+    try:
+        cursor = sqlite3.Connection.cursor(conn)
+        sqlite3.Cursor.execute(cursor, f'EXPLAIN QUERY PLAN {sql}', params)
+        return [detail for _, _, _, detail in sqlite3.Cursor.fetchall(cursor)]
+    except (sqlite3.Error, ValueError) as e:
+        return [f'(sin plan: {e})']
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Cursor que mide cada sentencia: tiempo de `execute` más el de sus `fetch*`, filas y sitio.
+    
+    La sentencia se registra al agotar sus filas, al ejecutar la siguiente, al
+    cerrar el cursor o al devolver la conexión al pool (`finish_statements`), de
+    modo que el tiempo incluye el trabajo que SQLite hace perezosamente mientras
+    se leen las filas. Si el cursor se recolecta antes, solo se registra el
+    tiempo: la conexión puede estar ya prestada a otro hilo y no se usa para el
+    plan.
+    """
+    
+    _pending = None  # [sql, sitio, segundos, filas, params]
+    
+    def _finish(self, conn=None):
+        pending = self._pending
+        if pending is not None:
+            self._pending = None
+            sql, site, seconds, rows, params = pending
+            if not rows and self.rowcount > 0:
+                rows = self.rowcount
+            if conn is not None:
+                conn._open_statements.discard(self)
+            QueryMetrics.default().record(sql, site, seconds, rows, conn, params)
+    
+    def execute(self, sql, parameters=()):
+        self._finish(self.connection)
+        site = _call_site()
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        self._pending = [sql, site, time.perf_counter() - start, 0, parameters]
+        if self.description is None:
+            self._finish(self.connection)
+        else:
+            self.connection._open_statements.add(self)
+        return self
+    
+    def executemany(self, sql, seq_of_parameters):
+        self._finish(self.connection)
+        site = _call_site()
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        # Sin los parámetros: el iterable ya se consumió
+        self._pending = [sql, site, time.perf_counter() - start, 0, None]
+        self._finish(self.connection)
+        return self
+    
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - start
+            if row is None:
+                self._finish(self.connection)
+            else:
+                pending[3] += 1
+        return row
+    
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - start
+            pending[3] += len(rows)
+            if not rows:
+                self._finish(self.connection)
+        return rows
+    
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        pending = self._pending
+        if pending is not None:
+            pending[2] += time.perf_counter() - start
+            pending[3] += len(rows)
+            self._finish(self.connection)
+        return rows
+    
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+    
+    def close(self):
+        self._finish(self.connection)
+        super().close()
+    
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Conexión cuyos cursores (incluidos los de `conn.execute`) están instrumentados"""
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._open_statements = weakref.WeakSet()  # cursores con filas sin leer
+    
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+    
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+    
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+def finish_statements(conn):
+    """Registra las sentencias de `conn` que quedaron con filas sin leer.
+    
+    Se llama mientras el hilo todavía tiene la conexión (antes de devolverla al
+    pool), así el plan de una consulta lenta se calcula sin competir con otro hilo.
+    """
+    statements = getattr(conn, '_open_statements', None)
+    if statements:
+        for cursor in list(statements):
+            cursor._finish(conn)
@@ -0,0 +1,118 @@
+# backend/security.py
+import base64
+import hashlib
+import hmac
+import re
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config.settings import Config
+
+# Hash heredado: SHA-256 sin sal en hexadecimal
+LEGACY_HASH_RE = re.compile(r'^[0-9a-f]{64}$')
+
+class PasswordHashingBusyError(Exception):
+    """La cola del pool de hashing está llena; el inicio de sesión debe reintentarse"""
+
+class PasswordHasher:
+    """Hashing de contraseñas con PBKDF2-SHA256 salado, ejecutado en un pool acotado.
+    
+    Los hashes se guardan como `pbkdf2_sha256$iteraciones$sal$hash`, de modo que
+    subir `Config.PASSWORD_HASH_ITERATIONS` no invalida los existentes:
+    `needs_rehash` los detecta, igual que los SHA-256 sin sal heredados, y
+    `DatabaseManager.authenticate_user` los reemplaza al iniciar sesión.
+    
+    PBKDF2 cuesta decenas de milisegundos por diseño, así que no corre en el
+    hilo de Streamlit que atiende la petición sino en un pool de
+    `Config.PASSWORD_HASH_WORKERS` hilos (hashlib libera el GIL mientras
+    calcula). A lo más `Config.PASSWORD_HASH_QUEUE_LIMIT` trabajos esperan en
+    cola; cuando está llena, quien llega espera un lugar hasta
+    `Config.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS` y después recibe
+    `PasswordHashingBusyError`. Una ráfaga de logins tiene así una latencia
+    acotada y nunca ocupa más hilos que los del pool.
+    """
+    
+    ALGORITHM = 'pbkdf2_sha256'
+    
+    _default = None
+    _default_lock = threading.Lock()
+    
+    def __init__(self, iterations=None, workers=None, queue_limit=None, timeout=None):
+        self.iterations = iterations or Config.PASSWORD_HASH_ITERATIONS
+        self.workers = workers or Config.PASSWORD_HASH_WORKERS
+        self.queue_limit = Config.PASSWORD_HASH_QUEUE_LIMIT if queue_limit is None else queue_limit
+        self.timeout = Config.PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS if timeout is None else timeout
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='password-hash')
+        # Un lugar por hilo ocupado más uno por trabajo en cola
+        self._slots = threading.BoundedSemaphore(self.workers + self.queue_limit)
+    
+    @classmethod
+    def default(cls):
+        """Retorna el hasher compartido por el proceso"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+    
+    def encode(self, password, salt=None, iterations=None):
+        """Calcula el hash en el hilo actual (para lotes que ya corren en su propio pool)"""
+        salt = salt or secrets.token_hex(16)
+        iterations = iterations or self.iterations
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode(), salt.encode(), iterations)
+        return f'{self.ALGORITHM}${iterations}${salt}${base64.b64encode(digest).decode()}'
+    
+    def check(self, password, encoded):
+        """Verifica una contraseña en el hilo actual; acepta hashes SHA-256 heredados"""
+        if not encoded:
+            return False
+        if LEGACY_HASH_RE.match(encoded):
+            return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), encoded)
+        
+        try:
+            algorithm, iterations, salt, _ = encoded.split('$')
+            iterations = int(iterations)
+        except ValueError:
+            return False
+        if algorithm != self.ALGORITHM:
+            return False
+        return hmac.compare_digest(self.encode(password, salt, iterations), encoded)
+    
+    def is_encoded(self, encoded):
+        """Indica si un texto tiene el formato de un hash que `check` sabe verificar"""
+        if LEGACY_HASH_RE.match(encoded or ''):
+            return True
+        parts = (encoded or '').split('$')
+        return (len(parts) == 4 and parts[0] == self.ALGORITHM and parts[1].isdigit()
+                and int(parts[1]) > 0 and bool(parts[2]) and bool(parts[3]))
+    
+    def needs_rehash(self, encoded):
+        """Indica si un hash es heredado o usa menos iteraciones que las configuradas"""
+        parts = (encoded or '').split('$')
+        return len(parts) != 4 or parts[0] != self.ALGORITHM or parts[1] != str(self.iterations)
+    
+    def hash(self, password):
+        """Hashea una contraseña en el pool"""
+        return self._run(self.encode, password)
+    
+    def verify(self, password, encoded):
+        """Verifica una contraseña en el pool"""
+        return self._run(self.check, password, encoded)
+    
+    def _run(self, func, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PasswordHashingBusyError(
+                f"Cola de hashing llena después de {self.timeout}s "
+                f"({self.workers} hilos, {self.queue_limit} en espera)"
+            )
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+    
+    def shutdown(self):
+        """Detiene el pool esperando los trabajos en curso"""
+        self._executor.shutdown(wait=True)
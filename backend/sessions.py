@@ -0,0 +1,56 @@
+# backend/sessions.py
+from datetime import datetime
+from backend.cache import TTLCache
+from backend.database import DatabaseManager
+from config.settings import Config
+
+class SessionManager:
+    """Inicio, verificación y cierre de sesiones, sin dependencia de Streamlit.
+    
+    Lo usan la API HTTP directamente y la app de Streamlit a través de
+    `AuthManager`. Los tokens verificados se cachean por proceso durante a lo
+    sumo `Config.SESSION_CACHE_TTL_SECONDS` y nunca más allá del `expires_at` de
+    la sesión. Cerrar sesión o editar un perfil solo limpia la caché del proceso
+    que lo hace: otro proceso (la API y Streamlit, por ejemplo) puede seguir
+    aceptando ese token hasta que venza su entrada.
+    """
+    
+    # Caché token -> usuario compartida por todas las sesiones del proceso
+    session_cache = TTLCache(Config.SESSION_CACHE_SIZE, Config.SESSION_CACHE_TTL_SECONDS)
+    
+    def __init__(self, db=None):
+        self.db = db or DatabaseManager()
+    
+    def authenticate(self, email, password):
+        """Autentica un usuario y crea una sesión; retorna (token, usuario) o None"""
+        user = self.db.authenticate_user(email, password)
+        if user is None:
+            return None
+        return self.db.create_session(user['id']), user
+    
+    def end_session(self, token):
+        """Cierra una sesión (caché y base de datos)"""
+        self.session_cache.pop(token)
+        self.db.logout_user(token)
+    
+    def verify_token(self, token):
+        """Verifica un token usando la caché de sesiones antes que la base de datos"""
+        user = self.session_cache.get(token)
+        if user is None:
+            session = self.db.get_session_user(token)
+            if session is None:
+                return None
+            user, expires_at = session
+            # La entrada no sobrevive a la sesión: vence con el TTL o con expires_at, lo que ocurra antes
+            remaining = (expires_at - datetime.now()).total_seconds()
+            self.session_cache.set(token, user, min(self.session_cache.ttl, remaining))
+        # El `User` cacheado se comparte entre sesiones: quien llama no debe modificarlo
+        return user
+    
+    def invalidate_user_sessions(self, user_id):
+        """Descarta de la caché todas las sesiones de un usuario"""
+        return self.session_cache.invalidate_where(lambda token, user: user['id'] == user_id)
+    
+    def get_session_cache_stats(self):
+        """Retorna aciertos, fallos y tamaño de la caché de sesiones"""
+        return self.session_cache.stats()
@@ -0,0 +1,103 @@
+# backend/skill_catalog.py
+import sqlite3
+import threading
+from backend.skills import parse_skills
+from backend.skill_matcher import SkillMatcher
+
+# Tabla de origen -> (tabla de unión, columna de la entidad, columna de habilidades)
+CATALOG_TABLES = {
+    'usuarios': ('user_skills', 'usuario_id', 'habilidades'),
+    'ofertas': ('offer_skills', 'oferta_id', 'habilidades_requeridas')
+}
+
+# Catálogo cargado en el `SkillMatcher` del proceso: (base, versión de los sinónimos, mayor id de `skills`)
+_matcher_state = None
+_matcher_lock = threading.Lock()
+
+def _chunks(items, size=900):
+    """Divide una lista en bloques que caben en los parámetros de una consulta"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def skill_ids(cursor, tokens):
+    """Retorna {habilidad: id} del catálogo, dando de alta las que falten"""
+    tokens = list(dict.fromkeys(tokens))
+    if not tokens:
+        return {}
+    # El matcher registra las habilidades nuevas después del commit, en su siguiente `sync_matcher`
+    cursor.executemany('INSERT OR IGNORE INTO skills (nombre) VALUES (?)', [(token,) for token in tokens])
+    ids = {}
+    for chunk in _chunks(tokens):
+        placeholders = ', '.join('?' for _ in chunk)
+        cursor.execute(f'SELECT nombre, id FROM skills WHERE nombre IN ({placeholders})', chunk)
+        ids.update(cursor.fetchall())
+    return ids
+
+def sync_matcher(cursor, db_path):
+    """Pone al día el `SkillMatcher` del proceso con el catálogo de la base y lo retorna.
+    
+    Compara la versión de `skill_aliases` en `data_versions` y el mayor id de
+    `skills` con los de la última carga: si cambiaron los sinónimos (también
+    desde otro proceso) los recarga con todo el vocabulario; si solo hay
+    habilidades nuevas, registra esas. Cuando nada cambió cuesta una consulta.
+    """
+    global _matcher_state
+    matcher = SkillMatcher.default()
+    try:
+        cursor.execute('''
+            SELECT value, (SELECT COALESCE(MAX(id), 0) FROM skills)
+            FROM data_versions WHERE name = 'skill_aliases'
+        ''')
+    except sqlite3.OperationalError:
+        # Esquema anterior a la versión de los sinónimos: se quedan los de Config
+        return matcher
+    row = cursor.fetchone()
+    if row is None:
+        return matcher
+    alias_version, max_id = row
+    
+    with _matcher_lock:
+        if _matcher_state == (db_path, alias_version, max_id):
+            return matcher
+        if _matcher_state is None or _matcher_state[:2] != (db_path, alias_version):
+            cursor.execute('SELECT a.alias, s.nombre FROM skill_aliases a JOIN skills s ON s.id = a.skill_id')
+            matcher.set_aliases(dict(cursor.fetchall()))
+            last_id = 0
+        else:
+            last_id = _matcher_state[2]
+        cursor.execute('SELECT nombre FROM skills WHERE id > ? AND id <= ?', (last_id, max_id))
+        matcher.build(name for name, in cursor.fetchall())
+        _matcher_state = (db_path, alias_version, max_id)
+    return matcher
+
+def sync_skills(cursor, table, rows):
+    """Sincroniza la tabla de unión de `table` ('usuarios' u 'ofertas') con el texto de habilidades.
+    
+    `rows` son pares `(id, habilidades)`. Se ejecuta con el cursor de la escritura
+    que cambió el texto, dentro de su misma transacción, para que el catálogo
+    nunca quede desfasado de `usuarios.habilidades` u `ofertas.habilidades_requeridas`.
+    """
+    link_table, entity_column, _ = CATALOG_TABLES[table]
+    parsed = [(entity_id, list(dict.fromkeys(parse_skills(text)))) for entity_id, text in rows]
+    if not parsed:
+        return 0
+    
+    ids = skill_ids(cursor, [token for _, tokens in parsed for token in tokens])
+    cursor.executemany(f'DELETE FROM {link_table} WHERE {entity_column} = ?',
+                       [(entity_id,) for entity_id, _ in parsed])
+    links = [(entity_id, ids[token]) for entity_id, tokens in parsed for token in tokens]
+    cursor.executemany(f'INSERT INTO {link_table} ({entity_column}, skill_id) VALUES (?, ?)', links)
+    return len(links)
+
+def rebuild_skill_catalog(cursor):
+    """Reconstruye `user_skills` y `offer_skills` a partir del texto; retorna los enlaces por tabla"""
+    result = {}
+    for table, (link_table, entity_column, skills_column) in CATALOG_TABLES.items():
+        cursor.execute(f'DELETE FROM {link_table}')
+        cursor.execute(f"SELECT id, {skills_column} FROM {table} WHERE {skills_column} IS NOT NULL AND {skills_column} != ''")
+        parsed = [(entity_id, list(dict.fromkeys(parse_skills(text)))) for entity_id, text in cursor.fetchall()]
+        ids = skill_ids(cursor, [token for _, tokens in parsed for token in tokens])
+        links = [(entity_id, ids[token]) for entity_id, tokens in parsed for token in tokens]
+        cursor.executemany(f'INSERT INTO {link_table} ({entity_column}, skill_id) VALUES (?, ?)', links)
+        result[link_table] = len(links)
+    return result
@@ -0,0 +1,207 @@
+# backend/skill_index.py
+import heapq
+import threading
+from backend.skills import parse_skills, SkillRegistry
+from backend.skill_catalog import sync_matcher
+from backend.skill_matcher import SkillMatcher
+
+class SkillIndex:
+    """Índice invertido habilidad -> entidades (ofertas o estudiantes).
+    
+    Guarda, por cada habilidad normalizada, las entidades que la tienen (con su
+    multiplicidad) y, por entidad, cuántas habilidades tiene en total. Una
+    consulta solo visita las entidades que comparten al menos una habilidad y,
+    para ofertas, produce el mismo puntaje que
+    `CompatibilityCalculator.calculate_compatibility`, incluidos sinónimos y
+    nombres similares (`SkillMatcher`).
+    
+    Los índices viven en memoria del proceso, uno por base de datos. Cada uso
+    compara la versión con la que se construyeron contra la tabla
+    `data_versions`, que los triggers suben en cada escritura (también de
+    otros procesos), y se reconstruyen si la base cambió. `DatabaseManager`
+    aplica sus propias escrituras sin reconstruir (`notify_changed`).
+    """
+    
+    OFFERS = 'ofertas'
+    STUDENTS = 'estudiantes'
+    
+    _indexes = {}
+    _indexes_lock = threading.Lock()
+    
+    def __init__(self):
+        self._postings = {}        # habilidad -> {entidad_id: veces}
+        self._skill_counts = {}    # entidad_id -> total de habilidades
+        self._entity_masks = {}    # entidad_id -> máscara de habilidades (SkillRegistry)
+        self._registry = SkillRegistry.default()
+        self._matcher = SkillMatcher.default()
+        self._lock = threading.RLock()
+        self.version = None        # valor de `data_versions` con el que se construyó
+    
+    @classmethod
+    def load(cls, cursor, kind=OFFERS):
+        """Construye un índice nuevo leyendo la base con un cursor abierto"""
+        index = cls()
+        if kind == cls.OFFERS:
+            cursor.execute('SELECT id, habilidades_requeridas FROM ofertas WHERE activa = 1')
+        else:
+            cursor.execute("SELECT id, habilidades FROM usuarios WHERE tipo = 'estudiante'")
+        index.build(cursor.fetchall())
+        return index
+    
+    @staticmethod
+    def _data_version(cursor, kind):
+        cursor.execute('SELECT value FROM data_versions WHERE name = ?', (kind,))
+        return cursor.fetchone()[0]
+    
+    @classmethod
+    def for_database(cls, db, kind=OFFERS):
+        """Retorna el índice del proceso para la base de datos, reconstruyéndolo si la base cambió"""
+        key = (db.db_path, kind)
+        with db.get_connection() as conn:
+            cursor = conn.cursor()
+            # Los puntajes dependen de los sinónimos del catálogo, no solo de las filas indexadas
+            sync_matcher(cursor, db.db_path)
+            version = cls._data_version(cursor, kind)
+            index = cls._indexes.get(key)
+            if index is not None and index.version >= version:
+                return index
+            
+            with cls._indexes_lock:
+                index = cls._indexes.get(key)
+                if index is None or index.version < version:
+                    # La versión se lee antes que las filas: una escritura intermedia solo
+                    # provoca otra reconstrucción en el siguiente uso
+                    index = cls.load(cursor, kind)
+                    index.version = version
+                    cls._indexes[key] = index
+                return index
+    
+    @classmethod
+    def notify_changed(cls, db, kind, entity_id, skills, activa=True):
+        """Aplica una escritura del proceso al índice de una base de datos si ya fue construido.
+        
+        Si desde la construcción hubo otras escrituras además de esta, el índice
+        se descarta y se reconstruye en su siguiente uso.
+        """
+        key = (db.db_path, kind)
+        with cls._indexes_lock:
+            index = cls._indexes.get(key)
+            if index is None:
+                return
+            with db.get_connection() as conn:
+                version = cls._data_version(conn.cursor(), kind)
+            if version == index.version + 1:
+                index.update(entity_id, skills, activa)
+                index.version = version
+            elif version != index.version:
+                del cls._indexes[key]
+    
+    @classmethod
+    def reset(cls, db_path=None):
+        """Descarta los índices construidos (todos o los de una base de datos)"""
+        with cls._indexes_lock:
+            if db_path is None:
+                cls._indexes.clear()
+            else:
+                for key in [key for key in cls._indexes if key[0] == db_path]:
+                    del cls._indexes[key]
+    
+    def build(self, entities):
+        """Construye el índice a partir de pares (id, habilidades)"""
+        with self._lock:
+            self._postings.clear()
+            self._skill_counts.clear()
+            self._entity_masks.clear()
+            for entity_id, skills in entities:
+                self.add(entity_id, skills)
+    
+    def add(self, entity_id, skills):
+        """Agrega una entidad al índice"""
+        tokens = parse_skills(skills)
+        if not tokens:
+            return
+        with self._lock:
+            if entity_id in self._skill_counts:
+                self.remove(entity_id)
+            # El matcher precalcula los vecinos de cada habilidad nueva del vocabulario
+            self._matcher.build(tokens)
+            for token in tokens:
+                postings = self._postings.setdefault(token, {})
+                postings[entity_id] = postings.get(entity_id, 0) + 1
+            self._skill_counts[entity_id] = len(tokens)
+            self._entity_masks[entity_id] = self._registry.mask(tokens)
+    
+    def remove(self, entity_id):
+        """Quita una entidad del índice"""
+        with self._lock:
+            for token in self._registry.names(self._entity_masks.pop(entity_id, 0)):
+                postings = self._postings.get(token)
+                if postings is None:
+                    continue
+                postings.pop(entity_id, None)
+                if not postings:
+                    del self._postings[token]
+            self._skill_counts.pop(entity_id, None)
+    
+    def update(self, entity_id, skills, activa=True):
+        """Refleja la edición o (des)activación de una entidad"""
+        with self._lock:
+            self.remove(entity_id)
+            if activa:
+                self.add(entity_id, skills)
+    
+    def skills_of(self, entity_id):
+        """Retorna las habilidades indexadas de una entidad"""
+        with self._lock:
+            return self._registry.names(self._entity_masks.get(entity_id, 0))
+    
+    def _matching_skills(self, query_tokens):
+        """Habilidades indexadas que coinciden (igual, sinónimo o similar) con las consultadas"""
+        matched = set()
+        for query_token in query_tokens:
+            matched.update(token for token in self._matcher.related(query_token) if token in self._postings)
+        return matched
+    
+    def candidates(self, skills):
+        """Retorna los ids de las entidades con al menos una habilidad en común"""
+        query_tokens = parse_skills(skills)
+        if not query_tokens:
+            return set()
+        
+        with self._lock:
+            found = set()
+            for token in self._matching_skills(query_tokens):
+                found.update(self._postings[token])
+            return found
+    
+    def scores(self, student_skills):
+        """Retorna {oferta_id: compatibilidad} solo para ofertas con alguna habilidad en común"""
+        student_tokens = parse_skills(student_skills)
+        if not student_tokens:
+            return {}
+        
+        with self._lock:
+            matched_counts = {}
+            for token in self._matching_skills(student_tokens):
+                for offer_id, times in self._postings[token].items():
+                    matched_counts[offer_id] = matched_counts.get(offer_id, 0) + times
+            
+            return {
+                offer_id: min(matches / self._skill_counts[offer_id] * 100, 100.0)
+                for offer_id, matches in matched_counts.items()
+            }
+    
+    def top_k(self, student_skills, k=5):
+        """Retorna las k ofertas más compatibles como lista de (oferta_id, compatibilidad)"""
+        scores = self.scores(student_skills)
+        # En empate gana la oferta más antigua (menor id), como el orden original
+        best = heapq.nlargest(k, scores.items(), key=lambda item: (item[1], -item[0]))
+        return best
+    
+    def __contains__(self, entity_id):
+        with self._lock:
+            return entity_id in self._skill_counts
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._skill_counts)
@@ -0,0 +1,264 @@
+# backend/skill_matcher.py
+import re
+import threading
+import unicodedata
+from typing import Dict, FrozenSet, Iterable, List, Optional
+from backend.skills import normalize_skill
+
+def _trigrams(text: str) -> FrozenSet[str]:
+    """Trigramas de caracteres por palabra, con relleno al inicio y al final (como pg_trgm)"""
+    grams = set()
+    for word in re.findall(r'\w+', text):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Coeficiente de Dice entre los trigramas de dos textos (0 a 1)"""
+    grams_a, grams_b = _trigrams(a), _trigrams(b)
+    if not grams_a or not grams_b:
+        return 1.0 if a == b else 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+class SkillMatcher:
+    """Decide cuándo una habilidad del estudiante cubre una habilidad requerida.
+    
+    El nombre canónico de una habilidad va en minúsculas, sin acentos y con el
+    sinónimo resuelto ("ML" -> "machine learning"). Dos habilidades coinciden si
+    su nombre canónico es el mismo o si tienen las mismas palabras salvo
+    variantes de escritura: cada par de palabras distintas debe tener una
+    similitud de trigramas de al menos `Config.SKILL_SIMILARITY_THRESHOLD`
+    ("machine learnig", "dockers", "node js"). Las palabras con dígitos o más
+    cortas que `Config.SKILL_FUZZY_MIN_LENGTH`, y los nombres cortos ("r", "c++",
+    "go"), solo coinciden por igualdad o sinónimo: "r" ya no coincide con todo
+    lo que contiene una "r".
+    
+    Los vecinos de cada habilidad se calculan una vez, al registrarla con
+    `build` (el catálogo y las habilidades de ofertas y estudiantes guardados),
+    con índices invertidos de palabras y de trigramas; una consulta es una
+    intersección de conjuntos. Una habilidad que no está registrada (el texto
+    libre de una búsqueda o un filtro) se compara contra el vocabulario sin
+    agregarse, así que las consultas no lo hacen crecer. Cambiar los sinónimos
+    recalcula todo el vocabulario.
+    """
+    
+    _default = None
+    _default_lock = threading.Lock()
+    
+    def __init__(self, aliases: Optional[Dict[str, str]] = None, threshold: Optional[float] = None,
+                 min_length: Optional[int] = None):
+        from config.settings import Config
+        self.threshold = Config.SKILL_SIMILARITY_THRESHOLD if threshold is None else threshold
+        self.min_length = Config.SKILL_FUZZY_MIN_LENGTH if min_length is None else min_length
+        self._lock = threading.RLock()
+        self._aliases = {}
+        self._reset()
+        self.set_aliases(Config.SKILL_ALIASES if aliases is None else aliases)
+    
+    @classmethod
+    def default(cls) -> 'SkillMatcher':
+        """Retorna el matcher compartido por el proceso"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+    
+    def _reset(self):
+        self._neighbors = {}       # habilidad -> frozenset de habilidades que coinciden (incluida ella)
+        self._groups = {}          # nombre canónico -> habilidades con ese nombre
+        self._similar = {}         # nombre canónico -> nombres canónicos similares (incluido él)
+        self._positions = {}       # (palabras, posición, palabra) -> nombres canónicos
+        self._similar_words = {}   # palabra -> palabras similares (incluida ella)
+        self._word_grams = {}      # palabra -> trigramas
+        self._gram_index = {}      # trigrama -> palabras que lo contienen
+    
+    def set_aliases(self, aliases: Dict[str, str]):
+        """Reemplaza los sinónimos (alias -> nombre canónico) y recalcula el vocabulario conocido"""
+        aliases = {self._clean(alias): self._clean(name) for alias, name in aliases.items()}
+        with self._lock:
+            if aliases == self._aliases:
+                return
+            vocabulary = list(self._neighbors)
+            self._aliases = aliases
+            self._reset()
+            for token in vocabulary:
+                self._add(token)
+    
+    def aliases(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._aliases)
+    
+    @staticmethod
+    def _clean(skill: str) -> str:
+        decomposed = unicodedata.normalize('NFKD', normalize_skill(skill))
+        return ' '.join(''.join(char for char in decomposed if not unicodedata.combining(char)).split())
+    
+    def canonical(self, skill: str) -> str:
+        """Nombre canónico de una habilidad (sinónimo resuelto)"""
+        token = self._clean(skill)
+        return self._aliases.get(token, token)
+    
+    def build(self, skills: Iterable[str]):
+        """Precalcula los vecinos de un vocabulario"""
+        with self._lock:
+            for token in skills:
+                self._add(token)
+    
+    def related(self, skill: str) -> FrozenSet[str]:
+        """Habilidades conocidas que coinciden con `skill` (incluida ella); no registra `skill`"""
+        neighbors = self._neighbors.get(skill)
+        if neighbors is None:
+            with self._lock:
+                neighbors = self._neighbors.get(skill)
+                if neighbors is None:
+                    neighbors = self._lookup(skill)
+        return neighbors
+    
+    def matches(self, skill: str, other: str) -> bool:
+        if other in self.related(skill) or skill in self.related(other):
+            return True
+        if skill in self._neighbors or other in self._neighbors:
+            return False
+        # Ninguna de las dos está registrada: se comparan directamente
+        return self._names_match(skill, other)
+    
+    def count_matches(self, student_skills: Iterable[str], required_skills: List[str]) -> int:
+        """Cuántas habilidades requeridas (con repeticiones) cubre el estudiante"""
+        return len(required_skills) - len(self.missing(student_skills, required_skills))
+    
+    def missing(self, student_skills: Iterable[str], required_skills: List[str]) -> List[str]:
+        """Habilidades requeridas que el estudiante no cubre"""
+        neighbors = self._neighbors
+        student = set(student_skills)
+        # Las habilidades del estudiante fuera del vocabulario se comparan sin registrarlas
+        unknown = {token: self.related(token) for token in student if token not in neighbors}
+        
+        missing = []
+        for token in required_skills:
+            related = neighbors.get(token)
+            if related is None:
+                related = self.related(token)
+            if related.isdisjoint(student) and not self._covered_by_unknown(token, unknown):
+                missing.append(token)
+        return missing
+    
+    def _covered_by_unknown(self, token: str, unknown: Dict[str, FrozenSet[str]]) -> bool:
+        for other, others in unknown.items():
+            if token in others or (token not in self._neighbors and self._names_match(token, other)):
+                return True
+        return False
+    
+    def _names_match(self, skill: str, other: str) -> bool:
+        """Comparación directa de dos habilidades, con las mismas reglas que el vocabulario"""
+        canonical, other_canonical = self.canonical(skill), self.canonical(other)
+        if canonical == other_canonical:
+            return True
+        words, other_words = self._fuzzy_words(canonical), self._fuzzy_words(other_canonical)
+        if not words or len(words) != len(other_words):
+            return False
+        return all(
+            word == other_word or (
+                self._fuzzy_word(word) and self._fuzzy_word(other_word)
+                and trigram_similarity(word, other_word) >= self.threshold
+            )
+            for word, other_word in zip(words, other_words)
+        )
+    
+    def _fuzzy_words(self, canonical: str) -> tuple:
+        """Palabras de un nombre canónico si admite coincidencia aproximada; () si no"""
+        words = tuple(re.findall(r'\w+', canonical))
+        if words and len(canonical.replace(' ', '')) >= self.min_length:
+            return words
+        return ()
+    
+    def _fuzzy_word(self, word: str) -> bool:
+        return len(word) >= self.min_length and not any(char.isdigit() for char in word)
+    
+    def _lookup(self, token: str) -> FrozenSet[str]:
+        """Vecinos de una habilidad no registrada, sin agregarla (llamar con el candado)"""
+        canonical = self.canonical(token)
+        similar = self._similar.get(canonical)
+        if similar is None:
+            similar = self._similar_names(canonical, register=False)
+        return frozenset((token,)).union(*(self._groups[name] for name in similar if name in self._groups))
+    
+    def _add(self, token: str):
+        """Registra una habilidad y la enlaza con las que coinciden (llamar con el candado)"""
+        if token in self._neighbors:
+            return
+        canonical = self.canonical(token)
+        if canonical not in self._similar:
+            self._add_canonical(canonical)
+        self._groups[canonical].add(token)
+        
+        neighbors = frozenset().union(*(self._groups[name] for name in self._similar[canonical]))
+        # Copia al escribir: quien ya leyó un conjunto de vecinos puede recorrerlo sin candado
+        for other in neighbors:
+            if other != token:
+                self._neighbors[other] = self._neighbors[other] | {token}
+        self._neighbors[token] = neighbors
+    
+    def _add_canonical(self, canonical: str):
+        similar = self._similar_names(canonical)
+        for other in similar:
+            if other != canonical:
+                self._similar[other].add(canonical)
+        words = self._fuzzy_words(canonical)
+        for position, word in enumerate(words):
+            self._positions.setdefault((len(words), position, word), set()).add(canonical)
+        self._similar[canonical] = similar
+        self._groups[canonical] = set()
+    
+    def _similar_names(self, canonical: str, register: bool = True) -> set:
+        """Nombres canónicos conocidos similares a `canonical` (incluido él)"""
+        words = self._fuzzy_words(canonical)
+        if not words:
+            return {canonical}
+        # Candidatos: nombres con el mismo número de palabras y, en cada posición, una palabra similar.
+        # Se parte de la posición más selectiva y el resto se comprueba palabra por palabra.
+        count = len(words)
+        word_neighbors = [self._word_neighbors(word, register) for word in words]
+        buckets = [
+            [self._positions[key] for key in ((count, position, other) for other in other_words)
+             if key in self._positions]
+            for position, other_words in enumerate(word_neighbors)
+        ]
+        start = min(range(count), key=lambda position: sum(map(len, buckets[position])))
+        similar = {
+            other
+            for bucket in buckets[start] for other in bucket
+            if all(other_word in word_neighbors[position]
+                   for position, other_word in enumerate(re.findall(r'\w+', other)))
+        }
+        similar.add(canonical)
+        return similar
+    
+    def _word_neighbors(self, word: str, register: bool = True) -> set:
+        """Palabras conocidas similares a `word`; con `register` la agrega a los índices si es nueva"""
+        neighbors = self._similar_words.get(word)
+        if neighbors is not None:
+            return neighbors
+        
+        neighbors = {word}
+        if self._fuzzy_word(word):
+            grams = _trigrams(word)
+            shared = {}
+            for gram in grams:
+                for other in self._gram_index.get(gram, ()):
+                    shared[other] = shared.get(other, 0) + 1
+            for other, common in shared.items():
+                if 2 * common / (len(grams) + len(self._word_grams[other])) >= self.threshold:
+                    neighbors.add(other)
+                    if register:
+                        self._similar_words[other].add(word)
+            if register:
+                self._word_grams[word] = grams
+                for gram in grams:
+                    self._gram_index.setdefault(gram, set()).add(word)
+        if register:
+            self._similar_words[word] = neighbors
+        return neighbors
+    
+    def __len__(self):
+        return len(self._neighbors)
@@ -0,0 +1,83 @@
+# backend/skills.py
+import threading
+from typing import Iterable, Iterator, List, Optional, Union
+
+def normalize_skill(skill: str) -> str:
+    """Normaliza una habilidad (minúsculas, sin espacios extra)"""
+    return skill.lower().strip()
+
+def parse_skills(skills: Union[str, Iterable[str], None]) -> List[str]:
+    """Convierte un texto separado por comas (o una lista) en habilidades normalizadas"""
+    if not skills:
+        return []
+    if isinstance(skills, str):
+        skills = skills.split(',')
+    return [token for token in (normalize_skill(skill) for skill in skills) if token]
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Recorre las posiciones de los bits encendidos de una máscara"""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+class SkillRegistry:
+    """Registro de habilidades internadas.
+    
+    Cada habilidad normalizada recibe un entero pequeño y estable durante la vida
+    del proceso, de modo que el conjunto de habilidades de un usuario u oferta se
+    representa como una máscara de bits (un `int`) y la coincidencia entre dos
+    conjuntos es un AND seguido de un conteo de bits.
+    """
+    
+    _default = None
+    _default_lock = threading.Lock()
+    
+    def __init__(self):
+        self._ids = {}
+        self._names = []
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def default(cls) -> 'SkillRegistry':
+        """Retorna el registro compartido por el proceso"""
+        if cls._default is None:
+            with cls._default_lock:
+                if cls._default is None:
+                    cls._default = cls()
+        return cls._default
+    
+    def intern(self, skill: str) -> int:
+        """Retorna el id de una habilidad, asignándole uno nuevo si no existe"""
+        token = normalize_skill(skill)
+        skill_id = self._ids.get(token)
+        if skill_id is None:
+            with self._lock:
+                skill_id = self._ids.get(token)
+                if skill_id is None:
+                    skill_id = len(self._names)
+                    self._names.append(token)
+                    self._ids[token] = skill_id
+        return skill_id
+    
+    def lookup(self, skill: str) -> Optional[int]:
+        """Retorna el id de una habilidad ya registrada (None si no existe)"""
+        return self._ids.get(normalize_skill(skill))
+    
+    def name(self, skill_id: int) -> str:
+        """Retorna la habilidad normalizada de un id"""
+        return self._names[skill_id]
+    
+    def mask(self, skills: Union[str, Iterable[str], None]) -> int:
+        """Codifica habilidades como máscara de bits (internando las nuevas)"""
+        mask = 0
+        for token in parse_skills(skills):
+            mask |= 1 << self.intern(token)
+        return mask
+    
+    def names(self, mask: int) -> List[str]:
+        """Decodifica una máscara en la lista de habilidades normalizadas"""
+        return [self._names[skill_id] for skill_id in iter_bits(mask)]
+    
+    def __len__(self):
+        return len(self._names)
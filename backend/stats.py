@@ -0,0 +1,183 @@
+# backend/stats.py
+from backend.database import DatabaseManager
+from backend.models import UserStats, OfferStats
+
+# Contador -> consulta que lo recalcula desde cero
+COUNTER_QUERIES = {
+    'ofertas_activas': "SELECT COUNT(*) FROM ofertas WHERE activa = 1",
+    'estudiantes': "SELECT COUNT(*) FROM usuarios WHERE tipo = 'estudiante'",
+    'empresas': "SELECT COUNT(*) FROM usuarios WHERE tipo = 'empresa'",
+    'matches_aceptados': "SELECT COUNT(*) FROM matches WHERE estado = 'aceptado'"
+}
+
+# Contadores del match rate: sus tablas de resumen existen desde la migración 6
+MATCH_RATE_COUNTER_QUERIES = {
+    'estudiantes_con_match': "SELECT COUNT(*) FROM match_summary_estudiantes",
+    'ofertas_con_candidato': '''
+        SELECT COUNT(*) FROM match_summary_ofertas s
+        JOIN ofertas o ON o.id = s.oferta_id
+        WHERE o.activa = 1
+    '''
+}
+
+def rebuild_match_summaries(cursor):
+    """Recalcula los resúmenes de matches que superan el umbral del match rate"""
+    cursor.execute("SELECT value FROM metric_settings WHERE name = 'match_threshold'")
+    threshold = cursor.fetchone()[0]
+    
+    cursor.execute('DELETE FROM match_summary_estudiantes')
+    cursor.execute('''
+        INSERT INTO match_summary_estudiantes (estudiante_id, qualifying)
+        SELECT estudiante_id, COUNT(*) FROM matches
+        WHERE compatibilidad >= ?
+        GROUP BY estudiante_id
+    ''', (threshold,))
+    
+    cursor.execute('DELETE FROM match_summary_ofertas')
+    cursor.execute('''
+        INSERT INTO match_summary_ofertas (oferta_id, qualifying)
+        SELECT oferta_id, COUNT(*) FROM matches
+        WHERE compatibilidad >= ?
+        GROUP BY oferta_id
+    ''', (threshold,))
+
+def rebuild_counters(cursor):
+    """Recalcula la tabla `counters` y retorna {contador: (anterior, nuevo)}.
+    
+    La migración 5 la ejecuta antes de que existan las tablas del match rate; en
+    ese caso solo recalcula los contadores base.
+    """
+    queries = dict(COUNTER_QUERIES)
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'match_summary_estudiantes'")
+    if cursor.fetchone() is not None:
+        rebuild_match_summaries(cursor)
+        queries.update(MATCH_RATE_COUNTER_QUERIES)
+    
+    cursor.execute('SELECT name, value FROM counters')
+    previous = dict(cursor.fetchall())
+    
+    changes = {}
+    for name, query in queries.items():
+        cursor.execute(query)
+        value = cursor.fetchone()[0]
+        cursor.execute(
+            'INSERT INTO counters (name, value) VALUES (?, ?) '
+            'ON CONFLICT (name) DO UPDATE SET value = excluded.value',
+            (name, value)
+        )
+        changes[name] = (previous.get(name), value)
+    return changes
+
+class StatsService:
+    """Estadísticas de usuarios y ofertas calculadas con agregaciones en SQLite.
+    
+    Cada método ejecuta consultas `GROUP BY` que regresan unas cuantas filas de
+    conteos, en lugar de traer las tablas completas a Python para contarlas.
+    """
+    
+    def __init__(self, db=None):
+        self.db = db or DatabaseManager()
+    
+    def get_user_stats(self):
+        """Retorna un `UserStats` con los conteos por tipo, carrera y semestre"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT tipo, COUNT(*) FROM usuarios GROUP BY tipo')
+            by_type = dict(cursor.fetchall())
+            
+            cursor.execute('''
+                SELECT COALESCE(NULLIF(carrera, ''), 'No especificada'), COUNT(*)
+                FROM usuarios
+                WHERE tipo = 'estudiante'
+                GROUP BY 1
+            ''')
+            by_career = dict(cursor.fetchall())
+            
+            cursor.execute('''
+                SELECT COALESCE(semestre, 0), COUNT(*)
+                FROM usuarios
+                WHERE tipo = 'estudiante'
+                GROUP BY 1
+            ''')
+            by_semester = dict(cursor.fetchall())
+        
+        return UserStats(
+            total_users=sum(by_type.values()),
+            estudiantes=by_type.get('estudiante', 0),
+            empresas=by_type.get('empresa', 0),
+            users_by_career=by_career,
+            users_by_semester=by_semester
+        )
+    
+    def get_offer_stats(self, empresa_id=None, solo_activas=True):
+        """Retorna un `OfferStats` con los conteos por tipo y ubicación"""
+        conditions = []
+        params = []
+        if solo_activas:
+            conditions.append('activa = 1')
+        if empresa_id is not None:
+            conditions.append('empresa_id = ?')
+            params.append(empresa_id)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute(f'SELECT tipo, COUNT(*) FROM ofertas {where} GROUP BY tipo', params)
+            by_type = dict(cursor.fetchall())
+            
+            cursor.execute(f'SELECT ubicacion, COUNT(*) FROM ofertas {where} GROUP BY ubicacion', params)
+            by_location = dict(cursor.fetchall())
+        
+        return OfferStats(
+            total_offers=sum(by_type.values()),
+            offers_by_type=by_type,
+            offers_by_location=by_location
+        )
+    
+    def get_dashboard_counts(self):
+        """Retorna los conteos de las tarjetas del dashboard desde la tabla `counters`"""
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT name, value FROM counters')
+            counters = dict(cursor.fetchall())
+        
+        return {name: counters.get(name, 0) for name in (*COUNTER_QUERIES, *MATCH_RATE_COUNTER_QUERIES)}
+    
+    def rebuild_counters(self):
+        """Reconcilia la tabla `counters` con los datos reales"""
+        with self.db.get_connection() as conn:
+            changes = rebuild_counters(conn.cursor())
+            conn.commit()
+        return changes
+    
+    def get_match_rate(self):
+        """Retorna el match rate de estudiantes y de ofertas activas (en %) desde `counters`"""
+        counts = self.get_dashboard_counts()
+        estudiantes = counts['estudiantes']
+        ofertas = counts['ofertas_activas']
+        return {
+            'estudiantes': counts['estudiantes_con_match'] / estudiantes * 100 if estudiantes else 0.0,
+            'ofertas': counts['ofertas_con_candidato'] / ofertas * 100 if ofertas else 0.0
+        }
+    
+    def sync_match_threshold(self, threshold=None):
+        """Aplica el umbral configurado; si cambió, recalcula los resúmenes una sola vez"""
+        from config.settings import Config
+        threshold = Config.MATCH_RATE_THRESHOLD if threshold is None else threshold
+        
+        with self.db.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT value FROM metric_settings WHERE name = 'match_threshold'")
+            row = cursor.fetchone()
+            if row is not None and row[0] == threshold:
+                return False
+            
+            cursor.execute(
+                "INSERT OR REPLACE INTO metric_settings (name, value) VALUES ('match_threshold', ?)",
+                (threshold,)
+            )
+            rebuild_counters(cursor)
+            conn.commit()
+        return True
@@ -0,0 +1,5 @@
+# benchmarks/__init__.py
+"""Generador de datos sintéticos y benchmarks de las rutas críticas.
+
+Uso: python -m benchmarks.run --scale 1k --output resultados.json
+"""
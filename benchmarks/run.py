@@ -0,0 +1,281 @@
+# benchmarks/run.py - Benchmarks de las rutas críticas de base de datos y matching
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from backend.async_database import AsyncDatabaseManager
+from backend.database import DatabaseManager
+from backend.models import CompatibilityCalculator
+from backend.pool import ConnectionPool
+from backend.query_metrics import QueryMetrics
+from backend.skill_index import SkillIndex
+from backend.skills import parse_skills
+from backend.stats import StatsService
+from benchmarks.synthetic import generate_dataset
+from config.settings import Config
+
+# Escala -> parámetros del generador (~filas por tabla principal)
+SCALES = {
+    '1k': dict(students=900, companies=100, offers=1000, sessions=1000, vocabulary_size=200),
+    '100k': dict(students=90000, companies=10000, offers=100000, sessions=100000, vocabulary_size=2000),
+    '1m': dict(students=900000, companies=100000, offers=1000000, sessions=1000000, vocabulary_size=20000)
+}
+
+def measure(func, repeat, number=1, setup=None):
+    """Ejecuta `func` `number` veces por muestra y retorna los segundos por llamada de cada muestra"""
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+def summarize(samples, number):
+    """Resume las muestras en milisegundos por llamada"""
+    ordered = sorted(samples)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        'repeat': len(samples),
+        'number': number,
+        'min_ms': ordered[0] * 1000,
+        'median_ms': statistics.median(ordered) * 1000,
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'p95_ms': p95 * 1000
+    }
+
+def _cycle(items):
+    """Retorna una función que entrega los elementos en orden circular"""
+    state = {'position': 0}
+    
+    def next_item():
+        item = items[state['position'] % len(items)]
+        state['position'] += 1
+        return item
+    return next_item
+
+def _sample_column(db, table, column, ids):
+    placeholders = ', '.join('?' for _ in ids)
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT {column} FROM {table} WHERE id IN ({placeholders}) ORDER BY id', ids)
+        return [row[0] for row in cursor.fetchall()]
+
+def _sample_cursors(db, table, condition, rng, count=100):
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f'SELECT created_at, id FROM {table} WHERE {condition}')
+        rows = cursor.fetchall()
+    return [None] + rng.sample(rows, min(len(rows), count))
+
+def build_benchmarks(db, dataset, rng):
+    """Retorna [(nombre, función, número, setup)] para el conjunto generado"""
+    stats = StatsService(db)
+    next_email = _cycle(rng.sample(dataset.student_emails, min(len(dataset.student_emails), 1000)))
+    next_token = _cycle(rng.sample(dataset.session_tokens, min(len(dataset.session_tokens), 1000)))
+    next_company = _cycle(rng.sample(dataset.company_ids, min(len(dataset.company_ids), 1000)))
+    
+    student_skills = _sample_column(
+        db, 'usuarios', 'habilidades', rng.sample(dataset.student_ids, min(len(dataset.student_ids), 1000))
+    )
+    offer_skills = _sample_column(
+        db, 'ofertas', 'habilidades_requeridas', rng.sample(dataset.offer_ids, min(len(dataset.offer_ids), 1000))
+    )
+    
+    pairs = [(parse_skills(rng.choice(student_skills)), parse_skills(rng.choice(offer_skills)))
+             for _ in range(1000)]
+    next_pair = _cycle(pairs)
+    next_student_skills = _cycle(student_skills)
+    
+    # Cursores repartidos por toda la tabla: una página profunda debe costar lo mismo que la primera
+    next_offer_cursor = _cycle(_sample_cursors(db, 'ofertas', 'activa = 1', rng))
+    next_user_cursor = _cycle(_sample_cursors(db, 'usuarios', '1 = 1', rng))
+    
+    def invalidate_offers():
+        db.bump_versions('ofertas')
+    
+    def invalidate_users():
+        db.bump_versions('usuarios')
+    
+    def invalidate_all():
+        db.bump_versions('usuarios', 'ofertas')
+    
+    # Tres lecturas independientes de un mismo dashboard: en secuencia y con la capa asíncrona
+    adb = AsyncDatabaseManager(db.db_path)
+    loop = asyncio.new_event_loop()
+    
+    def dashboard_sequential():
+        db.get_offers_page(next_offer_cursor())
+        db.get_users_page(next_user_cursor())
+        stats.get_offer_stats(empresa_id=next_company(), solo_activas=False)
+    
+    def dashboard_gather():
+        loop.run_until_complete(adb.gather(
+            offers=adb.get_offers_page(next_offer_cursor()),
+            users=adb.get_users_page(next_user_cursor()),
+            stats=adb.stats.get_offer_stats(empresa_id=next_company(), solo_activas=False)
+        ))
+    
+    benchmarks = [
+        ('authenticate_user', lambda: db.authenticate_user(next_email(), dataset.password), 100, None),
+        ('verify_session', lambda: db.verify_session(next_token()), 200, None),
+        ('get_all_offers[cold]', db.get_all_offers, 1, invalidate_offers),
+        ('get_all_offers[cached]', db.get_all_offers, 10, None),
+        ('get_offers_by_company[cold]', lambda: db.get_offers_by_company(next_company()), 1, invalidate_offers),
+        ('get_offers_by_company[cached]', lambda: db.get_offers_by_company(dataset.company_ids[0]), 100, None),
+        ('get_all_users[cold]', db.get_all_users, 1, invalidate_users),
+        ('get_offers_page[cold]', lambda: db.get_offers_page(next_offer_cursor()), 20, invalidate_offers),
+        ('get_offers_by_company_page[cold]',
+         lambda: db.get_offers_by_company_page(next_company()), 20, invalidate_offers),
+        ('get_users_page[cold]', lambda: db.get_users_page(next_user_cursor()), 20, invalidate_users),
+        ('dashboard_sequential[cold]', dashboard_sequential, 20, invalidate_all),
+        ('dashboard_gather[cold]', dashboard_gather, 20, invalidate_all),
+        ('get_user_stats', stats.get_user_stats, 1, None),
+        ('get_dashboard_counts', stats.get_dashboard_counts, 100, None),
+        ('calculate_compatibility',
+         lambda: CompatibilityCalculator.calculate_compatibility(*next_pair()), 1000, None),
+        ('skill_index_top_k',
+         lambda: SkillIndex.for_database(db).top_k(next_student_skills()), 100, None)
+    ]
+    
+    try:
+        import numpy  # noqa: F401
+        import scipy  # noqa: F401
+    except ImportError:
+        print("numpy/scipy no disponibles: se omite iter_compatibility_chunks")
+    else:
+        students_block = [parse_skills(skills) for skills in student_skills]
+        offers_block = [parse_skills(skills) for skills in offer_skills]
+        
+        def matrix():
+            for _ in CompatibilityCalculator.iter_compatibility_chunks(students_block, offers_block):
+                pass
+        benchmarks.append(('iter_compatibility_chunks[1000x1000]', matrix, 1, None))
+    
+    return benchmarks
+
+def git_commit():
+    """Retorna el commit actual (None fuera de un repositorio git)"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+def compare(results, baseline_path, tolerance):
+    """Imprime las regresiones de mediana contra un resultado previo y retorna cuántas hubo"""
+    with open(baseline_path, encoding='utf-8') as handle:
+        baseline = json.load(handle)['results']
+    
+    regressions = 0
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if not previous or not previous['median_ms']:
+            continue
+        ratio = result['median_ms'] / previous['median_ms']
+        flag = ''
+        if ratio > 1 + tolerance:
+            flag = '  <-- regresión'
+            regressions += 1
+        print(f"{name:40s} {previous['median_ms']:10.3f} -> {result['median_ms']:10.3f} ms  x{ratio:.2f}{flag}")
+    return regressions
+
+def run(args):
+    params = dict(SCALES[args.scale])
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix='bench-'), f'bench-{args.scale}.db')
+    if os.path.exists(db_path):
+        print(f"Error: {db_path} ya existe; el benchmark necesita una base nueva")
+        return 2
+    
+    if args.query_stats:
+        # Las conexiones del pool se crean instrumentadas solo si está activo antes de abrirlas
+        Config.QUERY_METRICS_ENABLED = True
+    db = DatabaseManager(db_path)
+    if not db.init_database():
+        return 2
+    
+    print(f"Generando datos ({args.scale}: {params}) en {db_path}")
+    start = time.perf_counter()
+    dataset = generate_dataset(db, seed=args.seed, with_matches=args.matches, **params)
+    setup_seconds = time.perf_counter() - start
+    print(f"Datos generados en {setup_seconds:.1f} s")
+    
+    rng = random.Random(args.seed)
+    results = {}
+    # Los tiempos por consulta solo cubren los benchmarks, no la generación de datos
+    QueryMetrics.default().reset()
+    for name, func, number, setup in build_benchmarks(db, dataset, rng):
+        if args.only and not any(pattern in name for pattern in args.only):
+            continue
+        func()  # calentamiento: índices en memoria, caché de sentencias
+        results[name] = summarize(measure(func, args.repeat, number, setup), number)
+        print(f"{name:40s} mediana {results[name]['median_ms']:10.3f} ms  p95 {results[name]['p95_ms']:10.3f} ms")
+    
+    report = {
+        'scale': args.scale,
+        'seed': args.seed,
+        'dataset': params,
+        'with_matches': args.matches,
+        'setup_seconds': setup_seconds,
+        'environment': {
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'commit': git_commit()
+        },
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'results': results
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2, ensure_ascii=False)
+        print(f"Resultados guardados en {args.output}")
+    if args.query_stats:
+        QueryMetrics.default().dump(args.query_stats)
+        print(f"Tiempos por consulta guardados en {args.query_stats} (ver `python manage.py query-stats`)")
+    
+    ConnectionPool.close_all_pools()
+    if not args.keep and not args.db:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_path + suffix):
+                os.remove(db_path + suffix)
+    
+    if args.compare:
+        print(f"\nComparación contra {args.compare}:")
+        if compare(results, args.compare, args.tolerance):
+            return 1
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmarks con datos sintéticos de las rutas críticas")
+    parser.add_argument('--scale', choices=SCALES, default='1k', help="Tamaño del conjunto de datos")
+    parser.add_argument('--seed', type=int, default=42, help="Semilla del generador")
+    parser.add_argument('--repeat', type=int, default=5, help="Muestras por benchmark")
+    parser.add_argument('--only', nargs='*', default=None, help="Solo los benchmarks cuyo nombre contenga estos textos")
+    parser.add_argument('--matches', action='store_true', help="Calcula también la tabla matches (lento a escala 1m)")
+    parser.add_argument('--db', default=None, help="Ruta de la base a crear (por defecto un directorio temporal)")
+    parser.add_argument('--keep', action='store_true', help="Conserva la base temporal al terminar")
+    parser.add_argument('--output', default=None, help="Archivo JSON con los resultados")
+    parser.add_argument('--query-stats', default=None, help="Archivo JSON con los tiempos por consulta (QueryMetrics)")
+    parser.add_argument('--compare', default=None, help="JSON previo contra el cual detectar regresiones")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Aumento relativo de la mediana tolerado (0.2 = 20%%)")
+    return parser
+
+def main(argv=None):
+    return run(build_parser().parse_args(argv))
+
+if __name__ == "__main__":
+    sys.exit(main())
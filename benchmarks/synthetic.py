@@ -0,0 +1,150 @@
+# benchmarks/synthetic.py - Generador reproducible de datos sintéticos
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from backend.skill_catalog import rebuild_skill_catalog
+from backend.skill_index import SkillIndex
+from backend.matching import MatchEngine
+
+BASE_SKILLS = [
+    'Python', 'Java', 'JavaScript', 'TypeScript', 'SQL', 'Django', 'Flask', 'React',
+    'Angular', 'Node.js', 'Docker', 'Kubernetes', 'AWS', 'Azure', 'Git', 'Linux',
+    'Machine Learning', 'Pandas', 'Excel', 'Power BI', 'Tableau', 'C++', 'C#', 'Go',
+    'Scrum', 'Figma', 'HTML', 'CSS', 'PostgreSQL', 'MongoDB'
+]
+CARRERAS = [
+    'Ingeniería en Sistemas', 'Ciencias de Datos', 'Ingeniería Industrial',
+    'Administración', 'Contaduría', 'Diseño Gráfico', 'Mercadotecnia', None
+]
+UBICACIONES = ['CDMX', 'Guadalajara', 'Monterrey', 'Puebla', 'Querétaro', 'Remoto']
+TIPOS_OFERTA = ['empleo', 'practica']
+
+BENCHMARK_PASSWORD = 'benchmark123'
+
+@dataclass
+class SyntheticDataset:
+    """Ids y credenciales de un conjunto generado, para armar las consultas del benchmark"""
+    student_ids: list
+    company_ids: list
+    offer_ids: list
+    student_emails: list
+    session_tokens: list
+    vocabulary: list
+    password: str = BENCHMARK_PASSWORD
+
+def build_vocabulary(size):
+    """Retorna `size` habilidades: las comunes primero (las más populares) y luego nombres generados"""
+    vocabulary = BASE_SKILLS[:size]
+    vocabulary += [f'Skill {index:05d}' for index in range(len(vocabulary), size)]
+    return vocabulary
+
+def _skill_sampler(vocabulary, rng):
+    """Muestrea habilidades con popularidad tipo Zipf (pocas muy demandadas, muchas raras)"""
+    weights = [1 / rank for rank in range(1, len(vocabulary) + 1)]
+    
+    def sample(low, high):
+        count = min(rng.randint(low, high), len(vocabulary))
+        chosen = {}  # dict y no set: el orden de inserción mantiene la salida reproducible
+        while len(chosen) < count:
+            chosen.update(dict.fromkeys(rng.choices(vocabulary, weights=weights, k=count - len(chosen))))
+        return ', '.join(chosen)
+    return sample
+
+def _next_id(cursor, table):
+    cursor.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {table}')
+    return cursor.fetchone()[0]
+
+def _insert_batches(cursor, sql, rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            cursor.executemany(sql, batch)
+            batch.clear()
+    if batch:
+        cursor.executemany(sql, batch)
+
+def generate_dataset(db, students=1000, companies=100, offers=500, vocabulary_size=200,
+                     sessions=1000, seed=42, with_matches=False, batch_size=10000):
+    """Inserta usuarios, ofertas y sesiones sintéticas de forma reproducible.
+    
+    Con la misma semilla y una base vacía se obtienen exactamente los mismos
+    datos. Todos los usuarios comparten `BENCHMARK_PASSWORD`, que se hashea una
+    sola vez. La tabla `matches` solo se calcula con `with_matches=True`: a
+    escala de millones es la parte más lenta de la generación.
+    """
+    rng = random.Random(seed)
+    vocabulary = build_vocabulary(vocabulary_size)
+    sample_skills = _skill_sampler(vocabulary, rng)
+    password_hash = db.hash_password(BENCHMARK_PASSWORD)
+    now = datetime.now()
+    
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        first_user = _next_id(cursor, 'usuarios')
+        first_offer = _next_id(cursor, 'ofertas')
+        first_session = _next_id(cursor, 'sesiones')
+        
+        company_ids = list(range(first_user, first_user + companies))
+        student_ids = list(range(first_user + companies, first_user + companies + students))
+        student_emails = [f'estudiante{user_id}@bench.unrc.edu.mx' for user_id in student_ids]
+        offer_ids = list(range(first_offer, first_offer + offers))
+        
+        user_sql = '''
+            INSERT INTO usuarios (id, email, password_hash, nombre, tipo, carrera, semestre, habilidades)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        '''
+        _insert_batches(cursor, user_sql, (
+            (user_id, f'empresa{user_id}@bench.unrc.edu.mx', password_hash,
+             f'Empresa {user_id}', 'empresa', None, None, None)
+            for user_id in company_ids
+        ), batch_size)
+        _insert_batches(cursor, user_sql, (
+            (user_id, email, password_hash, f'Estudiante {user_id}', 'estudiante',
+             rng.choice(CARRERAS), rng.randint(1, 10), sample_skills(2, 8))
+            for user_id, email in zip(student_ids, student_emails)
+        ), batch_size)
+        
+        if company_ids:
+            _insert_batches(cursor, '''
+                INSERT INTO ofertas (id, empresa_id, titulo, descripcion, tipo, habilidades_requeridas, ubicacion, activa)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                (offer_id, rng.choice(company_ids), f'Oferta {offer_id}', f'Descripción de la oferta {offer_id}',
+                 rng.choice(TIPOS_OFERTA), sample_skills(2, 6), rng.choice(UBICACIONES), int(rng.random() < 0.9))
+                for offer_id in offer_ids
+            ), batch_size)
+        
+        # Una de cada cinco sesiones ya expiró, para que el barrido tenga trabajo
+        session_tokens = []
+        session_rows = []
+        all_users = company_ids + student_ids
+        for session_id in range(first_session, first_session + (sessions if all_users else 0)):
+            token = f'{rng.getrandbits(192):048x}'
+            expired = rng.random() < 0.2
+            expires_at = now + (timedelta(hours=-1) if expired else timedelta(hours=24))
+            if not expired:
+                session_tokens.append(token)
+            session_rows.append((session_id, rng.choice(all_users), token, expires_at))
+        _insert_batches(cursor, '''
+            INSERT INTO sesiones (id, usuario_id, token, expires_at) VALUES (?, ?, ?, ?)
+        ''', session_rows, batch_size)
+        
+        rebuild_skill_catalog(cursor)
+        conn.commit()
+    
+    db.bump_versions('usuarios', 'ofertas', 'sesiones')
+    SkillIndex.reset(db.db_path)
+    # Como un proceso que arranca con estos datos: el matcher ya conoce el vocabulario guardado
+    db.load_skill_matcher()
+    if with_matches:
+        MatchEngine(db).rebuild_all()
+    
+    return SyntheticDataset(
+        student_ids=student_ids,
+        company_ids=company_ids,
+        offer_ids=offer_ids,
+        student_emails=student_emails,
+        session_tokens=session_tokens,
+        vocabulary=vocabulary
+    )
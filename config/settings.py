@@ -7,16 +7,116 @@ class Config:
     # Base de datos
     DATABASE_PATH = os.path.join(Path(__file__).parent.parent, 'streamlit_app.db')
     
+    # Pool de conexiones SQLite
+    DB_POOL_SIZE = 8
+    DB_POOL_TIMEOUT_SECONDS = 10
+    DB_BUSY_TIMEOUT_MS = 5000
+    DB_STATEMENT_CACHE_SIZE = 128
+    
+    # Instrumentación de consultas: tiempos por sitio de llamada y log de consultas lentas con su plan.
+    # Desactivada por defecto; se activa con QUERY_METRICS=1 o al pedir un volcado con
+    # QUERY_METRICS_DUMP=archivo.json (se escribe al salir del proceso)
+    QUERY_METRICS_DUMP_PATH = os.environ.get('QUERY_METRICS_DUMP')
+    QUERY_METRICS_ENABLED = os.environ.get('QUERY_METRICS', '0') != '0' or bool(QUERY_METRICS_DUMP_PATH)
+    SLOW_QUERY_MS = 100
+    SLOW_QUERY_LOG_SIZE = 200
+    
+    # Capa asíncrona: hilos del executor, cada uno con una conexión fija del pool (no más que DB_POOL_SIZE)
+    ASYNC_DB_WORKERS = 4
+    
     # Configuración de sesiones
     SESSION_DURATION_HOURS = 24
     
+    # Caché de sesiones verificadas (token -> usuario) en SessionManager
+    SESSION_CACHE_SIZE = 10000
+    SESSION_CACHE_TTL_SECONDS = 60
+    
+    # Caché de consultas de DatabaseManager (invalidada por versión de tabla; el TTL cubre escrituras externas)
+    QUERY_CACHE_SIZE = 256
+    QUERY_CACHE_TTL_SECONDS = 300
+    
+    # Limpieza de sesiones expiradas (lotes cortos para no bloquear los logins)
+    SESSION_SWEEP_INTERVAL_SECONDS = 600
+    SESSION_SWEEP_BATCH_SIZE = 500
+    SESSION_SWEEP_PAUSE_SECONDS = 0.05
+    
+    # Matching: solo se guardan matches con compatibilidad mayor a este valor (%)
+    MATCH_MIN_COMPATIBILITY = 0.0
+    
+    # Match rate: un estudiante u oferta cuenta si tiene algún match con al menos esta compatibilidad (%)
+    MATCH_RATE_THRESHOLD = 50.0
+    
+    # Coincidencia de habilidades: similitud mínima de trigramas (coeficiente de Dice) y
+    # longitud mínima para comparar por similitud; las más cortas ("r", "c", "go") solo por igualdad o sinónimo
+    SKILL_SIMILARITY_THRESHOLD = 0.7
+    SKILL_FUZZY_MIN_LENGTH = 4
+    
+    # Sinónimos iniciales de la tabla skill_aliases (alias -> nombre canónico)
+    SKILL_ALIASES = {
+        'ml': 'machine learning',
+        'aprendizaje automático': 'machine learning',
+        'ai': 'inteligencia artificial',
+        'ia': 'inteligencia artificial',
+        'js': 'javascript',
+        'ts': 'typescript',
+        'reactjs': 'react',
+        'react.js': 'react',
+        'node': 'node.js',
+        'nodejs': 'node.js',
+        'postgres': 'postgresql',
+        'k8s': 'kubernetes',
+        'powerbi': 'power bi',
+        'ms excel': 'excel',
+        'microsoft excel': 'excel',
+        'sklearn': 'scikit-learn',
+        'scikit learn': 'scikit-learn',
+        'py': 'python',
+        'golang': 'go'
+    }
+    
+    # Memoria máxima por bloque en el cálculo masivo de compatibilidad (MB)
+    COMPATIBILITY_BATCH_MEMORY_MB = 128
+    
+    # Importación masiva: filas por transacción, hilos para hashear contraseñas e iteraciones de
+    # PBKDF2 por fila (menos iteraciones cargan más rápido; el hash se completa en el primer login)
+    IMPORT_BATCH_SIZE = 10000
+    IMPORT_HASH_WORKERS = min(8, os.cpu_count() or 1)
+    IMPORT_PASSWORD_HASH_ITERATIONS = 260000
+    
+    # Listados paginados por cursor (created_at, id): filas por página
+    PAGE_SIZE = 20
+    
+    # API HTTP (ASGI): dirección por defecto, límites de las peticiones y compresión gzip de las respuestas
+    API_HOST = "127.0.0.1"
+    API_PORT = 8000
+    API_MAX_PAGE_SIZE = 100
+    API_MAX_BODY_BYTES = 64 * 1024
+    API_KEEP_ALIVE_SECONDS = 15
+    API_GZIP_MIN_BYTES = 1024
+    API_GZIP_LEVEL = 6
+    API_GZIP_CACHE_SIZE = 256
+    API_GZIP_CACHE_TTL_SECONDS = 300
+    
+    # Búsqueda de ofertas (FTS5): resultados por página y palabras consideradas por consulta
+    SEARCH_RESULTS_LIMIT = 10
+    SEARCH_MAX_TERMS = 10
+    
+    # Exportaciones: filas leídas por consulta (paginación por clave) y escritas por bloque
+    EXPORT_BATCH_SIZE = 5000
+    
     # Configuración de la aplicación Streamlit
     PAGE_TITLE = "Plataforma de Vinculación Laboral UNRC"
     PAGE_ICON = "🎓"
     LAYOUT = "wide"
     
-    # Configuración de seguridad
-    PASSWORD_HASH_ALGORITHM = "sha256"
+    # Configuración de seguridad: PBKDF2-SHA256 salado; subir las iteraciones rehashea al iniciar sesión
+    PASSWORD_HASH_ALGORITHM = "pbkdf2_sha256"
+    PASSWORD_HASH_ITERATIONS = 260000
+    
+    # Pool de hashing de contraseñas: hilos, trabajos en cola y espera máxima por un lugar
+    PASSWORD_HASH_WORKERS = min(4, os.cpu_count() or 1)
+    PASSWORD_HASH_QUEUE_LIMIT = 32
+    PASSWORD_HASH_QUEUE_TIMEOUT_SECONDS = 5
     
     # Configuración de la UI
     PRIMARY_COLOR = "#1f4e79"
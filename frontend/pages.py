@@ -1,11 +1,11 @@
 # frontend/pages.py
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from backend.auth import AuthManager
 from backend.database import DatabaseManager
 from backend.models import CompatibilityCalculator
+from backend.matching import MatchEngine
+from backend.stats import StatsService
+from backend.security import PasswordHashingBusyError
 from config.settings import Config
 
 class LoginPage:
@@ -44,11 +44,16 @@ class LoginPage:
             
             if login_submitted:
                 if email and password:
-                    if self.auth.login(email, password):
-                        st.success(f"¡Bienvenido!")
-                        st.rerun()
+                    try:
+                        logged_in = self.auth.login(email, password)
+                    except PasswordHashingBusyError:
+                        st.warning("⏳ Hay muchos inicios de sesión en este momento, intenta de nuevo en unos segundos")
                     else:
-                        st.error("❌ Credenciales incorrectas")
+                        if logged_in:
+                            st.success(f"¡Bienvenido!")
+                            st.rerun()
+                        else:
+                            st.error("❌ Credenciales incorrectas")
                 else:
                     st.error("❌ Por favor completa todos los campos")
             
@@ -121,13 +126,17 @@ class RegisterPage:
                 elif not all([nombre, email, password]):
                     st.error("❌ Por favor completa todos los campos obligatorios")
                 else:
-                    success = self.auth.register_user(email, password, nombre, tipo_usuario, carrera, semestre, habilidades)
-                    if success:
-                        st.success("✅ Usuario registrado exitosamente")
-                        st.session_state['show_register'] = False
-                        st.rerun()
+                    try:
+                        success = self.auth.register_user(email, password, nombre, tipo_usuario, carrera, semestre, habilidades)
+                    except PasswordHashingBusyError:
+                        st.warning("⏳ Hay muchos registros en este momento, intenta de nuevo en unos segundos")
                     else:
-                        st.error("❌ El email ya está registrado")
+                        if success:
+                            st.success("✅ Usuario registrado exitosamente")
+                            st.session_state['show_register'] = False
+                            st.rerun()
+                        else:
+                            st.error("❌ El email ya está registrado")
             
             if back_submitted:
                 st.session_state['show_register'] = False
@@ -142,6 +151,8 @@ class DashboardPage:
         self.auth = AuthManager()
         self.db = DatabaseManager()
         self.compatibility_calc = CompatibilityCalculator()
+        self.match_engine = MatchEngine(self.db)
+        self.stats = StatsService(self.db)
     
     def render(self):
         """Renderiza el dashboard principal"""
@@ -192,21 +203,20 @@ class DashboardPage:
         """Renderiza las métricas principales"""
         col1, col2, col3, col4 = st.columns(4)
         
-        # Obtener estadísticas reales
-        offers = self.db.get_all_offers()
-        users = self.db.get_all_users()
+        # Obtener estadísticas reales (conteos agregados en SQLite)
+        counts = self.stats.get_dashboard_counts()
         
         with col1:
             st.markdown(f"""
             <div class="metric-card">
                 <h3>📈</h3>
-                <h2>{len(offers)}</h2>
+                <h2>{counts['ofertas_activas']}</h2>
                 <p>Ofertas Activas</p>
             </div>
             """, unsafe_allow_html=True)
         
         with col2:
-            estudiantes = len([u for u in users if u['tipo'] == 'estudiante'])
+            estudiantes = counts['estudiantes']
             st.markdown(f"""
             <div class="metric-card">
                 <h3>👥</h3>
@@ -216,7 +226,7 @@ class DashboardPage:
             """, unsafe_allow_html=True)
         
         with col3:
-            empresas = len([u for u in users if u['tipo'] == 'empresa'])
+            empresas = counts['empresas']
             st.markdown(f"""
             <div class="metric-card">
                 <h3>🏢</h3>
@@ -226,11 +236,13 @@ class DashboardPage:
             """, unsafe_allow_html=True)
         
         with col4:
-            st.markdown("""
+            match_rate = self.stats.get_match_rate()
+            st.markdown(f"""
             <div class="metric-card">
                 <h3>🎯</h3>
-                <h2>89%</h2>
+                <h2>{match_rate['estudiantes']:.0f}%</h2>
                 <p>Match Rate</p>
+                <small>Ofertas con candidato: {match_rate['ofertas']:.0f}%</small>
             </div>
             """, unsafe_allow_html=True)
     
@@ -238,33 +250,30 @@ class DashboardPage:
         """Renderiza el dashboard específico para estudiantes"""
         st.markdown("### 🎓 Panel del Estudiante")
         
+        self._render_offer_search()
+        
         col1, col2 = st.columns(2)
         
         with col1:
             st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
             st.markdown("#### 🔍 Ofertas Recomendadas")
             
-            # Obtener ofertas y calcular compatibilidad
-            offers = self.db.get_all_offers()
-            user_skills = user_data['habilidades'].split(',') if user_data['habilidades'] else []
+            # Top 5 desde la tabla de matches (lectura indexada, sin puntuar en Python)
+            offers = self.match_engine.get_top_matches(user_data['id'], limit=5)
             
-            recommendations = []
-            for offer in offers:
-                required_skills = offer['habilidades_requeridas'].split(',') if offer['habilidades_requeridas'] else []
-                compatibility = self.compatibility_calc.calculate_compatibility(user_skills, required_skills)
-                
-                recommendations.append({
-                    'Empresa': offer['empresa_nombre'],
-                    'Posición': offer['titulo'],
-                    'Tipo': offer['tipo'].title(),
-                    'Compatibilidad': f"{compatibility:.0f}%"
-                })
-            
-            # Ordenar por compatibilidad
-            recommendations.sort(key=lambda x: float(x['Compatibilidad'].replace('%', '')), reverse=True)
-            
-            df_recommendations = pd.DataFrame(recommendations[:5])  # Top 5
-            st.dataframe(df_recommendations, use_container_width=True)
+            recommendations = [{
+                'Empresa': offer['empresa_nombre'],
+                'Posición': offer['titulo'],
+                'Tipo': offer['tipo'].title(),
+                'Compatibilidad': f"{offer['compatibilidad']:.0f}%"
+            } for offer in offers]
+            
+            if recommendations:
+                import pandas as pd
+                df_recommendations = pd.DataFrame(recommendations)
+                st.dataframe(df_recommendations, use_container_width=True)
+            else:
+                st.info("Aún no hay ofertas que coincidan con tus habilidades")
             st.markdown('</div>', unsafe_allow_html=True)
         
         with col2:
@@ -282,7 +291,9 @@ class DashboardPage:
             if user_data['email']:
                 progress += 25
             
-            # Gráfico de progreso
+            # Gráfico de progreso (pandas y plotly se importan al dibujar, no al cargar el
+            # módulo, para que el login y el arranque del worker no paguen su costo)
+            import plotly.graph_objects as go
             fig = go.Figure(go.Indicator(
                 mode="gauge+number+delta",
                 value=progress,
@@ -319,6 +330,8 @@ class DashboardPage:
                 'Demanda': [95, 88, 92, 65, 80][:len(user_data['habilidades'].split(','))]
             }
             
+            import pandas as pd
+            import plotly.express as px
             df_habilidades = pd.DataFrame(habilidades_data)
             
             fig = px.bar(df_habilidades, x='Habilidad', y=['Mi Nivel', 'Demanda'], 
@@ -330,6 +343,56 @@ class DashboardPage:
         
         st.markdown('</div>', unsafe_allow_html=True)
     
+    def _render_offer_search(self):
+        """Renderiza la búsqueda de ofertas por texto (FTS5)"""
+        st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
+        st.markdown("#### 🔎 Buscar Ofertas")
+        
+        col_query, col_tipo = st.columns([3, 1])
+        with col_query:
+            query = st.text_input("Buscar", placeholder="Ej. python, analista de datos, react",
+                                  key="offer_search_query", label_visibility="collapsed")
+        with col_tipo:
+            tipo = st.selectbox("Tipo", ["Todos", "empleo", "practica", "servicio_social"],
+                                key="offer_search_tipo", label_visibility="collapsed")
+        
+        # Una búsqueda nueva vuelve a la primera página
+        search_key = (query, tipo)
+        if st.session_state.get('offer_search_key') != search_key:
+            st.session_state['offer_search_key'] = search_key
+            st.session_state['offer_search_page'] = 0
+        page = st.session_state['offer_search_page']
+        
+        if query.strip():
+            limit = Config.SEARCH_RESULTS_LIMIT
+            filters = {'tipo': tipo} if tipo != "Todos" else None
+            # Se pide un resultado extra para saber si hay página siguiente
+            results = self.db.search_offers(query, filters, limit=limit + 1, offset=page * limit)
+            has_next = len(results) > limit
+            
+            if results:
+                for offer in results[:limit]:
+                    st.markdown(f"{offer['titulo_resaltado']}  \n"
+                                f"{offer['empresa_nombre']} · {offer['tipo'].title()} · {offer['ubicacion'] or 'Sin ubicación'}")
+                    if offer['snippet']:
+                        st.caption(offer['snippet'])
+                
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    if page > 0 and st.button("⬅️ Anterior", key="offer_search_prev"):
+                        st.session_state['offer_search_page'] = page - 1
+                        st.rerun()
+                with col_page:
+                    st.caption(f"Página {page + 1}")
+                with col_next:
+                    if has_next and st.button("Siguiente ➡️", key="offer_search_next"):
+                        st.session_state['offer_search_page'] = page + 1
+                        st.rerun()
+            else:
+                st.info("No se encontraron ofertas para tu búsqueda")
+        
+        st.markdown('</div>', unsafe_allow_html=True)
+    
     def _render_company_dashboard(self, user_data):
         """Renderiza el dashboard específico para empresas"""
         st.markdown("### 🏢 Panel de la Empresa")
@@ -344,8 +407,13 @@ class DashboardPage:
             if st.button("➕ Crear Nueva Oferta"):
                 st.session_state['show_create_offer'] = True
             
-            # Obtener ofertas de la empresa
-            offers = self.db.get_offers_by_company(user_data['id'])
+            if st.session_state.get('show_create_offer'):
+                self._render_create_offer_form(user_data)
+            
+            # Ofertas de la empresa por páginas: session_state guarda el cursor de cada página visitada
+            cursors = st.session_state.setdefault('company_offers_cursors', [None])
+            offers, next_cursor = self.db.get_offers_by_company_page(user_data['id'], after=cursors[-1])
+            offer_stats = self.stats.get_offer_stats(empresa_id=user_data['id'], solo_activas=False)
             
             if offers:
                 offers_data = {
@@ -355,8 +423,25 @@ class DashboardPage:
                     'Ubicación': [offer['ubicacion'] for offer in offers]
                 }
                 
+                import pandas as pd
                 df_ofertas = pd.DataFrame(offers_data)
                 st.dataframe(df_ofertas, use_container_width=True)
+                
+                col_prev, col_page, col_next = st.columns([1, 2, 1])
+                with col_prev:
+                    if len(cursors) > 1 and st.button("⬅️ Anterior", key="company_offers_prev"):
+                        cursors.pop()
+                        st.rerun()
+                with col_page:
+                    st.caption(f"Página {len(cursors)} · {offer_stats.total_offers} ofertas")
+                with col_next:
+                    if next_cursor and st.button("Siguiente ➡️", key="company_offers_next"):
+                        cursors.append(next_cursor)
+                        st.rerun()
+            elif len(cursors) > 1:
+                # La página guardada quedó vacía: se vuelve a la primera
+                st.session_state['company_offers_cursors'] = [None]
+                st.rerun()
             else:
                 st.info("No tienes ofertas publicadas aún")
             
@@ -366,13 +451,11 @@ class DashboardPage:
             st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
             st.markdown("#### 📈 Estadísticas")
             
-            # Gráfico de ofertas por tipo
-            if offers:
-                tipos_ofertas = {}
-                for offer in offers:
-                    tipo = offer['tipo']
-                    tipos_ofertas[tipo] = tipos_ofertas.get(tipo, 0) + 1
+            # Gráfico de ofertas por tipo (agregado en SQL sobre todas las ofertas, no solo la página)
+            if offer_stats.total_offers:
+                tipos_ofertas = offer_stats.offers_by_type
                 
+                import plotly.express as px
                 fig = px.pie(values=list(tipos_ofertas.values()), 
                              names=list(tipos_ofertas.keys()), 
                              title="Distribución de Mis Ofertas")
@@ -386,12 +469,10 @@ class DashboardPage:
         st.markdown('<div class="dashboard-card">', unsafe_allow_html=True)
         st.markdown("#### 📍 Ofertas por Ubicación")
         
-        if offers:
-            ubicaciones = {}
-            for offer in offers:
-                ubicacion = offer['ubicacion']
-                ubicaciones[ubicacion] = ubicaciones.get(ubicacion, 0) + 1
+        if offer_stats.total_offers:
+            ubicaciones = offer_stats.offers_by_location
             
+            import plotly.express as px
             fig = px.bar(x=list(ubicaciones.keys()), 
                          y=list(ubicaciones.values()),
                          title="Ofertas por Ubicación")
@@ -400,3 +481,34 @@ class DashboardPage:
             st.info("Publica ofertas para ver el análisis por ubicación")
         
         st.markdown('</div>', unsafe_allow_html=True)
+    
+    def _render_create_offer_form(self, user_data):
+        """Renderiza el formulario para publicar una oferta"""
+        with st.form("create_offer_form"):
+            titulo = st.text_input("💼 Título")
+            descripcion = st.text_area("📝 Descripción")
+            tipo = st.selectbox("📂 Tipo", ["empleo", "practica", "servicio_social"])
+            habilidades = st.text_input("🛠️ Habilidades requeridas (separadas por comas)")
+            ubicacion = st.text_input("📍 Ubicación")
+            
+            col_submit, col_cancel = st.columns(2)
+            
+            with col_submit:
+                create_submitted = st.form_submit_button("✅ Publicar", use_container_width=True)
+            
+            with col_cancel:
+                cancel_submitted = st.form_submit_button("✖️ Cancelar", use_container_width=True)
+        
+        if create_submitted:
+            if not titulo:
+                st.error("❌ El título es obligatorio")
+            elif self.db.create_offer(user_data['id'], titulo, descripcion, tipo, habilidades, ubicacion):
+                st.session_state['show_create_offer'] = False
+                st.success("✅ Oferta publicada")
+                st.rerun()
+            else:
+                st.error("❌ No se pudo publicar la oferta")
+        
+        if cancel_submitted:
+            st.session_state['show_create_offer'] = False
+            st.rerun()
@@ -0,0 +1,335 @@
+# manage.py - Comandos de administración
+import argparse
+import sys
+from backend.database import DatabaseManager
+from backend.migrations import MIGRATIONS
+from backend.matching import MatchEngine
+from backend.stats import StatsService
+
+def cmd_migrate(args):
+    """Aplica las migraciones pendientes"""
+    db = DatabaseManager(args.db)
+    before = db.get_schema_version()
+    if not db.init_database(args.target):
+        return 1
+    after = db.get_schema_version()
+    if after == before:
+        print(f"El esquema ya está actualizado (versión {after})")
+    else:
+        print(f"Esquema migrado de la versión {before} a la {after}")
+    return 0
+
+def cmd_showmigrations(args):
+    """Lista las migraciones y su estado"""
+    db = DatabaseManager(args.db)
+    current = db.get_schema_version()
+    for version, description, _ in MIGRATIONS:
+        mark = 'x' if version <= current else ' '
+        print(f"[{mark}] {version:04d} {description}")
+    return 0
+
+def cmd_seed(args):
+    """Carga los usuarios y ofertas de prueba de Config"""
+    db = DatabaseManager(args.db)
+    if not db.init_database():
+        return 1
+    if db.populate_test_data():
+        print("✅ Datos de prueba cargados")
+    else:
+        print("La base de datos ya tiene usuarios; no se cargaron datos de prueba")
+    return 0
+
+def cmd_rematch(args):
+    """Recalcula la tabla de matches completa"""
+    db = DatabaseManager(args.db)
+    if not db.init_database():
+        return 1
+    written = MatchEngine(db).rebuild_all()
+    print(f"Matches recalculados ({written} filas modificadas)")
+    return 0
+
+def cmd_sweep_sessions(args):
+    """Borra las sesiones expiradas y opcionalmente compacta el archivo"""
+    db = DatabaseManager(args.db)
+    if not db.init_database():
+        return 1
+    report = db.delete_expired_sessions(batch_size=args.batch_size)
+    print(f"Sesiones expiradas borradas: {report['deleted']} en {report['batches']} lotes")
+    print(f"Páginas liberadas: {report['pages_reclaimed']} ({report['bytes_reclaimed']} bytes)")
+    if args.vacuum:
+        print(f"VACUUM: {db.vacuum()} páginas devueltas al sistema de archivos")
+    return 0
+
+def cmd_rebuild_counters(args):
+    """Reconcilia la tabla de contadores con los datos reales"""
+    db = DatabaseManager(args.db)
+    if not db.init_database():
+        return 1
+    for name, (before, after) in StatsService(db).rebuild_counters().items():
+        mark = '' if before == after else '  (corregido)'
+        print(f"{name}: {before} -> {after}{mark}")
+    return 0
+
+def cmd_rebuild_skills(args):
+    """Reconstruye user_skills y offer_skills a partir del texto de habilidades"""
+    from backend.skill_catalog import rebuild_skill_catalog
+    db = DatabaseManager(args.db)
+    if not db.init_database():
+        return 1
+    with db.get_connection() as conn:
+        cursor = conn.cursor()
+        links = rebuild_skill_catalog(cursor)
+        conn.commit()
+        skills = cursor.execute('SELECT COUNT(*) FROM skills').fetchone()[0]
+    for table, count in links.items():
+        print(f"{table}: {count} enlaces")
+    print(f"skills: {skills} habilidades en el catálogo")
+    return 0
+
+def cmd_alias(args):
+    """Lista los sinónimos de habilidades o registra uno y recalcula los matches"""
+    db = DatabaseManager(args.db)
+    if not db.init_database():
+        return 1
+    if args.alias is None:
+        for alias, skill in db.get_skill_aliases().items():
+            print(f"{alias} -> {skill}")
+        return 0
+    if args.skill is None:
+        print("Error: indica la habilidad canónica del sinónimo")
+        return 1
+    if not db.add_skill_alias(args.alias, args.skill):
+        print("Error: el sinónimo y la habilidad deben ser distintos y no vacíos")
+        return 1
+    print(f"Sinónimo registrado: {args.alias} -> {args.skill} (matches recalculados)")
+    return 0
+
+def cmd_serve_api(args):
+    """Levanta la API JSON con uvicorn si está instalado o con el servidor de la biblioteca estándar"""
+    from api import create_app
+    from api.server import run_server
+    from config.settings import Config
+    app = create_app(args.db)
+    if not args.stdlib:
+        try:
+            import uvicorn
+        except ImportError:
+            print("uvicorn no está instalado: se usa el servidor de la biblioteca estándar")
+        else:
+            uvicorn.run(app, host=args.host or Config.API_HOST, port=args.port or Config.API_PORT)
+            return 0
+    run_server(app, args.host, args.port)
+    return 0
+
+def cmd_import(args):
+    """Importa usuarios u ofertas en lote desde CSV o JSONL"""
+    from backend.importer import BulkImporter, write_rejects
+    db = DatabaseManager(args.db)
+    if not db.init_database():
+        return 1
+    
+    importer = BulkImporter(db, batch_size=args.batch_size, hash_iterations=args.hash_iterations)
+    try:
+        if args.entity == 'users':
+            report = importer.import_users(args.path, args.format, tipo=args.tipo, rematch=not args.no_rematch)
+        else:
+            report = importer.import_offers(args.path, args.format, rematch=not args.no_rematch)
+    except (OSError, ValueError) as e:
+        print(f"Error importando {args.path}: {e}")
+        return 1
+    
+    print(f"Filas insertadas: {report.inserted} de {report.total} en {report.seconds:.1f} s")
+    if report.match_seconds:
+        print(f"Matches recalculados en {report.match_seconds:.1f} s")
+    if report.rejected:
+        print(f"Filas rechazadas: {len(report.rejected)}")
+        for row in report.rejected[:10]:
+            print(f"  línea {row.line}: {row.reason}")
+        if len(report.rejected) > 10:
+            print(f"  ... y {len(report.rejected) - 10} más")
+        if args.rejects:
+            write_rejects(args.rejects, report.rejected)
+            print(f"Detalle guardado en {args.rejects}")
+    return 0 if not report.rejected else 3
+
+def cmd_export(args):
+    """Exporta usuarios, ofertas o matches a CSV, JSONL o Parquet en streaming"""
+    import time
+    from backend.exporter import export_entity
+    db = DatabaseManager(args.db)
+    if not db.init_database():
+        return 1
+    
+    filters = {}
+    if args.entity == 'users' and args.tipo:
+        filters['tipo'] = args.tipo
+    if args.entity == 'offers' and args.solo_activas:
+        filters['solo_activas'] = True
+    if args.entity == 'matches' and args.min_compatibilidad is not None:
+        filters['min_compatibilidad'] = args.min_compatibilidad
+    
+    start = time.perf_counter()
+    try:
+        count = export_entity(db, args.entity, args.path, args.format, args.batch_size, **filters)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"Error exportando {args.entity}: {e}")
+        return 1
+    print(f"✅ {count} filas exportadas a {args.path} en {time.perf_counter() - start:.1f} s")
+    return 0
+
+def parse_importtime(stderr):
+    """Convierte la salida de `python -X importtime` en [(módulo, propio_us, acumulado_us, nivel)]"""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # encabezado
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        entries.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return entries
+
+def cmd_import_time(args):
+    """Mide el tiempo de importación de un módulo en un intérprete limpio"""
+    import os
+    import subprocess
+    
+    runs = []
+    for _ in range(args.runs):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {args.module}'],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        if result.returncode != 0:
+            print(f"Error importando {args.module}:\n{result.stderr.strip().splitlines()[-1]}")
+            return 1
+        runs.append(parse_importtime(result.stderr))
+    
+    # Se reporta la corrida más rápida: las demás incluyen ruido de disco y caché
+    entries = min(runs, key=lambda run: sum(entry[1] for entry in run))
+    total = next((cumulative for name, _, cumulative, _ in reversed(entries) if name == args.module), 0)
+    print(f"import {args.module}: {total / 1000:.1f} ms ({len(entries)} módulos, mejor de {args.runs})")
+    
+    packages = {}
+    for name, self_us, _, _ in entries:
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+    print("\nPaquetes con más tiempo propio:")
+    for package, self_us in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"  {self_us / 1000:8.1f} ms  {package}")
+    
+    print("\nMódulos con más tiempo acumulado:")
+    for name, _, cumulative, depth in sorted(entries, key=lambda entry: -entry[2])[:args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {'  ' * depth}{name}")
+    return 0
+
+def cmd_query_stats(args):
+    """Resume un volcado de QueryMetrics: consultas con más tiempo total y consultas lentas"""
+    import json
+    try:
+        with open(args.file, encoding='utf-8') as handle:
+            data = json.load(handle)
+    except (OSError, ValueError) as e:
+        print(f"Error leyendo {args.file}: {e}")
+        return 1
+    
+    queries = data.get('queries', [])
+    print(f"{len(queries)} consultas distintas, {sum(q['calls'] for q in queries)} ejecuciones; "
+          f"{sum(q['total_ms'] for q in queries):.1f} ms en total")
+    print(f"\n{'total ms':>10} {'llamadas':>9} {'media ms':>9} {'máx ms':>9} {'filas':>9}  sitio / SQL")
+    for query in queries[:args.top]:
+        print(f"{query['total_ms']:10.1f} {query['calls']:9d} {query['mean_ms']:9.3f} {query['max_ms']:9.1f} "
+              f"{query['rows']:9d}  {query['site']}")
+        print(f"{'':50}{query['sql'][:120]}")
+    
+    slow = data.get('slow_queries', [])
+    print(f"\nConsultas lentas (>= {data.get('slow_query_ms')} ms): {len(slow)}")
+    for entry in sorted(slow, key=lambda entry: -entry['ms'])[:args.top]:
+        print(f"  {entry['ms']:9.1f} ms  {entry['rows']} filas  {entry['site']}")
+        print(f"      {entry['sql'][:200]}")
+        for line in entry['plan']:
+            print(f"        {line}")
+    return 0
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Administración de la Plataforma de Vinculación Laboral UNRC")
+    parser.add_argument('--db', default=None, help="Ruta de la base de datos (por defecto Config.DATABASE_PATH)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    migrate_parser = subparsers.add_parser('migrate', help="Aplica las migraciones pendientes del esquema")
+    migrate_parser.add_argument('--target', type=int, default=None, help="Versión máxima a aplicar")
+    migrate_parser.set_defaults(func=cmd_migrate)
+    
+    show_parser = subparsers.add_parser('showmigrations', help="Muestra las migraciones aplicadas y pendientes")
+    show_parser.set_defaults(func=cmd_showmigrations)
+    
+    seed_parser = subparsers.add_parser('seed', help="Carga los datos de prueba (solo si no hay usuarios)")
+    seed_parser.set_defaults(func=cmd_seed)
+    
+    rematch_parser = subparsers.add_parser('rematch', help="Recalcula la compatibilidad de todos los estudiantes y ofertas")
+    rematch_parser.set_defaults(func=cmd_rematch)
+    
+    sweep_parser = subparsers.add_parser('sweep-sessions', help="Borra las sesiones expiradas en lotes")
+    sweep_parser.add_argument('--batch-size', type=int, default=None, help="Filas por lote (por defecto Config.SESSION_SWEEP_BATCH_SIZE)")
+    sweep_parser.add_argument('--vacuum', action='store_true', help="Ejecuta VACUUM al terminar (bloquea la base mientras corre)")
+    sweep_parser.set_defaults(func=cmd_sweep_sessions)
+    
+    counters_parser = subparsers.add_parser('rebuild-counters', help="Recalcula la tabla de contadores del dashboard")
+    counters_parser.set_defaults(func=cmd_rebuild_counters)
+    
+    skills_parser = subparsers.add_parser('rebuild-skills', help="Reconstruye el catálogo de habilidades (user_skills, offer_skills)")
+    skills_parser.set_defaults(func=cmd_rebuild_skills)
+    
+    alias_parser = subparsers.add_parser('alias', help="Lista o registra sinónimos de habilidades")
+    alias_parser.add_argument('alias', nargs='?', default=None, help="Sinónimo (ej. ml)")
+    alias_parser.add_argument('skill', nargs='?', default=None, help="Habilidad canónica (ej. 'machine learning')")
+    alias_parser.set_defaults(func=cmd_alias)
+    
+    api_parser = subparsers.add_parser('serve-api', help="Levanta la API JSON (ASGI) sin Streamlit")
+    api_parser.add_argument('--host', default=None, help="Interfaz (por defecto Config.API_HOST)")
+    api_parser.add_argument('--port', type=int, default=None, help="Puerto (por defecto Config.API_PORT)")
+    api_parser.add_argument('--stdlib', action='store_true', help="Usa el servidor de la biblioteca estándar aunque uvicorn esté instalado")
+    api_parser.set_defaults(func=cmd_serve_api)
+    
+    import_parser = subparsers.add_parser('import', help="Importa usuarios u ofertas en lote desde CSV o JSONL")
+    import_parser.add_argument('entity', choices=['users', 'offers'], help="Qué se importa")
+    import_parser.add_argument('path', help="Archivo .csv o .jsonl")
+    import_parser.add_argument('--format', choices=['csv', 'jsonl'], default=None, help="Formato (por defecto según la extensión)")
+    import_parser.add_argument('--tipo', choices=['estudiante', 'empresa'], default=None, help="Tipo para las filas de usuarios sin columna 'tipo'")
+    import_parser.add_argument('--batch-size', type=int, default=None, help="Filas por transacción (por defecto Config.IMPORT_BATCH_SIZE)")
+    import_parser.add_argument('--hash-iterations', type=int, default=None, help="Iteraciones de PBKDF2 por contraseña (por defecto Config.IMPORT_PASSWORD_HASH_ITERATIONS; se completan al iniciar sesión)")
+    import_parser.add_argument('--rejects', default=None, help="Archivo .csv o .jsonl donde guardar las filas rechazadas")
+    import_parser.add_argument('--no-rematch', action='store_true', help="No recalcula matches (ejecutar después `rematch`)")
+    import_parser.set_defaults(func=cmd_import)
+    
+    export_parser = subparsers.add_parser('export', help="Exporta usuarios, ofertas o matches a CSV, JSONL o Parquet")
+    export_parser.add_argument('entity', choices=['users', 'offers', 'matches'], help="Qué se exporta")
+    export_parser.add_argument('path', help="Archivo .csv, .jsonl o .parquet (Parquet requiere pyarrow)")
+    export_parser.add_argument('--format', choices=['csv', 'jsonl', 'parquet'], default=None, help="Formato (por defecto según la extensión)")
+    export_parser.add_argument('--batch-size', type=int, default=None, help="Filas por bloque (por defecto Config.EXPORT_BATCH_SIZE)")
+    export_parser.add_argument('--tipo', choices=['estudiante', 'empresa'], default=None, help="Solo usuarios de este tipo")
+    export_parser.add_argument('--solo-activas', action='store_true', help="Solo ofertas activas")
+    export_parser.add_argument('--min-compatibilidad', type=float, default=None, help="Solo matches con al menos esta compatibilidad (%%)")
+    export_parser.set_defaults(func=cmd_export)
+    
+    importtime_parser = subparsers.add_parser('import-time', help="Mide el tiempo de arranque (importaciones) de un módulo")
+    importtime_parser.add_argument('--module', default='app', help="Módulo a importar (por defecto app)")
+    importtime_parser.add_argument('--top', type=int, default=15, help="Filas a mostrar por tabla")
+    importtime_parser.add_argument('--runs', type=int, default=3, help="Corridas; se reporta la más rápida")
+    importtime_parser.set_defaults(func=cmd_import_time)
+    
+    querystats_parser = subparsers.add_parser('query-stats', help="Resume un volcado de tiempos de consultas (QUERY_METRICS_DUMP)")
+    querystats_parser.add_argument('file', help="Archivo JSON escrito por QueryMetrics.dump")
+    querystats_parser.add_argument('--top', type=int, default=20, help="Filas a mostrar por tabla")
+    querystats_parser.set_defaults(func=cmd_query_stats)
+    
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())